@@ -0,0 +1,120 @@
+"""Benchmark float16 / int8 skill and sentence vectors against float32 scoring."""
+
+import argparse
+import json
+import tempfile
+import time
+from typing import Any, Dict
+
+import numpy as np
+
+from src.matchers.batch_ops import top_n_indices
+from src.matchers.matcher import ResumeJDMatcher
+from src.utils.quantization import VECTOR_DTYPES, quantize
+from src.utils.resume_snapshot import ResumeSnapshot, export_from_db
+
+
+def kendall_tau(a: np.ndarray, b: np.ndarray, *, max_items: int = 3000, seed: int = 0) -> float:
+    """Kendall tau-b of two score vectors (on a random sample of ``max_items`` if larger)."""
+    if len(a) > max_items:
+        rows = np.random.default_rng(seed).choice(len(a), max_items, replace=False)
+        a, b = a[rows], b[rows]
+    concordant = discordant = ties_a = ties_b = 0
+    for i in range(len(a) - 1):
+        da = np.sign(a[i + 1:] - a[i])
+        db = np.sign(b[i + 1:] - b[i])
+        prod = da * db
+        concordant += int((prod > 0).sum())
+        discordant += int((prod < 0).sum())
+        ties_a += int(((da == 0) & (db != 0)).sum())
+        ties_b += int(((db == 0) & (da != 0)).sum())
+    denom = np.sqrt(float(concordant + discordant + ties_a) * float(concordant + discordant + ties_b))
+    return (concordant - discordant) / denom if denom else 1.0
+
+
+def score_pool(matcher: ResumeJDMatcher, jd_f, snap: ResumeSnapshot, vector_dtype: str):
+    """(scores, seconds, bytes) for the snapshot's vectors stored as ``vector_dtype``."""
+    skill_mat = quantize(np.asarray(snap.skill_vecs), vector_dtype)
+    sent_mat = quantize(np.asarray(snap.sentence_vecs), vector_dtype)
+    t0 = time.perf_counter()
+    scores = matcher._score_stacked(
+        jd_f,
+        skill_mat,
+        snap.skill_offsets,
+        sent_mat,
+        snap.sentence_offsets,
+        snap.exp_vecs,
+        snap.degree_names(),
+        snap.years,
+    )
+    return scores, time.perf_counter() - t0, skill_mat.nbytes + sent_mat.nbytes
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare quantized vector scoring with float32")
+    parser.add_argument("--jd", type=str, nargs="+", required=True, help="Parsed JD JSON file(s)")
+    parser.add_argument(
+        "--snapshot",
+        type=str,
+        default=None,
+        help="float32 résumé snapshot directory (exported from the DB when omitted)"
+    )
+    parser.add_argument("--top-k", type=int, nargs="+", default=[10, 50], help="Top-K overlaps to report")
+    parser.add_argument("--repeats", type=int, default=3, help="Timed runs per dtype (best is kept)")
+    args = parser.parse_args()
+
+    if args.snapshot:
+        snap = ResumeSnapshot.open(args.snapshot)
+    else:
+        from src.utils.db_utils import VectorDB
+        db = VectorDB()
+        tmp = tempfile.mkdtemp(prefix="resume_snapshot_")
+        export_from_db(db, tmp)
+        db.close()
+        snap = ResumeSnapshot.open(tmp)
+    print(f"📦 {len(snap)} resumes, {len(snap.skill_vecs)} skill rows, {len(snap.sentence_vecs)} sentence rows")
+
+    matcher = ResumeJDMatcher()
+    jd_fs = []
+    for path in args.jd:
+        with open(path) as f:
+            jd_fs.append(matcher.prepare_jd(json.load(f)))
+
+    results: Dict[str, Dict[str, Any]] = {}
+    for vector_dtype in VECTOR_DTYPES:
+        stats = results[vector_dtype] = {"seconds": [], "scores": [], "tau": [], "max_diff": []}
+        for k in args.top_k:
+            stats[f"top{k}"] = []
+        for jd_index, jd_f in enumerate(jd_fs):
+            best = np.inf
+            for _ in range(args.repeats):
+                scores, seconds, nbytes = score_pool(matcher, jd_f, snap, vector_dtype)
+                best = min(best, seconds)
+            stats["seconds"].append(best)
+            stats["bytes"] = nbytes
+            stats["scores"].append(scores)
+            reference = results["float32"]["scores"][jd_index]
+            stats["tau"].append(kendall_tau(reference, scores))
+            stats["max_diff"].append(float(np.abs(reference - scores).max()) if len(scores) else 0.0)
+            for k in args.top_k:
+                overlap = np.intersect1d(top_n_indices(reference, k), top_n_indices(scores, k))
+                stats[f"top{k}"].append(len(overlap) / max(1, min(k, len(scores))))
+
+    base = results["float32"]
+    header = f"{'dtype':<8} {'memory':>10} {'mem x':>6} {'ms':>8} {'speed x':>8} {'tau':>7} {'max |Δ|':>8}"
+    header += "".join(f" {'top' + str(k):>7}" for k in args.top_k)
+    print(header)
+    for vector_dtype, stats in results.items():
+        ms = 1000 * float(np.mean(stats["seconds"]))
+        line = (
+            f"{vector_dtype:<8} {stats['bytes'] / 2**20:>8.2f}MB "
+            f"{base['bytes'] / max(1, stats['bytes']):>6.2f} {ms:>8.2f} "
+            f"{np.mean(base['seconds']) / np.mean(stats['seconds']):>8.2f} "
+            f"{np.mean(stats['tau']):>7.4f} {np.max(stats['max_diff']):>8.4f}"
+        )
+        line += "".join(f" {np.mean(stats[f'top{k}']):>7.2%}" for k in args.top_k)
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,31 +1,55 @@
 -- Enable pgvector extension
-CREATE EXTENSION IF NOT EXISTS pgvector;
+CREATE EXTENSION IF NOT EXISTS vector;
 
 -- Resume table with vectors and metadata
 CREATE TABLE resumes (
     id              SERIAL PRIMARY KEY,
-    filename        TEXT NOT NULL,
+    filename        TEXT UNIQUE NOT NULL,
     meta            JSONB NOT NULL,              -- full parsed resume
-    skill_vec       vector(768) NOT NULL,        -- mean skill vector for ANN
-    exp_vec         vector(768) NOT NULL,        -- experience vector
+    skill_vec       vector(384) NOT NULL,        -- mean skill vector for ANN
+    exp_vec         vector(384) NOT NULL,        -- experience vector
     created_at      TIMESTAMPTZ DEFAULT now()
 );
 
--- Individual skill vectors (many-to-one with resumes)
-CREATE TABLE resume_skill_vectors (
+-- Skill vocabulary: one embedding per distinct skill text.
+-- VectorDB(vector_type="halfvec") stores skill and sentence vectors as
+-- halfvec(384) (pgvector >= 0.7) with halfvec_cosine_ops indexes.
+CREATE TABLE skills (
+    id              SERIAL PRIMARY KEY,
+    text            TEXT UNIQUE NOT NULL,        -- the actual skill string
+    vec             vector(384) NOT NULL         -- shared embedding (or halfvec(384))
+);
+
+-- Resume -> skill links (many-to-many through the vocabulary)
+CREATE TABLE resume_skills (
+    resume_id       INTEGER REFERENCES resumes(id) ON DELETE CASCADE,
+    skill_id        INTEGER NOT NULL REFERENCES skills(id),
+    PRIMARY KEY (resume_id, skill_id)
+);
+
+-- Experience + project bullet vectors (many-to-one with resumes), stored so
+-- scoring a stored resume needs no model inference
+CREATE TABLE resume_sentence_vectors (
     resume_id       INTEGER REFERENCES resumes(id) ON DELETE CASCADE,
-    skill_text      TEXT NOT NULL,               -- the actual skill string
-    skill_vec       vector(768) NOT NULL,        -- individual embedding
-    PRIMARY KEY (resume_id, skill_text)
+    position        INTEGER NOT NULL,            -- order within the resume
+    sentence_vec    vector(384) NOT NULL,        -- or halfvec(384)
+    PRIMARY KEY (resume_id, position)
 );
 
--- IVF index for fast ANN on mean skill vector
-CREATE INDEX ON resumes 
-    USING ivfflat (skill_vec vector_cosine_ops)
-    WITH (lists = 100);
+-- HNSW indexes for fast ANN (dimension must match the embedding model,
+-- 384 for all-MiniLM-L6-v2). VectorDB.rebuild_indexes() can switch to ivfflat.
+CREATE INDEX idx_resumes_skill_vec_ann ON resumes
+    USING hnsw (skill_vec vector_cosine_ops)
+    WITH (m = 16, ef_construction = 64);
+CREATE INDEX idx_resumes_exp_vec_ann ON resumes
+    USING hnsw (exp_vec vector_cosine_ops)
+    WITH (m = 16, ef_construction = 64);
+CREATE INDEX idx_skills_vec_ann ON skills
+    USING hnsw (vec vector_cosine_ops)
+    WITH (m = 16, ef_construction = 64);
 
 -- Basic btree indices
-CREATE INDEX ON resume_skill_vectors(resume_id);
+CREATE INDEX idx_resume_skills_skill_id ON resume_skills(skill_id);
 CREATE INDEX ON resumes(created_at);
 
 -- Example view for debugging/monitoring
@@ -34,8 +58,8 @@ SELECT
     r.id,
     r.filename,
     (r.meta->>'name')::text as name,
-    COUNT(DISTINCT sv.skill_text) as skill_count,
+    COUNT(rs.skill_id) as skill_count,
     r.created_at
 FROM resumes r
-LEFT JOIN resume_skill_vectors sv ON sv.resume_id = r.id
+LEFT JOIN resume_skills rs ON rs.resume_id = r.id
 GROUP BY r.id, r.filename, r.meta, r.created_at; 
\ No newline at end of file
@@ -2,20 +2,191 @@
 
 import argparse
 import json
+import multiprocessing
+import queue
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional
 
 from src.matchers.matcher import ResumeJDMatcher
 from src.utils.db_utils import VectorDB
-from src.extractors.experience_utils import estimate_years_experience
+from src.utils.skill_index import SkillIndex
+from src.utils.skill_vocab import SkillNeighbours, SkillVocabulary
+from src.extractors.experience_utils import estimate_years_experience_many
+from src.extractors.feature_extraction import resume_to_embed_payload
 
+_DONE = object()  # end-of-stream marker passed between pipeline stages
 
-def process_resume(matcher: ResumeJDMatcher, resume: Dict[str, Any]) -> Dict[str, Any]:
+
+def process_resume(
+    matcher: ResumeJDMatcher, resume: Dict[str, Any], skill_vocab: Optional[SkillVocabulary] = None
+) -> Dict[str, Any]:
     """Extract and compute vectors for a resume."""
     # Calculate total years of experience
     
-    # Extract vectors and other features
-    return matcher._vectorize_resume(resume)
+    # Extract vectors and other features (only unseen skills are embedded)
+    return matcher._vectorize_resume(resume, skill_vocab=skill_vocab)
+
+
+def load_resume(file: Path) -> Dict[str, Any]:
+    """Load and unwrap a parsed resume JSON."""
+    with open(file) as f:
+        data = json.load(f)
+    return data.get("parsed_data", data)
+
+
+def resume_record(file: Path, resume: Dict[str, Any], features: Dict[str, Any]) -> Dict[str, Any]:
+    """Build the ``store_resume`` arguments for a resume and its features."""
+    # Adding the years_experience / degree_level to the resume metadata
+    resume["years_experience"] = features["years_experience"]
+    resume["degree_level"] = features["degree_level"]
+    return {
+        "filename": file.name,
+        "meta": resume,  # Now includes years_experience and degree_level
+        "skill_vec": features["skill_vec"],
+        "exp_vec": features["exp_vec"],
+        # the exact texts (and order) the skill vectors were built from
+        "skill_texts": features["skill_texts"],
+        "skill_vecs": features["skill_vecs"],
+        "sentence_vecs": features["sentence_vecs"],
+    }
+
+
+def store_features(db: VectorDB, file: Path, resume: Dict[str, Any], features: Dict[str, Any]) -> Optional[int]:
+    """Add years_experience to the resume metadata and store it in the DB."""
+    record = resume_record(file, resume, features)
+    print("Printing years of experience", resume["years_experience"])
+    resume_id = db.store_resume(**record)
+    print(f"Stored {file.name}")
+    return resume_id
+
+
+def store_features_bulk(
+    db: VectorDB, files: List[Path], resumes: List[Dict[str, Any]], features: List[Dict[str, Any]]
+) -> Dict[str, int]:
+    """Store a chunk of resumes in one transaction; returns filename -> id."""
+    records = [resume_record(file, res, feats) for file, res, feats in zip(files, resumes, features)]
+    return db.store_resumes_bulk(records)
+
+
+def prepare_chunk(resumes: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Worker stage: payload extraction and experience computation for a chunk."""
+    return {
+        "payloads": [resume_to_embed_payload(res) for res in resumes],
+        "years": estimate_years_experience_many(resumes),
+    }
+
+
+def run_pipeline(
+    files: List[Path],
+    matcher: ResumeJDMatcher,
+    db: VectorDB,
+    *,
+    workers: int,
+    chunk_size: int,
+    batch_size: int,
+    queue_size: int = 4,
+    skill_vocab: Optional[SkillVocabulary] = None,
+) -> Dict[str, float]:
+    """Pipelined ingest: reader -> worker pool -> batched embedding -> DB writer.
+
+    Stages are connected by bounded queues so memory stays flat however many
+    files are ingested. With ``skill_vocab`` only skills not seen before are
+    embedded. Returns throughput stats.
+    """
+    raw_q: "queue.Queue" = queue.Queue(maxsize=queue_size)
+    prepared_q: "queue.Queue" = queue.Queue(maxsize=queue_size)
+    write_q: "queue.Queue" = queue.Queue(maxsize=queue_size)
+    errors: List[BaseException] = []
+    stats = {"files": 0, "embeds": 0, "rows": 0}
+
+    def reader():
+        try:
+            for start in range(0, len(files), chunk_size):
+                if errors:
+                    break
+                chunk = files[start:start + chunk_size]
+                raw_q.put((chunk, [load_resume(file) for file in chunk]))
+        except BaseException as e:  # surface in the main thread
+            errors.append(e)
+        finally:
+            raw_q.put(_DONE)
+
+    def dispatcher(pool: ProcessPoolExecutor):
+        try:
+            while (item := raw_q.get()) is not _DONE:
+                chunk, resumes = item
+                prepared_q.put((chunk, resumes, pool.submit(prepare_chunk, resumes)))
+        except BaseException as e:
+            errors.append(e)
+            while raw_q.get() is not _DONE:  # unblock the reader
+                pass
+        finally:
+            prepared_q.put(_DONE)
+
+    def writer():
+        try:
+            while (item := write_q.get()) is not _DONE:
+                if errors:
+                    continue  # drain so the embedding stage never blocks
+                stats["rows"] += len(store_features_bulk(db, *item))
+        except BaseException as e:
+            errors.append(e)
+
+    start_time = time.perf_counter()
+    # Workers are spawned, not forked: the reader / writer threads (and any
+    # locks they hold) would otherwise be copied into half-initialised children
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+        threads = [
+            threading.Thread(target=reader, daemon=True),
+            threading.Thread(target=dispatcher, args=(pool,), daemon=True),
+            threading.Thread(target=writer, daemon=True),
+        ]
+        for t in threads:
+            t.start()
+
+        # Embedding stage runs here so the model is loaded once, in one process
+        try:
+            while (item := prepared_q.get()) is not _DONE:
+                chunk, resumes, future = item
+                if errors:
+                    continue
+                prepared = future.result()
+                known_skills = len(skill_vocab) if skill_vocab is not None else 0
+                features = matcher._vectorize_payloads(
+                    resumes, prepared["payloads"], prepared["years"],
+                    batch_size=batch_size, show_progress=False, skill_vocab=skill_vocab,
+                )
+                stats["files"] += len(chunk)
+                payloads = prepared["payloads"]
+                if skill_vocab is not None:
+                    stats["embeds"] += len(skill_vocab) - known_skills
+                else:
+                    stats["embeds"] += sum(len(p["skill_texts"]) for p in payloads)
+                stats["embeds"] += sum(len(p["exp_bullets"]) + len(p["proj_bullets"]) for p in payloads)
+                write_q.put((chunk, resumes, features))
+        except BaseException as e:
+            errors.append(e)
+            while prepared_q.get() is not _DONE:  # unblock the upstream stages
+                pass
+        finally:
+            write_q.put(_DONE)
+            for t in threads:
+                t.join()
+
+    if errors:
+        raise errors[0]
+
+    elapsed = max(time.perf_counter() - start_time, 1e-9)
+    return {
+        **stats,
+        "seconds": elapsed,
+        "files_per_s": stats["files"] / elapsed,
+        "embeds_per_s": stats["embeds"] / elapsed,
+        "rows_per_s": stats["rows"] / elapsed,
+    }
 
 
 def main():
@@ -26,38 +197,105 @@ def main():
         required=True,
         help="Directory containing parsed resume JSONs"
     )
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=0,
+        help="Vectorise this many resumes together (0 = one resume at a time)"
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=256,
+        help="Encode batch size used when --chunk-size or --workers is set"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=0,
+        help="Run the pipelined ingest with this many worker processes (0 = serial)"
+    )
+    parser.add_argument(
+        "--skill-index",
+        type=str,
+        default=None,
+        help="Rebuild the inverted skill index from the DB and save it to this directory"
+    )
+    parser.add_argument(
+        "--skill-neighbours",
+        type=str,
+        default=None,
+        help="Build (or refresh) the top-k skill neighbour table in this directory"
+    )
+    parser.add_argument(
+        "--vector-type",
+        choices=["vector", "halfvec"],
+        default=None,
+        help="Store skill and sentence vectors as this pgvector type (default: keep current)"
+    )
+    parser.add_argument(
+        "--migrate-skill-vectors",
+        action="store_true",
+        help="Move a legacy resume_skill_vectors table into the shared skills vocabulary (drops it)"
+    )
     args = parser.parse_args()
 
     # Initialize matcher and DB
     matcher = ResumeJDMatcher()
-    db = VectorDB()
+    db = VectorDB(vector_type=args.vector_type)
+    if args.migrate_skill_vectors and not db.migrate_skill_vectors():
+        print("✅ No resume_skill_vectors table to migrate")
+    # Skills already in the DB vocabulary are reused instead of re-embedded
+    skill_vocab = SkillVocabulary.from_db(db)
 
     # Process each resume JSON in directory
     resume_dir = Path(args.resume_dir)
-    for file in resume_dir.glob("*.json"):
-        print(f"Processing {file.name}...")
-        
-        # Load and unwrap resume data
-        with open(file) as f:
-            data = json.load(f)
-            resume = data.get("parsed_data", data)
-        
-        # Extract vectors and add years_experience to metadata
-        features = process_resume(matcher, resume)
-        
-        # Adding the years_experience to the resume metadata
-        resume["years_experience"] = features["years_experience"]
-        print("Printing years of experience", resume["years_experience"])
-        # Store in database
-        db.store_resume(
-            filename=file.name,
-            meta=resume,  # Now includes years_experience
-            skill_vec=features["skill_vec"],
-            exp_vec=features["exp_vec"],
-            skill_texts=resume.get("skills", {}).get("technical", []),
-            skill_vecs=features["skill_vecs"],
+    files = sorted(resume_dir.glob("*.json"))
+
+    if args.workers > 0:
+        stats = run_pipeline(
+            files,
+            matcher,
+            db,
+            workers=args.workers,
+            chunk_size=args.chunk_size or 256,
+            batch_size=args.batch_size,
+            skill_vocab=skill_vocab,
+        )
+        print(
+            f"📊 {stats['files']} files in {stats['seconds']:.1f}s: "
+            f"{stats['files_per_s']:.1f} files/s, "
+            f"{stats['embeds_per_s']:.1f} embeds/s, "
+            f"{stats['rows_per_s']:.1f} rows/s"
         )
-        print(f"Stored {file.name}")
+    elif args.chunk_size > 0:
+        # Gather texts from many resumes into large encode batches
+        for start in range(0, len(files), args.chunk_size):
+            chunk = files[start:start + args.chunk_size]
+            print(f"Processing {len(chunk)} resumes ({chunk[0].name} ...)")
+            resumes = [load_resume(file) for file in chunk]
+            features = matcher._vectorize_resumes(
+                resumes, batch_size=args.batch_size, skill_vocab=skill_vocab
+            )
+            store_features_bulk(db, chunk, resumes, features)
+    else:
+        for file in files:
+            print(f"Processing {file.name}...")
+            resume = load_resume(file)
+
+            # Extract vectors and add years_experience to metadata
+            features = process_resume(matcher, resume, skill_vocab)
+            store_features(db, file, resume, features)
+
+    if args.skill_index:
+        skill_index = SkillIndex.from_db(db)
+        skill_index.save(args.skill_index)
+        print(f"🗂️ Skill index: {len(skill_index)} resumes -> {args.skill_index}")
+
+    if args.skill_neighbours:
+        # Built from the DB order of the vocabulary so later loads match its fingerprint
+        table = SkillNeighbours.load_or_build(args.skill_neighbours, SkillVocabulary.from_db(db))
+        print(f"🧭 Skill neighbours: {len(table)} skills x {table.k} -> {args.skill_neighbours}")
 
     db.close()
     print("Done!")
@@ -0,0 +1,68 @@
+"""Script to search stored resumes against a parsed job description."""
+
+import argparse
+import json
+
+from src.matchers.search import search_resumes
+from src.utils.db_utils import VectorDB
+from src.utils.skill_index import SkillIndex
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Search resumes in the vector DB for a JD")
+    parser.add_argument("--jd", type=str, required=True, help="Parsed JD JSON file")
+    parser.add_argument("--limit", type=int, default=10, help="Number of results to show")
+    parser.add_argument(
+        "--recall",
+        type=int,
+        default=1000,
+        help="ANN candidates pulled from pgvector and re-ranked"
+    )
+    parser.add_argument("--min-similarity", type=float, default=0.1, help="Stage-1 similarity threshold")
+    parser.add_argument("--probes", type=int, default=None, help="ivfflat.probes for the ANN query")
+    parser.add_argument("--ef-search", type=int, default=None, help="hnsw.ef_search for the ANN query")
+    parser.add_argument(
+        "--must-have",
+        type=str,
+        nargs="+",
+        default=None,
+        help="Skills every result must list (synonyms are expanded)"
+    )
+    parser.add_argument(
+        "--skill-index",
+        type=str,
+        default=None,
+        help="Saved skill index directory (built from the DB when omitted)"
+    )
+    args = parser.parse_args()
+
+    with open(args.jd) as f:
+        jd = json.load(f)
+
+    db = VectorDB()
+    skill_index = SkillIndex.load(args.skill_index) if args.skill_index else None
+    results, timings = search_resumes(
+        db,
+        jd,
+        limit=args.limit,
+        recall=args.recall,
+        min_similarity=args.min_similarity,
+        probes=args.probes,
+        ef_search=args.ef_search,
+        must_have=args.must_have,
+        skill_index=skill_index,
+    )
+    db.close()
+
+    for rank, res in enumerate(results, 1):
+        name = res["meta"].get("profile", {}).get("name", "")
+        print(f"{rank:>2}. {res['score']:.4f}  {res['filename']}  {name}")
+
+    print(
+        "⏱️ "
+        + ", ".join(f"{k.removesuffix('_ms')}: {v:.1f}ms" for k, v in timings.items())
+    )
+
+
+if __name__ == "__main__":
+    main()
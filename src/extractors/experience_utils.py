@@ -1,32 +1,305 @@
 from __future__ import annotations
 
 import re
-from datetime import datetime
-from typing import Dict, Any, Optional
+import hashlib
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Tuple
 import os
 from dotenv import load_dotenv
-from openai import OpenAI
 import json
 
 # Load environment variables
 load_dotenv()
 
-# Configure OpenAI
-client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+_client = None
+_LLM_MODEL = "gpt-3.5-turbo"
+
+
+def _get_client():
+    """Create the OpenAI client on first use so offline runs never need it."""
+    global _client
+    if _client is None:
+        from openai import OpenAI
+
+        # Configure OpenAI
+        _client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+    return _client
+
+
+class _ExperienceCache:
+    """Memo of LLM experience answers keyed by the normalised date-range list
+    and the current month.
+
+    Kept in memory and, when ``EXPERIENCE_CACHE_PATH`` is set, in a SQLite file
+    so re-ingesting or re-scoring a résumé never repeats the same call. The
+    SQLite connection is opened lazily in each process, since a connection
+    must not be used across ``fork()`` (e.g. by ingest worker processes).
+    """
+
+    def __init__(self, path: str | Path | None = None):
+        self._memo: Dict[str, float] = {}
+        self._path = Path(path) if path else None
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def _connection(self) -> Optional[sqlite3.Connection]:
+        """This process's SQLite connection (caller holds ``_lock``)."""
+        if self._path is None:
+            return None
+        if self._conn is None:
+            self._path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(str(self._path), check_same_thread=False)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS llm_experience (key TEXT PRIMARY KEY, years REAL NOT NULL)"
+            )
+            self._conn.commit()
+        return self._conn
+
+    def _after_fork(self) -> None:
+        # The child must neither reuse the parent's connection nor a lock held at fork time
+        self._lock = threading.Lock()
+        self._conn = None
+
+    @staticmethod
+    def key(date_ranges: List[str]) -> str:
+        # The prompt resolves "present" against the current month, so answers
+        # are only reused within the month they were given in.
+        normalised = sorted(" ".join(d.lower().split()) for d in date_ranges)
+        month = datetime.now().strftime("%Y-%m")
+        payload = json.dumps([_LLM_MODEL, month, normalised], ensure_ascii=False)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[float]:
+        with self._lock:
+            if key in self._memo:
+                return self._memo[key]
+            conn = self._connection()
+            if conn is not None:
+                row = conn.execute("SELECT years FROM llm_experience WHERE key = ?", (key,)).fetchone()
+                if row is not None:
+                    self._memo[key] = row[0]
+                    return row[0]
+        return None
+
+    def put(self, key: str, years: float) -> None:
+        with self._lock:
+            self._memo[key] = years
+            conn = self._connection()
+            if conn is not None:
+                conn.execute(
+                    "INSERT OR REPLACE INTO llm_experience (key, years) VALUES (?, ?)", (key, years)
+                )
+                conn.commit()
+
+
+_experience_cache = _ExperienceCache(os.getenv("EXPERIENCE_CACHE_PATH"))
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_experience_cache._after_fork)
 
 # ------------------------------------------------------------
 # Resume side helpers
 # ------------------------------------------------------------
 
+_MONTHS = {
+    "jan": 1, "feb": 2, "mar": 3, "apr": 4, "may": 5, "jun": 6,
+    "jul": 7, "aug": 8, "sep": 9, "oct": 10, "nov": 11, "dec": 12,
+}
+
+_DATE_TOKEN_RE = re.compile(
+    r"\b(?P<present>present|current(?:ly)?|now|ongoing|till\s*date|to\s*date|today)\b"
+    r"|\b(?P<mon>jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]*\.?\s*(?:'|’|,)?\s*(?P<mon_year>\d{4}|\d{2})(?!\d)"
+    r"|(?<!\d)(?P<num_month>0?[1-9]|1[0-2])[/.](?P<num_year>(?:19|20)\d{2})(?!\d)"
+    r"|(?<!\d)(?P<year>(?:19|20)\d{2})(?!\d)",
+    re.I,
+)
+
+_PARTIAL_ROLE_RE = re.compile(r"\bintern(?:ship)?s?\b|part[\s-]?time", re.I)
+
+
+def _month_index(year: int, month: int) -> int:
+    return year * 12 + (month - 1)
+
+
+def _expand_year(text: str) -> int:
+    year = int(text)
+    if len(text) == 2:
+        year += 2000 if year <= datetime.now().year % 100 else 1900
+    return year
+
+
+def parse_date_range(text: str, today: Optional[date] = None) -> Optional[Tuple[int, int]]:
+    """Parse a résumé date range into a half-open ``[start, end)`` month interval.
+
+    Handles strings such as "June 2024 - Present", "Jan'21 – Mar'23",
+    "May2024–Present", "06/2019 - 08/2021" and "2016-2020". Month-precise end
+    dates are inclusive; a bare end year counts up to the start of that year.
+    Dates after ``today`` are clamped. Returns None when the string cannot be
+    parsed.
+    """
+    today = today or date.today()
+    now_idx = _month_index(today.year, today.month) + 1
+
+    points: List[Tuple[int, bool]] = []  # (month index, is_month_precise)
+    for m in _DATE_TOKEN_RE.finditer(text or ""):
+        if m.group("present"):
+            if points:
+                points.append((now_idx, False))
+        elif m.group("mon"):
+            month = _MONTHS[m.group("mon").lower()[:3]]
+            points.append((_month_index(_expand_year(m.group("mon_year")), month), True))
+        elif m.group("num_month"):
+            points.append((_month_index(int(m.group("num_year")), int(m.group("num_month"))), True))
+        else:
+            points.append((_month_index(int(m.group("year")), 1), False))
+        if len(points) == 2:
+            break
+
+    if len(points) != 2:
+        return None
+
+    (start, _), (end_idx, precise) = points
+    if precise:
+        end = end_idx + 1
+    else:
+        end = end_idx if end_idx == now_idx else max(end_idx, start + 12)
+    end = min(end, now_idx)
+    if end <= start:
+        return (start, start)
+    return (start, end)
+
+
+def _role_weight(exp: Dict[str, Any]) -> float:
+    """Internships and part-time roles count at half weight."""
+    text = " ".join(str(exp.get(k, "")) for k in ("jobTitle", "company", "employmentType"))
+    return 0.5 if _PARTIAL_ROLE_RE.search(text) else 1.0
+
+
+def local_years_experience(
+    work_experiences: List[Dict[str, Any]], today: Optional[date] = None
+) -> Tuple[float, List[str]]:
+    """Deterministically total experience from ``workExperiences[].date`` strings.
+
+    Overlapping periods are counted once, at the highest weight of the roles
+    covering each month. Returns ``(years, unparsed_date_strings)``.
+    """
+    month_weights: Dict[int, float] = {}
+    unparsed: List[str] = []
+    for exp in work_experiences:
+        date_str = exp.get("date")
+        if not date_str:
+            continue
+        interval = parse_date_range(date_str, today)
+        if interval is None:
+            unparsed.append(date_str)
+            continue
+        weight = _role_weight(exp)
+        for month in range(*interval):
+            if month_weights.get(month, 0.0) < weight:
+                month_weights[month] = weight
+    return round(sum(month_weights.values()) / 12.0, 2), unparsed
+
 
-def estimate_years_experience(resume: Dict[str, Any]) -> float:
-    """Calculate total professional years from work experiences using LLM with fallback."""
-    # Extract date strings from work experiences -------------------------
+def _date_strings(work_experiences: List[Dict[str, Any]]) -> List[str]:
+    return [exp["date"] for exp in work_experiences if exp.get("date")]
+
+
+def estimate_years_experience(resume: Dict[str, Any], *, allow_llm: bool = True, client=None) -> float:
+    """Calculate total professional years from work experiences.
+
+    Dates are parsed locally. If some strings cannot be parsed, every date
+    range is sent to the LLM together (skipped when ``allow_llm`` is False),
+    since only it can resolve overlaps between parsed and unparsed ranges;
+    the local total is kept when the LLM fails. LLM answers are memoised,
+    see ``EXPERIENCE_CACHE_PATH``.
+    """
     work_experiences = resume.get("workExperiences", [])
     if not work_experiences:
         return 0.0
 
-    date_ranges: list[str] = [exp.get("date", "") for exp in work_experiences if exp.get("date")]
+    years, unparsed = local_years_experience(work_experiences)
+    if unparsed and allow_llm:
+        llm_years = cached_llm_years_experience(_date_strings(work_experiences), client=client)
+        if llm_years is not None:
+            years = llm_years
+    return round(years, 2)
+
+
+def estimate_years_experience_many(
+    resumes: List[Dict[str, Any]],
+    *,
+    allow_llm: bool = True,
+    max_workers: int = 8,
+    client=None,
+) -> List[float]:
+    """Batch version of :func:`estimate_years_experience`.
+
+    Local parsing runs inline; the distinct date lists that still need the LLM
+    are resolved in parallel by a thread pool of at most ``max_workers``
+    concurrent requests.
+    """
+    work = [res.get("workExperiences", []) for res in resumes]
+    local = [local_years_experience(exps) for exps in work]
+
+    pending: Dict[str, List[str]] = {}
+    keys: List[Optional[str]] = []
+    for exps, (_, unparsed) in zip(work, local):
+        key = None
+        if unparsed and allow_llm:
+            ranges = _date_strings(exps)
+            key = _ExperienceCache.key(ranges)
+            pending.setdefault(key, ranges)
+        keys.append(key)
+
+    llm_years: Dict[str, Optional[float]] = {}
+    if pending:
+        with ThreadPoolExecutor(max_workers=max(1, max_workers)) as pool:
+            futures = {
+                key: pool.submit(cached_llm_years_experience, ranges, client=client)
+                for key, ranges in pending.items()
+            }
+            llm_years = {key: fut.result() for key, fut in futures.items()}
+
+    totals = []
+    for key, (years, _) in zip(keys, local):
+        if key is not None and llm_years[key] is not None:
+            years = llm_years[key]
+        totals.append(round(years, 2))
+    return totals
+
+
+def cached_llm_years_experience(date_ranges: List[str], *, client=None) -> Optional[float]:
+    """LLM experience total for ``date_ranges``, memoised across runs.
+
+    Failed calls return None and are not cached so they are retried next time.
+    """
+    key = _ExperienceCache.key(date_ranges)
+    cached = _experience_cache.get(key)
+    if cached is not None:
+        return cached
+    years = _llm_years_experience(date_ranges, client=client)
+    if years is not None:
+        _experience_cache.put(key, years)
+    return years
+
+
+def _llm_years_experience(
+    date_ranges: List[str],
+    *,
+    client=None,
+    retries: int = 3,
+    backoff: float = 1.0,
+) -> Optional[float]:
+    """Ask the LLM to total the given date range strings.
+
+    ``client`` defaults to the shared OpenAI client; any object exposing
+    ``chat.completions.create`` works (e.g. a local stub). Request errors are
+    retried with exponential backoff. Returns None on failure.
+    """
     if not date_ranges:
         return 0.0
 
@@ -51,27 +324,36 @@ def estimate_years_experience(resume: Dict[str, Any]) -> float:
 
     # Try querying the LLM and parsing output
     try:
-        response = client.chat.completions.create(
-            model="gpt-3.5-turbo",
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_prompt}
-            ],
-            temperature=0
-        )
-        raw_text = response.choices[0].message.content.strip()
-
+        client = client or _get_client()
+    except Exception as e:  # e.g. openai missing or OPENAI_API_KEY unset
+        print(f"⚠️ OpenAI client unavailable for experience calculation: {e}")
+        return None
+    for attempt in range(retries):
         try:
-            data = json.loads(raw_text)
-            years = float(data.get("total_years_experience"))
-            return round(years, 2)
-        except (ValueError, json.JSONDecodeError, TypeError):
-            # If the model returns something unexpected, treat as failure
-            print("⚠️ Unable to parse valid JSON from LLM response for experience calculation.")
-            return 0.0
-    except Exception as e:
-        print(f"⚠️ Error calculating experience via LLM: {e}")
-        return 0.0  # on failure, return 0.0
+            response = client.chat.completions.create(
+                model=_LLM_MODEL,
+                messages=[
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": user_prompt}
+                ],
+                temperature=0
+            )
+            break
+        except Exception as e:
+            if attempt == retries - 1:
+                print(f"⚠️ Error calculating experience via LLM: {e}")
+                return None  # on failure, caller keeps the local total
+            time.sleep(backoff * (2 ** attempt))
+
+    raw_text = response.choices[0].message.content.strip()
+    try:
+        data = json.loads(raw_text)
+        years = float(data.get("total_years_experience"))
+        return round(years, 2)
+    except (ValueError, json.JSONDecodeError, TypeError, AttributeError):
+        # If the model returns something unexpected, treat as failure
+        print("⚠️ Unable to parse valid JSON from LLM response for experience calculation.")
+        return None
 
 # ------------------------------------------------------------
 # JD side helpers
@@ -40,8 +40,8 @@ def jd_to_embed_payload(jd: Dict[str, Any]) -> Dict[str, List[str]]:
     skill_texts.extend(tech_skills.get("primary_skills", []))
     skill_texts.extend(tech_skills.get("secondary_skills", []))
 
-    # ensure cleaning and de-duplication
-    skill_texts = list({ _clean_skill(s).lower() for s in skill_texts if s })
+    # ensure cleaning and de-duplication (order-preserving, so it is stable across processes)
+    skill_texts = list(dict.fromkeys(_clean_skill(s).lower() for s in skill_texts if s))
 
     bullet_texts: List[str] = jd.get("key_responsibilities", [])
     bullet_texts = [_clean_text(b) for b in bullet_texts if b]
@@ -62,7 +62,7 @@ def resume_to_embed_payload(resume: Dict[str, Any]) -> Dict[str, List[str]]:
     skill_texts: List[str] = []
     for key in ("technical", "other"):
         skill_texts.extend(skills.get(key, []))
-    skill_texts = list({ _clean_skill(s).lower() for s in skill_texts if s })
+    skill_texts = list(dict.fromkeys(_clean_skill(s).lower() for s in skill_texts if s))
     # print(skill_texts)
 
     # extract bullets from experiences
@@ -0,0 +1,469 @@
+"""Segmented NumPy kernels for scoring many résumés against one or many JDs at once.
+
+Résumé vectors are stacked into a single ragged matrix with CSR-style
+``offsets`` (résumé *i* owns rows ``offsets[i]:offsets[i + 1]``), so a whole
+pool is scored with one ``jd_vecs @ matrix.T`` product per block instead of
+one small product per résumé.
+
+Similarities are float32, but every mean is accumulated in float64 (and
+returned as float64) so the batched scores do not depend on summation order
+and equal ``ResumeJDMatcher.score`` exactly.
+
+Résumé matrices may also be float16 arrays or ``Int8Matrix`` objects (see
+``src.utils.quantization``); similarities are then computed per block on the
+quantized rows.
+"""
+
+from __future__ import annotations
+
+from typing import List, Sequence, Tuple
+
+import numpy as np
+
+from src.utils.quantization import dot_t
+
+__all__ = [
+    "stack_ragged",
+    "take_ragged",
+    "dot_t64",
+    "segmented_coverage",
+    "segmented_coverage_ids",
+    "segmented_coverage_lookup",
+    "segmented_topk_mean",
+    "multi_coverage",
+    "multi_topk_mean",
+    "segmented_best",
+    "segmented_topk_values",
+    "merge_topk",
+    "topk_values_mean",
+    "top_n_indices",
+]
+
+
+def stack_ragged(arrays: Sequence[np.ndarray], dim: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Stack per-résumé ``(n_i, dim)`` arrays into one matrix plus offsets.
+
+    Returns
+    -------
+    matrix: np.ndarray  shape = (sum(n_i), dim), float32
+    offsets: np.ndarray shape = (len(arrays) + 1,), int64
+    """
+    counts = np.fromiter((len(a) for a in arrays), dtype=np.int64, count=len(arrays))
+    offsets = np.zeros(len(arrays) + 1, dtype=np.int64)
+    np.cumsum(counts, out=offsets[1:])
+    non_empty: List[np.ndarray] = [a.reshape(-1, dim) for a in arrays if len(a)]
+    if not non_empty:
+        return np.empty((0, dim), dtype=np.float32), offsets
+    return np.vstack(non_empty).astype(np.float32, copy=False), offsets
+
+
+def take_ragged(matrix: np.ndarray, offsets: np.ndarray, rows: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Sub-matrix and offsets of the résumé segments ``rows`` (in that order)."""
+    rows = np.asarray(rows, dtype=np.int64)
+    starts = offsets[rows]
+    counts = offsets[rows + 1] - starts
+    sub_offsets = np.zeros(len(rows) + 1, dtype=np.int64)
+    np.cumsum(counts, out=sub_offsets[1:])
+    # row index of every gathered entry: its segment start plus its position in the segment
+    gather = np.repeat(starts - sub_offsets[:-1], counts) + np.arange(sub_offsets[-1])
+    return matrix[gather], sub_offsets
+
+
+def dot_t64(vecs: np.ndarray, matrix: np.ndarray, *, max_rows: int = 50_000) -> np.ndarray:
+    """``vecs @ matrix.T`` accumulated in float64, ``max_rows`` rows of ``matrix`` at a time.
+
+    Used for the single-vector similarities (e.g. ``exp_vec``) so they match
+    ``ResumeJDMatcher._cosine`` exactly without a float64 copy of the matrix.
+    """
+    vecs = np.asarray(vecs, dtype=np.float64)
+    out = np.empty(vecs.shape[:-1] + (len(matrix),), dtype=np.float64)
+    for lo in range(0, len(matrix), max_rows):
+        out[..., lo:lo + max_rows] = vecs @ np.asarray(matrix[lo:lo + max_rows], dtype=np.float64).T
+    return out
+
+
+def _blocks(offsets: np.ndarray, max_rows: int):
+    """Yield ``(first, last)`` résumé ranges whose rows fit in ``max_rows``."""
+    n = len(offsets) - 1
+    first = 0
+    while first < n:
+        last = int(np.searchsorted(offsets, offsets[first] + max_rows, side="right")) - 1
+        last = min(max(last, first + 1), n)
+        yield first, last
+        first = last
+
+
+def segmented_coverage(
+    jd_vecs: np.ndarray,
+    matrix: np.ndarray,
+    offsets: np.ndarray,
+    *,
+    max_rows: int = 50_000,
+) -> np.ndarray:
+    """Mean over JD skills of the best-matching skill, per résumé segment.
+
+    Batched equivalent of ``ResumeJDMatcher._skill_coverage``; résumés with no
+    skills (or an empty JD) score 0.
+    """
+    n = len(offsets) - 1
+    out = np.zeros(n, dtype=np.float64)
+    if jd_vecs.size == 0 or matrix.size == 0:
+        return out
+
+    for first, last in _blocks(offsets, max_rows):
+        lo, hi = offsets[first], offsets[last]
+        if hi == lo:
+            continue
+        sims = dot_t(jd_vecs, matrix[lo:hi])                     # (x, rows)
+        starts = offsets[first:last] - lo
+        counts = np.diff(offsets[first:last + 1])
+        mask = counts > 0
+        best = np.maximum.reduceat(sims, starts[mask], axis=1)  # (x, non-empty)
+        out[first:last][mask] = best.mean(axis=0, dtype=np.float64)
+    return out
+
+
+def segmented_coverage_ids(
+    jd_vecs: np.ndarray,
+    vocab: np.ndarray,
+    skill_ids: np.ndarray,
+    offsets: np.ndarray,
+    *,
+    max_rows: int = 50_000,
+) -> np.ndarray:
+    """``segmented_coverage`` for résumés given as skill-id arrays into ``vocab``.
+
+    Each distinct skill is compared with the JD once (``dot_t(jd_vecs, vocab[unique])``);
+    the per-résumé rows are then gathered from that small similarity table.
+    """
+    n = len(offsets) - 1
+    out = np.zeros(n, dtype=np.float64)
+    if jd_vecs.size == 0 or skill_ids.size == 0:
+        return out
+
+    unique, inverse = np.unique(skill_ids, return_inverse=True)
+    inverse = inverse.ravel()
+    table = dot_t(jd_vecs, vocab[unique])                         # (x, distinct skills)
+    for first, last in _blocks(offsets, max_rows):
+        lo, hi = offsets[first], offsets[last]
+        if hi == lo:
+            continue
+        starts = offsets[first:last] - lo
+        counts = np.diff(offsets[first:last + 1])
+        mask = counts > 0
+        best = np.maximum.reduceat(table[:, inverse[lo:hi]], starts[mask], axis=1)
+        out[first:last][mask] = best.mean(axis=0, dtype=np.float64)
+    return out
+
+
+def segmented_coverage_lookup(
+    jd_vecs: np.ndarray,
+    jd_ids: np.ndarray,
+    vocab: np.ndarray,
+    nbr_ids: np.ndarray,
+    nbr_sims: np.ndarray,
+    skill_ids: np.ndarray,
+    offsets: np.ndarray,
+) -> np.ndarray:
+    """``segmented_coverage_ids`` answered from a top-k skill neighbour table.
+
+    ``nbr_ids`` / ``nbr_sims`` are ``(n_table, k)`` (padded with -1 / -inf) and
+    cover vocabulary ids ``< n_table``; ``jd_ids`` maps each JD skill to its
+    vocabulary id or -1. A résumé skill found among a JD skill's neighbours is
+    its exact best match, since every other known skill is at most as similar
+    as the k-th neighbour. Pairs with no hit, unknown JD skills and résumés
+    holding skills newer than the table fall back to a dense product.
+    """
+    n = len(offsets) - 1
+    out = np.zeros(n, dtype=np.float64)
+    if jd_vecs.size == 0 or skill_ids.size == 0:
+        return out
+
+    counts = np.diff(offsets)
+    mask = counts > 0
+    starts = offsets[:-1][mask]
+    n_table = len(nbr_ids)
+    best = np.full((len(jd_vecs), len(starts)), -np.inf, dtype=np.float32)
+
+    for j in np.flatnonzero((jd_ids >= 0) & (jd_ids < n_table)):
+        ids, sims = nbr_ids[jd_ids[j]], nbr_sims[jd_ids[j]]
+        order = np.argsort(ids)
+        ids, sims = ids[order], sims[order]
+        pos = np.minimum(np.searchsorted(ids, skill_ids), len(ids) - 1)
+        values = np.where(ids[pos] == skill_ids, sims[pos], -np.inf).astype(np.float32)
+        best[j] = np.maximum.reduceat(values, starts)
+
+    has_new = np.maximum.reduceat(skill_ids >= n_table, starts)
+    need = ~np.isfinite(best) | has_new[None, :]
+    segs = np.flatnonzero(need.any(axis=0))
+    if segs.size:
+        seg_counts = counts[mask][segs]
+        seg_starts = np.r_[0, np.cumsum(seg_counts[:-1])]
+        rows = np.repeat(starts[segs] - seg_starts, seg_counts) + np.arange(seg_counts.sum())
+        unique, inverse = np.unique(skill_ids[rows], return_inverse=True)
+        table = dot_t(jd_vecs, vocab[unique])                     # (x, distinct skills)
+        dense = np.maximum.reduceat(table[:, inverse.ravel()], seg_starts, axis=1)
+        sub = best[:, segs]
+        sub[need[:, segs]] = dense[need[:, segs]]
+        best[:, segs] = sub
+
+    out[mask] = best.mean(axis=0, dtype=np.float64)
+    return out
+
+
+def _topk_mean_block(
+    sims: np.ndarray, starts: np.ndarray, counts: np.ndarray, k: int, *, max_cells: int = 4_000_000
+) -> np.ndarray:
+    """Per-segment mean of the top-``k`` entries of ``sims`` (m, rows).
+
+    Segment *i* owns columns ``starts[i]:starts[i] + counts[i]``. Runs of
+    segments are padded to their longest member with ``-inf`` so one
+    ``np.partition`` selects every segment's top-k; each run's padded
+    (segments, m, width) array holds at most ~``max_cells`` entries.
+    """
+    n, m = len(counts), sims.shape[0]
+    block = np.zeros(n, dtype=np.float64)
+    if n == 0 or m == 0 or not counts.any():
+        return block
+
+    first = 0
+    while first < n:
+        # longest run whose padded size (segments × m × running max width) fits
+        window = np.maximum(counts[first:first + max(1, max_cells // m)], 1)
+        cells = np.maximum.accumulate(window) * m * np.arange(1, len(window) + 1)
+        last = first + max(1, int(np.searchsorted(cells, max_cells, side="right")))
+        block[first:last] = _topk_mean_padded(sims, starts[first:last], counts[first:last], k)
+        first = last
+    return block
+
+
+def _topk_mean_padded(sims: np.ndarray, starts: np.ndarray, counts: np.ndarray, k: int) -> np.ndarray:
+    n, m = len(counts), sims.shape[0]
+    block = np.zeros(n, dtype=np.float64)
+    width = int(counts.max())
+    if width == 0:
+        return block
+
+    # scatter into (segments, m, width) padded with -inf
+    padded = np.full((n, m, width), -np.inf, dtype=sims.dtype)
+    seg = np.repeat(np.arange(n), counts)
+    col = np.arange(int(counts.sum())) - np.repeat(np.r_[0, np.cumsum(counts[:-1])], counts)
+    cols = np.repeat(starts, counts) + col
+    padded[seg, :, col] = sims[:, cols].T
+    flat = padded.reshape(n, m * width)
+
+    kk = min(k, m * width)
+    top = np.partition(flat, -kk, axis=1)[:, -kk:]
+    valid = np.minimum(counts * m, kk)
+    top = np.where(np.isfinite(top), top, 0.0)
+    nz = valid > 0
+    block[nz] = top[nz].sum(axis=1, dtype=np.float64) / valid[nz]
+    return block
+
+
+def segmented_topk_mean(
+    jd_vecs: np.ndarray,
+    matrix: np.ndarray,
+    offsets: np.ndarray,
+    k: int = 20,
+    *,
+    max_rows: int = 50_000,
+) -> np.ndarray:
+    """Mean of the top-``k`` JD×résumé sentence similarities, per segment.
+
+    Batched equivalent of ``ResumeJDMatcher._topk_sentence_similarity``;
+    segments with fewer than ``k`` pairs average all of them.
+    """
+    n = len(offsets) - 1
+    out = np.zeros(n, dtype=np.float64)
+    if jd_vecs.size == 0 or matrix.size == 0:
+        return out
+
+    counts_all = np.diff(offsets)
+    for first, last in _blocks(offsets, max_rows):
+        lo, hi = offsets[first], offsets[last]
+        if hi == lo:
+            continue
+        sims = dot_t(jd_vecs, matrix[lo:hi])                     # (m, rows)
+        out[first:last] = _topk_mean_block(
+            sims, offsets[first:last] - lo, counts_all[first:last], k, max_cells=max_rows * len(jd_vecs)
+        )
+    return out
+
+
+def _jd_tiles(jd_offsets: np.ndarray, res_offsets: np.ndarray, tile_size: int):
+    """Yield ``(jd_first, jd_last, res_first, res_last)`` tiles of at most ~``tile_size`` similarities."""
+    jd_rows = int(max(1, min(jd_offsets[-1], int(np.sqrt(tile_size)))))
+    for jd_first, jd_last in _blocks(jd_offsets, jd_rows):
+        rows = max(1, int(jd_offsets[jd_last] - jd_offsets[jd_first]))
+        for res_first, res_last in _blocks(res_offsets, max(1, tile_size // rows)):
+            yield jd_first, jd_last, res_first, res_last
+
+
+def multi_coverage(
+    jd_matrix: np.ndarray,
+    jd_offsets: np.ndarray,
+    matrix: np.ndarray,
+    offsets: np.ndarray,
+    *,
+    tile_size: int = 4_000_000,
+) -> np.ndarray:
+    """``segmented_coverage`` for many JDs at once; returns (n_jds, n_resumes).
+
+    JD skills are stacked CSR-style like résumé skills. Similarities are
+    computed one (JD rows × résumé rows) tile of at most ~``tile_size``
+    entries at a time, so the full JD×résumé skill tensor never exists.
+    """
+    n_jd, n = len(jd_offsets) - 1, len(offsets) - 1
+    out = np.zeros((n_jd, n), dtype=np.float64)
+    if jd_matrix.size == 0 or matrix.size == 0:
+        return out
+
+    counts = np.diff(offsets)
+    for jf, jl, rf, rl in _jd_tiles(jd_offsets, offsets, tile_size):
+        jlo, jhi = jd_offsets[jf], jd_offsets[jl]
+        lo, hi = offsets[rf], offsets[rl]
+        if jhi == jlo or hi == lo:
+            continue
+        sims = dot_t(jd_matrix[jlo:jhi], matrix[lo:hi])          # (jd rows, rows)
+        mask = counts[rf:rl] > 0
+        best = np.maximum.reduceat(sims, (offsets[rf:rl] - lo)[mask], axis=1)
+        for j in range(jf, jl):
+            a, b = jd_offsets[j] - jlo, jd_offsets[j + 1] - jlo
+            if b > a:
+                out[j, rf:rl][mask] = best[a:b].mean(axis=0, dtype=np.float64)
+    return out
+
+
+def multi_topk_mean(
+    jd_matrix: np.ndarray,
+    jd_offsets: np.ndarray,
+    matrix: np.ndarray,
+    offsets: np.ndarray,
+    k: int = 20,
+    *,
+    tile_size: int = 4_000_000,
+) -> np.ndarray:
+    """``segmented_topk_mean`` for many JDs at once; returns (n_jds, n_resumes).
+
+    One matmul per tile covers every JD in it; the per-JD top-k selection then
+    runs on row slices of that tile, padded in runs of at most ~``tile_size``
+    entries.
+    """
+    n_jd, n = len(jd_offsets) - 1, len(offsets) - 1
+    out = np.zeros((n_jd, n), dtype=np.float64)
+    if jd_matrix.size == 0 or matrix.size == 0:
+        return out
+
+    counts = np.diff(offsets)
+    for jf, jl, rf, rl in _jd_tiles(jd_offsets, offsets, tile_size):
+        jlo, jhi = jd_offsets[jf], jd_offsets[jl]
+        lo, hi = offsets[rf], offsets[rl]
+        if jhi == jlo or hi == lo:
+            continue
+        sims = dot_t(jd_matrix[jlo:jhi], matrix[lo:hi])          # (jd rows, rows)
+        starts = offsets[rf:rl] - lo
+        for j in range(jf, jl):
+            a, b = jd_offsets[j] - jlo, jd_offsets[j + 1] - jlo
+            if b > a:
+                out[j, rf:rl] = _topk_mean_block(sims[a:b], starts, counts[rf:rl], k, max_cells=tile_size)
+    return out
+
+
+def segmented_best(
+    jd_vecs: np.ndarray,
+    matrix: np.ndarray,
+    offsets: np.ndarray,
+    *,
+    max_rows: int = 50_000,
+) -> np.ndarray:
+    """Best-matching row per (JD vector, segment); returns (len(jd_vecs), n_segments).
+
+    The columns averaged by ``segmented_coverage``; empty segments get 0.
+    """
+    n = len(offsets) - 1
+    out = np.zeros((len(jd_vecs), n), dtype=np.float32)
+    if jd_vecs.size == 0 or matrix.size == 0:
+        return out
+
+    for first, last in _blocks(offsets, max_rows):
+        lo, hi = offsets[first], offsets[last]
+        if hi == lo:
+            continue
+        sims = dot_t(jd_vecs, matrix[lo:hi])
+        counts = np.diff(offsets[first:last + 1])
+        mask = counts > 0
+        out[:, first:last][:, mask] = np.maximum.reduceat(sims, (offsets[first:last] - lo)[mask], axis=1)
+    return out
+
+
+def segmented_topk_values(
+    vecs: np.ndarray,
+    matrix: np.ndarray,
+    offsets: np.ndarray,
+    k: int = 20,
+    *,
+    max_rows: int = 50_000,
+) -> np.ndarray:
+    """Top-``k`` similarities of each query vector within each segment.
+
+    Returns (len(vecs), n_segments, k) float32, unordered within the last axis
+    and padded with ``-inf`` where a segment has fewer than ``k`` rows.
+    """
+    n, m = len(offsets) - 1, len(vecs)
+    out = np.full((m, n, k), -np.inf, dtype=np.float32)
+    if vecs.size == 0 or matrix.size == 0:
+        return out
+
+    counts_all = np.diff(offsets)
+    for first, last in _blocks(offsets, max_rows):
+        lo, hi = offsets[first], offsets[last]
+        if hi == lo:
+            continue
+        counts = counts_all[first:last]
+        width = int(counts.max())
+        sims = dot_t(vecs, matrix[lo:hi])                        # (m, rows)
+        padded = np.full((m, last - first, width), -np.inf, dtype=np.float32)
+        seg = np.repeat(np.arange(last - first), counts)
+        col = np.arange(hi - lo) - np.repeat(offsets[first:last] - lo, counts)
+        padded[:, seg, col] = sims
+        kk = min(k, width)
+        out[:, first:last, :kk] = np.partition(padded, width - kk, axis=2)[:, :, width - kk:]
+    return out
+
+
+def merge_topk(a: np.ndarray, b: np.ndarray, k: int) -> np.ndarray:
+    """Row-wise top-``k`` of two ``(n, *)`` value arrays (``-inf`` padded)."""
+    both = np.concatenate([a, b], axis=1)
+    if both.shape[1] <= k:
+        return both
+    return np.partition(both, both.shape[1] - k, axis=1)[:, -k:]
+
+
+def topk_values_mean(top: np.ndarray, valid: np.ndarray, k: int) -> np.ndarray:
+    """Mean of the ``min(valid, k)`` best finite values per row of ``top``.
+
+    Matches ``segmented_topk_mean`` when ``top`` holds each segment's top-k
+    JD×résumé sentence similarities and ``valid`` is ``counts * n_jd_bullets``.
+    """
+    out = np.zeros(len(top), dtype=np.float64)
+    if top.size == 0:
+        return out
+    kk = min(k, top.shape[1])
+    top = np.partition(top, top.shape[1] - kk, axis=1)[:, -kk:]
+    top = np.where(np.isfinite(top), top, 0.0)
+    valid = np.minimum(valid, kk)
+    nz = valid > 0
+    out[nz] = top[nz].sum(axis=1, dtype=np.float64) / valid[nz]
+    return out
+
+
+def top_n_indices(scores: np.ndarray, n: int) -> np.ndarray:
+    """Indices of the ``n`` best scores, best first; ties keep input order."""
+    n = min(n, len(scores))
+    if n <= 0:
+        return np.empty(0, dtype=np.int64)
+    # everything tied with the n-th best stays a candidate, so ties break by index
+    cutoff = -np.partition(-scores, n - 1)[n - 1]
+    top = np.flatnonzero(scores >= cutoff)
+    return top[np.lexsort((top, -scores[top]))][:n]
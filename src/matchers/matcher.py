@@ -1,38 +1,168 @@
 from __future__ import annotations
 
 import numpy as np
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional, Sequence, Tuple
 from tqdm import tqdm
 
-from src.utils.embedding_utils import embed_texts, aggregate_mean
+from src.utils.embedding_utils import embed_texts, aggregate_mean, embedding_dim
 from src.extractors.feature_extraction import jd_to_embed_payload, resume_to_embed_payload
-from src.extractors.experience_utils import estimate_years_experience, parse_required_years
+from src.extractors.experience_utils import (
+    estimate_years_experience,
+    estimate_years_experience_many,
+    parse_required_years,
+)
 from src.extractors.education_utils import highest_degree, required_degree, meets_degree_requirement
+from src.matchers.batch_ops import (
+    stack_ragged,
+    segmented_coverage,
+    segmented_coverage_ids,
+    segmented_coverage_lookup,
+    segmented_topk_mean,
+    take_ragged,
+    dot_t64,
+    multi_coverage,
+    multi_topk_mean,
+    top_n_indices,
+)
+from src.utils.quantization import dot_t, norm_bound
+from src.utils.skill_vocab import SkillNeighbours, SkillVocabulary
 from config.weight_loader import get_config
 
+# Pruning bounds allow for the 4-decimal rounding of final scores
+_ROUNDING_SLACK = 5e-5
+
+
+class PreparedJD(dict):
+    """Vectorised JD features returned by :meth:`ResumeJDMatcher.prepare_jd`.
+
+    Holds the JD skill vectors, mean vectors, sentence vectors, required years
+    and required degree so the JD is encoded once per ranking run.
+    """
+
 
 class ResumeJDMatcher:
-    def __init__(self, config_path: str | None = None):
+    def __init__(
+        self,
+        config_path: str | None = None,
+        *,
+        skill_vocab: Optional[SkillVocabulary] = None,
+        skill_neighbours: Optional[SkillNeighbours] = None,
+    ):
+        """
+        Args:
+            config_path: Weight config (default config/weight_config.yml)
+            skill_vocab: Shared skill vocabulary; batch scoring then works on
+                skill ids and only embeds unseen skills
+            skill_neighbours: Top-k neighbour table over ``skill_vocab`` used to
+                look up skill coverage instead of recomputing it
+        """
         self.config_path = config_path
+        self.skill_vocab = skill_vocab
+        self.skill_neighbours = skill_neighbours
 
     # --------------------------------------------------
     # Vectorisation helpers
     # --------------------------------------------------
 
-    def _vectorize_resume(self, resume: Dict[str, Any]) -> Dict[str, Any]:
+    def _vectorize_resume(
+        self, resume: Dict[str, Any], *, skill_vocab: Optional[SkillVocabulary] = None
+    ) -> Dict[str, Any]:
         payload = resume_to_embed_payload(resume)
 
-        skill_vecs = embed_texts(payload["skill_texts"])
+        skill_vocab = self.skill_vocab if skill_vocab is None else skill_vocab
+        if skill_vocab is not None:
+            skill_ids = skill_vocab.encode(payload["skill_texts"])
+            skill_vecs = skill_vocab.matrix[skill_ids]
+        else:
+            skill_vecs = embed_texts(payload["skill_texts"])
         exp_vecs = embed_texts(payload["exp_bullets"])
         proj_vecs = embed_texts(payload["proj_bullets"])
-        sent_vecs = np.vstack([exp_vecs, proj_vecs]) if (exp_vecs.size + proj_vecs.size) else np.empty((0, 384))
+        years = estimate_years_experience(resume)
+        features = self._resume_features(resume, skill_vecs, exp_vecs, proj_vecs, years)
+        features["skill_texts"] = payload["skill_texts"]  # row order of skill_vecs
+        return features
+
+    def _vectorize_resumes(
+        self,
+        resumes: List[Dict[str, Any]],
+        *,
+        batch_size: int = 256,
+        skill_vocab: Optional[SkillVocabulary] = None,
+    ) -> List[Dict[str, Any]]:
+        """Vectorise many résumés with one large ``embed_texts`` call."""
+        payloads = [resume_to_embed_payload(res) for res in resumes]
+        # LLM fallbacks (if any) for all résumés run concurrently
+        years = estimate_years_experience_many(resumes)
+        skill_vocab = self.skill_vocab if skill_vocab is None else skill_vocab
+        return self._vectorize_payloads(
+            resumes, payloads, years, batch_size=batch_size, skill_vocab=skill_vocab
+        )
+
+    def _vectorize_payloads(
+        self,
+        resumes: List[Dict[str, Any]],
+        payloads: List[Dict[str, List[str]]],
+        years: List[float],
+        *,
+        batch_size: int = 256,
+        show_progress: bool = True,
+        skill_vocab: Optional[SkillVocabulary] = None,
+    ) -> List[Dict[str, Any]]:
+        """Build résumé features from precomputed payloads and experience years.
+
+        Skill, experience and project texts from every résumé are concatenated,
+        encoded in batches of ``batch_size`` and scattered back by offset. With
+        ``skill_vocab``, skill vectors come from the vocabulary and only skills
+        it has not seen yet are embedded (and added to it).
+        """
+        fields = ("skill_texts", "exp_bullets", "proj_bullets")
+        if skill_vocab is not None:
+            fields = fields[1:]
+            skill_texts = [t for payload in payloads for t in payload["skill_texts"]]
+            skill_ids = skill_vocab.encode(skill_texts, batch_size=batch_size)
+            skill_vecs = skill_vocab.matrix[skill_ids]
+            skill_off = np.cumsum([0] + [len(p["skill_texts"]) for p in payloads])
+
+        texts: List[str] = []
+        offsets: List[int] = [0]
+        for payload in payloads:
+            for field in fields:
+                texts.extend(payload[field])
+                offsets.append(len(texts))
+
+        vecs = embed_texts(texts, batch_size=batch_size)
+
+        features = []
+        for i, res in enumerate(tqdm(resumes, desc="Vectorising resumes", disable=not show_progress)):
+            base = i * len(fields)
+            parts = [vecs[offsets[base + j]:offsets[base + j + 1]] for j in range(len(fields))]
+            if skill_vocab is not None:
+                parts.insert(0, skill_vecs[skill_off[i]:skill_off[i + 1]])
+            features.append(self._resume_features(res, *parts, years[i]))
+            features[-1]["skill_texts"] = payloads[i]["skill_texts"]  # row order of skill_vecs
+            if skill_vocab is not None:
+                features[-1]["skill_ids"] = skill_ids[skill_off[i]:skill_off[i + 1]]
+        return features
+
+    def _resume_features(
+        self,
+        resume: Dict[str, Any],
+        skill_vecs: np.ndarray,
+        exp_vecs: np.ndarray,
+        proj_vecs: np.ndarray,
+        years_experience: float,
+    ) -> Dict[str, Any]:
+        if exp_vecs.size + proj_vecs.size:
+            sent_vecs = np.vstack([exp_vecs, proj_vecs])
+        else:
+            sent_vecs = np.empty((0, embedding_dim()))
 
         features = {
             "skill_vecs": skill_vecs.astype(np.float32),  # individual skill vectors
             "skill_vec": aggregate_mean(skill_vecs),      # mean vector (for DB)
             "exp_vec": aggregate_mean(exp_vecs),
             "sentence_vecs": sent_vecs.astype(np.float32),
-            "years_experience": estimate_years_experience(resume),
+            "years_experience": years_experience,
             "degree_level": highest_degree(resume),
         }
         return features
@@ -51,15 +181,23 @@ class ResumeJDMatcher:
             "years_required": parse_required_years(jd),
             "degree_required": required_degree(jd),
         }
+        if self.skill_vocab is not None:
+            features["skill_ids"] = self.skill_vocab.ids(payload["skill_texts"])  # -1 = unseen
         return features
 
+    def prepare_jd(self, jd: Dict[str, Any]) -> PreparedJD:
+        """Vectorise a JD once so it can be reused across many ``score`` calls."""
+        if isinstance(jd, PreparedJD):
+            return jd
+        return PreparedJD(self._vectorize_jd(jd))
+
     # --------------------------------------------------
     # Similarity helpers
     # --------------------------------------------------
 
     @staticmethod
     def _cosine(a: np.ndarray, b: np.ndarray) -> float:
-        return float(np.dot(a, b)) if a.any() and b.any() else 0.0
+        return float(np.dot(np.asarray(a, dtype=np.float64), np.asarray(b, dtype=np.float64))) if a.any() and b.any() else 0.0
 
     @staticmethod
     def _skill_coverage(jd_vecs: np.ndarray, res_vecs: np.ndarray) -> float:
@@ -69,30 +207,34 @@ class ResumeJDMatcher:
         """
         if jd_vecs.size == 0 or res_vecs.size == 0:
             return 0.0
-        sim_matrix = jd_vecs @ res_vecs.T               # (x, n)
+        sim_matrix = dot_t(jd_vecs, res_vecs)           # (x, n)
         best_for_each_jd = sim_matrix.max(axis=1)       # (x,)
-        return float(best_for_each_jd.mean())
+        return float(best_for_each_jd.mean(dtype=np.float64))
 
     @staticmethod
     def _topk_sentence_similarity(jd_vecs: np.ndarray, res_vecs: np.ndarray, k: int = 20) -> float:
         if jd_vecs.size == 0 or res_vecs.size == 0:
             return 0.0
-        sims = jd_vecs @ res_vecs.T  # (m, n)
+        sims = dot_t(jd_vecs, res_vecs)  # (m, n)
+        k = min(k, sims.size)
         topk = np.partition(sims, -k, axis=None)[-k:]
-        return float(topk.mean())
+        return float(topk.mean(dtype=np.float64))
 
     # --------------------------------------------------
     # Public scoring API
     # --------------------------------------------------
 
-    def score(self, resume: Dict[str, Any], jd: Dict[str, Any]) -> float:
+    def score(self, resume: Dict[str, Any], jd: Dict[str, Any] | PreparedJD) -> float:
+        """Score one résumé against a raw JD or a :class:`PreparedJD`."""
+        resume_f = self._vectorize_resume(resume)
+        jd_f = self.prepare_jd(jd)
+        return self._score_features(resume_f, jd_f)
+
+    def _score_features(self, resume_f: Dict[str, Any], jd_f: Dict[str, Any]) -> float:
         cfg = get_config(self.config_path)
         weights = cfg["weights"]
         penalties = cfg["penalties"]
 
-        resume_f = self._vectorize_resume(resume)
-        jd_f = self._vectorize_jd(jd)
-
         # Use skill coverage instead of mean-vector similarity
         skill_sim = self._skill_coverage(jd_f["skill_vecs"], resume_f["skill_vecs"])
         exp_sim = self._cosine(resume_f["exp_vec"], jd_f["exp_vec"])
@@ -110,11 +252,368 @@ class ResumeJDMatcher:
         )
         return round(final, 4)
 
-    def rank_resumes(self, resumes: List[Dict[str, Any]], jd: Dict[str, Any]) -> List[tuple[str, float]]:
+    def score_batch(
+        self, resumes: List[Dict[str, Any]], jd: Dict[str, Any] | PreparedJD
+    ) -> List[float]:
+        """Score many résumés at once; returns the same values as ``score``."""
+        jd_f = self.prepare_jd(jd)
+        resume_fs = self._vectorize_resumes(resumes)
+        return self._score_features_batch(resume_fs, jd_f).tolist()
+
+    def _score_features_batch(self, resume_fs: List[Dict[str, Any]], jd_f: Dict[str, Any]) -> np.ndarray:
+        """Matrix form of ``_score_features`` over a list of résumé feature dicts."""
+        if not resume_fs:
+            return np.empty(0)
+        *stacked, skill_vocab = self._stack_features(resume_fs, jd_f)
+        return self._score_stacked(jd_f, *stacked, skill_vocab=skill_vocab)
+
+    def _stack_features(self, resume_fs: List[Dict[str, Any]], jd_f: Dict[str, Any]) -> tuple:
+        """``_score_stacked`` arguments (plus ``skill_vocab``) for a list of feature dicts."""
+        dim = jd_f["skill_vec"].shape[0]
+
+        skill_vocab = None
+        if self.skill_vocab is not None and all("skill_ids" in f for f in resume_fs):
+            # Features vectorised against the shared vocabulary: score on id arrays
+            skill_vocab = self.skill_vocab.matrix
+            skill_off = np.zeros(len(resume_fs) + 1, dtype=np.int64)
+            np.cumsum([len(f["skill_ids"]) for f in resume_fs], out=skill_off[1:])
+            skill_mat = np.concatenate([np.asarray(f["skill_ids"], dtype=np.int64) for f in resume_fs])
+        else:
+            skill_mat, skill_off = stack_ragged([f["skill_vecs"] for f in resume_fs], dim)
+        sent_mat, sent_off = stack_ragged([f["sentence_vecs"] for f in resume_fs], dim)
+        return (
+            skill_mat,
+            skill_off,
+            sent_mat,
+            sent_off,
+            np.vstack([f["exp_vec"] for f in resume_fs]),
+            [f["degree_level"] for f in resume_fs],
+            np.array([f["years_experience"] for f in resume_fs], dtype=np.float64),
+            skill_vocab,
+        )
+
+    def _score_stacked(
+        self,
+        jd_f: Dict[str, Any],
+        skill_mat: np.ndarray,
+        skill_off: np.ndarray,
+        sent_mat: np.ndarray,
+        sent_off: np.ndarray,
+        exp_mat: np.ndarray,
+        degree_levels: List[str],
+        years: np.ndarray,
+        *,
+        skill_vocab: Optional[np.ndarray] = None,
+    ) -> np.ndarray:
+        """Score résumés already stacked into ragged matrices with CSR offsets.
+
+        With ``skill_vocab`` (an ``(n_skills, dim)`` matrix), ``skill_mat`` holds
+        integer skill ids into it instead of vectors; if the matcher also has a
+        ``skill_neighbours`` table and the JD was prepared with the vocabulary,
+        coverage is looked up from the table.
+        """
+        exp_sim, edu_match, year_gap = self._cheap_components(jd_f, exp_mat, degree_levels, years)
+        skill_sim, sent_sim = self._similarity_components(
+            jd_f, skill_mat, skill_off, sent_mat, sent_off, skill_vocab=skill_vocab
+        )
+        return self._weighted_score(skill_sim, exp_sim, edu_match, sent_sim, year_gap)
+
+    def _cheap_components(
+        self,
+        jd_f: Dict[str, Any],
+        exp_mat: np.ndarray,
+        degree_levels: List[str],
+        years: np.ndarray,
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """(exp_sim, edu_match, year_gap): one mat-vec plus per-résumé lookups."""
+        exp_sim = dot_t64(jd_f["exp_vec"], exp_mat)
+        edu_match = np.array(
+            [1.0 if meets_degree_requirement(level, jd_f["degree_required"]) else 0.0 for level in degree_levels]
+        )
+        year_gap = np.maximum(0, jd_f["years_required"] - np.asarray(years, dtype=np.float64))
+        return exp_sim, edu_match, year_gap
+
+    def _similarity_components(
+        self,
+        jd_f: Dict[str, Any],
+        skill_mat: np.ndarray,
+        skill_off: np.ndarray,
+        sent_mat: np.ndarray,
+        sent_off: np.ndarray,
+        *,
+        skill_vocab: Optional[np.ndarray] = None,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """(skill_sim, sent_sim): the skill-coverage and top-k sentence matmuls."""
+        if skill_vocab is not None and self.skill_neighbours is not None and "skill_ids" in jd_f:
+            skill_sim = segmented_coverage_lookup(
+                jd_f["skill_vecs"], jd_f["skill_ids"], skill_vocab,
+                self.skill_neighbours.nbr_ids, self.skill_neighbours.nbr_sims,
+                skill_mat, skill_off,
+            )
+        elif skill_vocab is not None:
+            skill_sim = segmented_coverage_ids(jd_f["skill_vecs"], skill_vocab, skill_mat, skill_off)
+        else:
+            skill_sim = segmented_coverage(jd_f["skill_vecs"], skill_mat, skill_off)
+        sent_sim = segmented_topk_mean(jd_f["sentence_vecs"], sent_mat, sent_off, k=20)
+        return skill_sim, sent_sim
+
+    # --------------------------------------------------
+    # Top-N with upper-bound pruning
+    # --------------------------------------------------
+
+    def _score_upper_bound(
+        self,
+        jd_f: Dict[str, Any],
+        skill_off: np.ndarray,
+        sent_off: np.ndarray,
+        exp_sim: np.ndarray,
+        edu_match: np.ndarray,
+        year_gap: np.ndarray,
+        *,
+        skill_cap: float = 1.0,
+        sent_cap: float = 1.0,
+    ) -> np.ndarray:
+        """Upper bound of every résumé's score from the cheap components alone.
+
+        Skill coverage and top-k sentence similarity are means of cosines of
+        unit vectors, so each lies in [-cap, cap] (exactly 0 when either side
+        is empty), where the caps allow for rounding / quantization error; the
+        other terms are exact.
+        """
+        cfg = get_config(self.config_path)
+        weights = cfg["weights"]
+        penalties = cfg["penalties"]
+        has_skills = (np.diff(skill_off) > 0) & (len(jd_f["skill_vecs"]) > 0)
+        has_sents = (np.diff(sent_off) > 0) & (len(jd_f["sentence_vecs"]) > 0)
+        return (
+            abs(weights.get("skill_similarity", 0)) * skill_cap * has_skills
+            + weights.get("exp_similarity", 0) * exp_sim
+            + weights.get("education_match", 0) * edu_match
+            + abs(weights.get("sentence_similarity", 0)) * sent_cap * has_sents
+            + penalties.get("lacking_years", 0) * year_gap
+        )
+
+    def _top_n_stacked(
+        self,
+        jd_f: Dict[str, Any],
+        skill_mat: np.ndarray,
+        skill_off: np.ndarray,
+        sent_mat: np.ndarray,
+        sent_off: np.ndarray,
+        exp_mat: np.ndarray,
+        degree_levels: List[str],
+        years: np.ndarray,
+        top_n: int = 10,
+        *,
+        skill_vocab: Optional[np.ndarray] = None,
+        prune: bool = True,
+        block_size: int = 256,
+        min_score: Optional[float] = None,
+        stats: Optional[Dict[str, int]] = None,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """(indices, scores) of the ``top_n`` best résumés, best first.
+
+        Same result as ``top_n_indices(_score_stacked(...), top_n)``. With
+        ``prune`` the cheap components are computed for everyone first and
+        résumés are scored in decreasing upper-bound order, in blocks that
+        start at ``block_size`` and grow 4x each round; a block only takes
+        résumés whose bound can still reach the current ``top_n``-th score,
+        so those that cannot never go through the skill and sentence matmuls.
+        Blocks are gathered out of the CSR arrays, which costs about as much
+        as scoring them, so while more than half the pool is still reachable
+        the whole pool is scored in place instead.
+
+        With ``min_score`` only scores above it are wanted: résumés whose bound
+        cannot exceed it are never scored and may come back with a ``-inf``
+        score (used by ``stream_top_k`` with its running K-th score).
+        """
+        n = len(skill_off) - 1
+        if top_n <= 0:
+            if stats is not None:
+                stats.update({"candidates": n, "scored": 0, "pruned": n})
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+        exp_sim, edu_match, year_gap = self._cheap_components(jd_f, exp_mat, degree_levels, years)
+        if not prune or (top_n >= n and min_score is None):
+            skill_sim, sent_sim = self._similarity_components(
+                jd_f, skill_mat, skill_off, sent_mat, sent_off, skill_vocab=skill_vocab
+            )
+            scores = self._weighted_score(skill_sim, exp_sim, edu_match, sent_sim, year_gap)
+            if stats is not None:
+                stats.update({"candidates": n, "scored": n, "pruned": 0})
+            top = top_n_indices(scores, top_n)
+            return top, scores[top]
+
+        bound = self._score_upper_bound(
+            jd_f, skill_off, sent_off, exp_sim, edu_match, year_gap,
+            skill_cap=norm_bound(skill_mat if skill_vocab is None else skill_vocab),
+            sent_cap=norm_bound(sent_mat),
+        )
+        order = np.argsort(-bound, kind="stable")
+        desc_bound = bound[order]
+        scores = np.full(n, -np.inf)
+        best = np.empty(0)                  # the top_n scores seen so far
+        done, size, reachable = 0, max(block_size, top_n), n
+        if min_score is not None:
+            reachable = int(np.count_nonzero(desc_bound + _ROUNDING_SLACK > min_score))
+        while done < reachable:
+            if len(best) >= top_n and reachable - done > n // 2:
+                rows = np.arange(n)
+                done = n
+            else:
+                rows = np.sort(order[done:min(done + size, reachable)])
+                done += len(rows)
+                size *= 4
+            if len(rows) == n:
+                sub_skill, sub_skill_off, sub_sent, sub_sent_off = skill_mat, skill_off, sent_mat, sent_off
+            else:
+                sub_skill, sub_skill_off = take_ragged(skill_mat, skill_off, rows)
+                sub_sent, sub_sent_off = take_ragged(sent_mat, sent_off, rows)
+            skill_sim, sent_sim = self._similarity_components(
+                jd_f, sub_skill, sub_skill_off, sub_sent, sub_sent_off, skill_vocab=skill_vocab
+            )
+            scores[rows] = self._weighted_score(
+                skill_sim, exp_sim[rows], edu_match[rows], sent_sim, year_gap[rows]
+            )
+            best = np.concatenate([best, scores[rows]])
+            if len(best) > top_n:
+                best = np.partition(best, len(best) - top_n)[-top_n:]
+            best.sort()
+            if len(best) >= top_n:
+                # résumés past this point cannot reach (or tie) the top_n-th score
+                reachable = min(reachable, int(np.count_nonzero(desc_bound + _ROUNDING_SLACK >= best[0])))
+
+        if stats is not None:
+            scored = int(np.count_nonzero(np.isfinite(scores)))
+            stats.update({"candidates": n, "scored": scored, "pruned": n - scored})
+        top = top_n_indices(scores, top_n)
+        return top, scores[top]
+
+    def rank_top(
+        self,
+        resumes: List[Dict[str, Any]],
+        jd: Dict[str, Any] | PreparedJD,
+        top_n: int = 10,
+        *,
+        prune: bool = True,
+        stats: Optional[Dict[str, int]] = None,
+    ) -> List[Tuple[int, float]]:
+        """Top-``top_n`` (resume index, score), best first (ties keep input order).
+
+        Equals ``rank_resumes(resumes, jd)[:top_n]``; see ``_top_n_stacked``
+        for the upper-bound pruning.
+        """
+        jd_f = self.prepare_jd(jd)
+        return self._rank_features(self._vectorize_resumes(resumes), jd_f, top_n, prune=prune, stats=stats)
+
+    def _rank_features(
+        self,
+        resume_fs: List[Dict[str, Any]],
+        jd_f: Dict[str, Any],
+        top_n: int = 10,
+        *,
+        prune: bool = True,
+        stats: Optional[Dict[str, int]] = None,
+    ) -> List[Tuple[int, float]]:
+        if not resume_fs:
+            return []
+        *stacked, skill_vocab = self._stack_features(resume_fs, jd_f)
+        top, scores = self._top_n_stacked(
+            jd_f, *stacked, top_n, skill_vocab=skill_vocab, prune=prune, stats=stats
+        )
+        return [(int(i), float(s)) for i, s in zip(top, scores)]
+
+    def _weighted_score(
+        self,
+        skill_sim: np.ndarray,
+        exp_sim: np.ndarray,
+        edu_match: np.ndarray,
+        sent_sim: np.ndarray,
+        year_gap: np.ndarray,
+    ) -> np.ndarray:
+        """Weighted sum of score components (any broadcastable shapes), rounded like ``score``."""
+        cfg = get_config(self.config_path)
+        weights = cfg["weights"]
+        penalties = cfg["penalties"]
+        final = (
+            weights.get("skill_similarity", 0) * skill_sim
+            + weights.get("exp_similarity", 0) * exp_sim
+            + weights.get("education_match", 0) * edu_match
+            + weights.get("sentence_similarity", 0) * sent_sim
+            + penalties.get("lacking_years", 0) * year_gap
+        )
+        return np.round(final, 4)
+
+    # --------------------------------------------------
+    # Many JDs at once
+    # --------------------------------------------------
+
+    def score_many(
+        self,
+        resumes: List[Dict[str, Any]],
+        jds: Sequence[Dict[str, Any] | PreparedJD],
+        *,
+        tile_size: int = 4_000_000,
+    ) -> np.ndarray:
+        """(JD × résumé) score matrix; row ``j`` equals ``score_batch(resumes, jds[j])``.
+
+        Every JD and résumé is vectorised once. Skill and sentence similarities
+        are computed in tiles of at most ~``tile_size`` entries, so memory is
+        bounded by the tile size plus the score matrix itself.
+        """
+        jd_fs = [self.prepare_jd(jd) for jd in jds]
+        resume_fs = self._vectorize_resumes(resumes)
+        return self._score_features_many(resume_fs, jd_fs, tile_size=tile_size)
+
+    def _score_features_many(
+        self,
+        resume_fs: List[Dict[str, Any]],
+        jd_fs: List[Dict[str, Any]],
+        *,
+        tile_size: int = 4_000_000,
+    ) -> np.ndarray:
+        if not resume_fs or not jd_fs:
+            return np.empty((len(jd_fs), len(resume_fs)))
+        dim = jd_fs[0]["skill_vec"].shape[0]
+
+        jd_skill, jd_skill_off = stack_ragged([f["skill_vecs"] for f in jd_fs], dim)
+        jd_sent, jd_sent_off = stack_ragged([f["sentence_vecs"] for f in jd_fs], dim)
+        skill_mat, skill_off = stack_ragged([f["skill_vecs"] for f in resume_fs], dim)
+        sent_mat, sent_off = stack_ragged([f["sentence_vecs"] for f in resume_fs], dim)
+
+        skill_sim = multi_coverage(jd_skill, jd_skill_off, skill_mat, skill_off, tile_size=tile_size)
+        sent_sim = multi_topk_mean(jd_sent, jd_sent_off, sent_mat, sent_off, k=20, tile_size=tile_size)
+        exp_mat = np.vstack([f["exp_vec"] for f in resume_fs]).astype(np.float32)
+        exp_sim = dot_t64(np.vstack([f["exp_vec"] for f in jd_fs]), exp_mat)
+
+        levels = [f["degree_level"] for f in resume_fs]
+        edu_by_required = {
+            req: np.array([1.0 if meets_degree_requirement(level, req) else 0.0 for level in levels])
+            for req in {f["degree_required"] for f in jd_fs}
+        }
+        edu_match = np.vstack([edu_by_required[f["degree_required"]] for f in jd_fs])
+        years = np.array([f["years_experience"] for f in resume_fs], dtype=np.float64)
+        required = np.array([f["years_required"] for f in jd_fs], dtype=np.float64)
+        year_gap = np.maximum(0, required[:, None] - years[None, :])
+
+        return self._weighted_score(skill_sim, exp_sim, edu_match, sent_sim, year_gap)
+
+    def rank_many(
+        self,
+        resumes: List[Dict[str, Any]],
+        jds: Sequence[Dict[str, Any] | PreparedJD],
+        top_n: int = 10,
+        *,
+        tile_size: int = 4_000_000,
+    ) -> List[List[Tuple[int, float]]]:
+        """Top-``top_n`` (resume index, score) per JD, best first (ties keep input order)."""
+        scores = self.score_many(resumes, jds, tile_size=tile_size)
+        return [[(int(i), float(row[i])) for i in top_n_indices(row, top_n)] for row in scores]
+
+    def rank_resumes(
+        self, resumes: List[Dict[str, Any]], jd: Dict[str, Any] | PreparedJD
+    ) -> List[tuple[str, float]]:
         """Return list of (resume_id_or_index, score) sorted descending."""
-        scores = []
-        for idx, res in enumerate(tqdm(resumes, desc="Scoring resumes")):
-            s = self.score(res, jd)
-            scores.append((idx, s))
+        jd_f = self.prepare_jd(jd)  # encode the JD once for the whole run
+        scores = list(enumerate(self.score_batch(resumes, jd_f)))
         scores.sort(key=lambda t: t[1], reverse=True)
         return scores 
\ No newline at end of file
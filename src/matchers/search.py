@@ -0,0 +1,160 @@
+"""Two-stage résumé search: pgvector ANN recall, then exact re-ranking.
+
+Stage 1 pulls the top-K résumés by mean skill vector from ``VectorDB``.
+Stage 2 re-scores them with ``ResumeJDMatcher``'s full weighted score using
+the vectors, ``years_experience`` and ``degree_level`` stored at ingest, so no
+résumé goes back through the model or the LLM. Hard must-have skills are
+applied first through a ``SkillIndex``, so stage 1 only scans résumés that
+list every required skill.
+"""
+
+from __future__ import annotations
+
+import time
+import weakref
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from src.extractors.education_utils import highest_degree
+from src.extractors.experience_utils import estimate_years_experience
+from src.extractors.feature_extraction import resume_to_embed_payload
+from src.matchers.matcher import PreparedJD, ResumeJDMatcher
+from src.utils.db_utils import VectorDB
+from src.utils.embedding_utils import embed_texts
+from src.utils.skill_index import SkillIndex
+
+__all__ = ["search_resumes"]
+
+# Skill indexes built from a db for must-have filters, reused across searches
+_skill_indexes: "weakref.WeakKeyDictionary[Any, SkillIndex]" = weakref.WeakKeyDictionary()
+
+
+def _stored_features(
+    db: VectorDB, candidates: List[Tuple[int, float, str, Dict[str, Any]]]
+) -> List[Dict[str, Any]]:
+    """Rebuild scoring features for DB candidates from stored data."""
+    features: List[Optional[Dict[str, Any]]] = [None] * len(candidates)
+
+    # Résumés ingested with sentence vectors + degree_level need no inference
+    stored = [i for i, c in enumerate(candidates) if "degree_level" in c[3]]
+    for i, feats in zip(stored, db.get_resume_features([candidates[i][0] for i in stored])):
+        features[i] = feats
+
+    legacy = [i for i, f in enumerate(features) if f is None]
+    if legacy:
+        for i, feats in zip(legacy, _legacy_features(db, [candidates[i] for i in legacy])):
+            features[i] = feats
+    return features
+
+
+def _legacy_features(
+    db: VectorDB, candidates: List[Tuple[int, float, str, Dict[str, Any]]]
+) -> List[Dict[str, Any]]:
+    """Features for résumés stored before sentence vectors were persisted."""
+    ids = [c[0] for c in candidates]
+    _, skill_mat, skill_off = db.get_skill_vectors_bulk(ids)
+    exp_mat = db.get_exp_vectors_bulk(ids)
+
+    # Sentence vectors are not stored; embed the bullets (served by the embedding cache)
+    payloads = [resume_to_embed_payload(meta) for _, _, _, meta in candidates]
+    bullets = [p["exp_bullets"] + p["proj_bullets"] for p in payloads]
+    sent_off = np.zeros(len(bullets) + 1, dtype=np.int64)
+    np.cumsum([len(b) for b in bullets], out=sent_off[1:])
+    sent_mat = embed_texts([b for group in bullets for b in group]).astype(np.float32)
+
+    features = []
+    for i, (_, _, _, meta) in enumerate(candidates):
+        years = meta.get("years_experience")
+        if years is None:
+            years = estimate_years_experience(meta, allow_llm=False)
+        features.append({
+            "skill_vecs": skill_mat[skill_off[i]:skill_off[i + 1]],
+            "exp_vec": exp_mat[i],
+            "sentence_vecs": sent_mat[sent_off[i]:sent_off[i + 1]],
+            "years_experience": float(years),
+            "degree_level": highest_degree(meta),
+        })
+    return features
+
+
+def search_resumes(
+    db: VectorDB,
+    jd: Dict[str, Any] | PreparedJD,
+    *,
+    matcher: Optional[ResumeJDMatcher] = None,
+    limit: int = 10,
+    recall: int = 1000,
+    min_similarity: float = 0.1,
+    probes: Optional[int] = None,
+    ef_search: Optional[int] = None,
+    must_have: Optional[List[str]] = None,
+    skill_index: Optional[SkillIndex] = None,
+) -> Tuple[List[Dict[str, Any]], Dict[str, float]]:
+    """Search stored résumés for a JD.
+
+    Args:
+        db: VectorDB (or LocalVectorIndex) holding ingested résumés
+        jd: Parsed JD (or a PreparedJD)
+        matcher: Matcher used for the exact re-rank (default config if None)
+        limit: Number of results returned
+        recall: Number of ANN candidates re-ranked in stage 2
+        min_similarity: Stage-1 cosine threshold on the mean skill vector
+        probes / ef_search: ANN recall knobs passed to ``find_candidates``
+        must_have: Skills every result must list (synonyms included)
+        skill_index: Index used for ``must_have``; if None, one is built from
+            ``db`` on the first such search and reused for later searches on
+            the same ``db`` object (pass an index to pick up newer résumés)
+
+    Returns:
+        (results, timings): results are dicts with id, filename, score,
+        ann_similarity and meta, best first; timings are per-stage milliseconds.
+    """
+    matcher = matcher or ResumeJDMatcher()
+    timings: Dict[str, float] = {}
+
+    t0 = time.perf_counter()
+    jd_f = matcher.prepare_jd(jd)
+    t1 = time.perf_counter()
+    timings["prepare_jd_ms"] = (t1 - t0) * 1000
+
+    candidate_ids = None
+    if must_have:
+        if skill_index is None:
+            skill_index = _skill_indexes.get(db)
+            if skill_index is None:
+                skill_index = _skill_indexes[db] = SkillIndex.from_db(db)
+        else:
+            _skill_indexes[db] = skill_index
+        candidate_ids = skill_index.match_all(must_have).tolist()
+        t1b = time.perf_counter()
+        timings["skill_filter_ms"] = (t1b - t1) * 1000
+        t1 = t1b
+
+    candidates = db.find_candidates(
+        jd_f["skill_vec"], limit=recall, min_similarity=min_similarity,
+        probes=probes, ef_search=ef_search, candidate_ids=candidate_ids,
+    )
+    t2 = time.perf_counter()
+    timings["ann_recall_ms"] = (t2 - t1) * 1000
+
+    features = _stored_features(db, candidates) if candidates else []
+    t3 = time.perf_counter()
+    timings["fetch_ms"] = (t3 - t2) * 1000
+
+    ranked = matcher._rank_features(features, jd_f, limit)
+    t4 = time.perf_counter()
+    timings["rerank_ms"] = (t4 - t3) * 1000
+    timings["total_ms"] = (t4 - t0) * 1000
+
+    results = [
+        {
+            "id": candidates[i][0],
+            "filename": candidates[i][2],
+            "score": score,
+            "ann_similarity": float(candidates[i][1]),
+            "meta": candidates[i][3],
+        }
+        for i, score in ranked
+    ]
+    return results, timings
@@ -0,0 +1,202 @@
+"""Incremental re-scoring of a résumé pool while a JD is being edited.
+
+A ``RankingSession`` keeps, for every candidate, the partial results the
+weighted score is built from:
+
+* one best-match column per JD skill (``segmented_best``), summed into a
+  running coverage total;
+* the top-k sentence similarities per JD bullet (``segmented_topk_values``),
+  merged into one running top-k per candidate.
+
+When a recruiter edits ``technical_skills`` or ``key_responsibilities``, only
+the added skills / bullets are embedded and compared with the pool; removed
+ones are dropped from the partial results. The expensive matmuls therefore
+scale with the size of the edit, not the size of the pool.
+"""
+
+from __future__ import annotations
+
+from collections import Counter
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from src.extractors.education_utils import meets_degree_requirement, required_degree
+from src.extractors.experience_utils import parse_required_years
+from src.extractors.feature_extraction import jd_to_embed_payload
+from src.matchers.batch_ops import (
+    dot_t64,
+    merge_topk,
+    segmented_best,
+    segmented_topk_values,
+    stack_ragged,
+    top_n_indices,
+    topk_values_mean,
+)
+from src.matchers.matcher import ResumeJDMatcher
+from src.utils.embedding_utils import aggregate_mean, embed_texts
+from src.utils.quantization import quantize
+
+__all__ = ["RankingSession"]
+
+
+class RankingSession:
+    """Live ranking of a fixed résumé pool against one editable JD.
+
+    Args:
+        matcher: Matcher whose weights / penalties are applied
+        resumes: Parsed résumés (vectorised once); or pass ``resume_features``
+        jd: Initial JD (optional; call :meth:`update_jd` later)
+        resume_features: Precomputed ``_vectorize_resume``-style feature dicts
+        k: Number of sentence similarities averaged (as in ``score``)
+        vector_dtype: Storage of the pooled skill / sentence vectors
+            ("float32", "float16" or "int8"); edits are scored on them directly
+    """
+
+    def __init__(
+        self,
+        matcher: ResumeJDMatcher,
+        resumes: Optional[List[Dict[str, Any]]] = None,
+        jd: Optional[Dict[str, Any]] = None,
+        *,
+        resume_features: Optional[List[Dict[str, Any]]] = None,
+        k: int = 20,
+        vector_dtype: str = "float32",
+    ):
+        if resume_features is None:
+            resume_features = matcher._vectorize_resumes(resumes or [])
+        if resume_features:
+            dim = resume_features[0]["skill_vec"].shape[0]
+        else:
+            from src.utils.embedding_utils import embedding_dim
+            dim = embedding_dim()
+        self.matcher = matcher
+        self.k = k
+        self.n = len(resume_features)
+
+        # Pool, stacked once
+        self._skill_mat, self._skill_off = stack_ragged([f["skill_vecs"] for f in resume_features], dim)
+        self._sent_mat, self._sent_off = stack_ragged([f["sentence_vecs"] for f in resume_features], dim)
+        self._skill_mat = quantize(self._skill_mat, vector_dtype)
+        self._sent_mat = quantize(self._sent_mat, vector_dtype)
+        self._sent_counts = np.diff(self._sent_off)
+        self._exp_mat = (
+            np.vstack([f["exp_vec"] for f in resume_features]).astype(np.float32)
+            if resume_features else np.empty((0, dim), dtype=np.float32)
+        )
+        self._levels = [f["degree_level"] for f in resume_features]
+        self._years = np.array([f["years_experience"] for f in resume_features], dtype=np.float64)
+
+        # Per-JD partial results
+        self._skill_cols: Dict[str, np.ndarray] = {}    # skill text -> (n,) best match
+        self._coverage_sum = np.zeros(self.n, dtype=np.float64)
+        self._bullet_vecs: Dict[str, np.ndarray] = {}   # bullet text -> (dim,)
+        self._bullet_topk: Dict[str, np.ndarray] = {}   # bullet text -> (n, k)
+        self._bullets: Counter = Counter()              # bullet text -> multiplicity
+        self._bullet_order: List[str] = []
+        self._sent_topk = np.full((self.n, 0), -np.inf, dtype=np.float32)
+        self._exp_sim = np.zeros(self.n, dtype=np.float64)
+        self._edu_match = np.zeros(self.n, dtype=np.float64)
+        self._year_gap = np.zeros(self.n, dtype=np.float64)
+        self._years_required: Optional[float] = None
+        self._degree_required: Any = object()
+
+        if jd is not None:
+            self.update_jd(jd)
+
+    # --------------------------------------------------
+    # Edits
+    # --------------------------------------------------
+
+    def update_jd(self, jd: Dict[str, Any]) -> Dict[str, int]:
+        """Apply an edited JD; only changed skills / bullets are recomputed.
+
+        Returns counts of added / removed skills and bullets.
+        """
+        payload = jd_to_embed_payload(jd)
+        skills = list(dict.fromkeys(payload["skill_texts"]))
+        bullets = Counter(payload["bullet_texts"])
+
+        skill_set = set(skills)
+        added_skills = [s for s in skills if s not in self._skill_cols]
+        removed_skills = [s for s in self._skill_cols if s not in skill_set]
+        added_bullets = [b for b in bullets if b not in self._bullet_topk]
+        bullets_in = bullets - self._bullets             # multiset differences
+        bullets_out = self._bullets - bullets
+
+        new_texts = added_skills + added_bullets
+        vecs = embed_texts(new_texts).astype(np.float32) if new_texts else None
+
+        for skill in removed_skills:
+            self._coverage_sum -= self._skill_cols.pop(skill)
+        if added_skills:
+            cols = segmented_best(vecs[:len(added_skills)], self._skill_mat, self._skill_off)
+            for skill, col in zip(added_skills, cols):
+                self._skill_cols[skill] = col
+                self._coverage_sum += col
+
+        if added_bullets:
+            bullet_vecs = vecs[len(added_skills):]
+            tops = segmented_topk_values(bullet_vecs, self._sent_mat, self._sent_off, self.k)
+            for bullet, vec, top in zip(added_bullets, bullet_vecs, tops):
+                self._bullet_vecs[bullet] = vec
+                self._bullet_topk[bullet] = top
+        for bullet in [b for b in self._bullet_topk if b not in bullets]:
+            del self._bullet_topk[bullet], self._bullet_vecs[bullet]
+
+        if bullets_in or bullets_out:
+            if bullets_out:
+                # top-k cannot be "un-merged": rebuild from the per-bullet partials
+                self._sent_topk = np.full((self.n, 0), -np.inf, dtype=np.float32)
+                merge = bullets
+            else:
+                merge = bullets_in
+            for bullet, count in merge.items():
+                for _ in range(count):
+                    self._sent_topk = merge_topk(self._sent_topk, self._bullet_topk[bullet], self.k)
+            self._bullets = bullets
+        if payload["bullet_texts"] != self._bullet_order:
+            self._bullet_order = list(payload["bullet_texts"])
+            exp_vec = aggregate_mean(
+                np.vstack([self._bullet_vecs[b] for b in self._bullet_order])
+                if self._bullet_order else np.empty((0, self._exp_mat.shape[1]), dtype=np.float32)
+            )
+            self._exp_sim = dot_t64(exp_vec, self._exp_mat)
+
+        self._update_requirements(parse_required_years(jd), required_degree(jd))
+        return {
+            "skills_added": len(added_skills),
+            "skills_removed": len(removed_skills),
+            "bullets_added": sum(bullets_in.values()),
+            "bullets_removed": sum(bullets_out.values()),
+        }
+
+    def _update_requirements(self, years_required: float, degree_required: Any) -> None:
+        if years_required != self._years_required:
+            self._years_required = years_required
+            self._year_gap = np.maximum(0, years_required - self._years)
+        if degree_required != self._degree_required:
+            self._degree_required = degree_required
+            self._edu_match = np.array(
+                [1.0 if meets_degree_requirement(level, degree_required) else 0.0 for level in self._levels]
+            )
+
+    # --------------------------------------------------
+    # Results
+    # --------------------------------------------------
+
+    def scores(self) -> np.ndarray:
+        """Current weighted score of every résumé (same values as ``score_batch``)."""
+        if self._skill_cols:
+            skill_sim = self._coverage_sum / len(self._skill_cols)
+        else:
+            skill_sim = np.zeros(self.n)
+        n_bullets = sum(self._bullets.values())
+        sent_sim = topk_values_mean(self._sent_topk, self._sent_counts * n_bullets, self.k)
+        return self.matcher._weighted_score(skill_sim, self._exp_sim, self._edu_match, sent_sim, self._year_gap)
+
+    def rank(self, top_n: Optional[int] = None) -> List[Tuple[int, float]]:
+        """(résumé index, score) best first; ties keep input order."""
+        scores = self.scores()
+        top = top_n_indices(scores, self.n if top_n is None else top_n)
+        return [(int(i), float(scores[i])) for i in top]
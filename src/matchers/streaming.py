@@ -0,0 +1,121 @@
+"""Streaming top-K ranking over résumé iterators with bounded memory.
+
+Résumés (or precomputed feature dicts, e.g. ``ResumeSnapshot.iter_features()``
+or ``VectorDB.iter_resume_features()``) are pulled from any iterable
+``chunk_size`` at a time, scored with the batched kernels and dropped; only a
+heap of the current top-K survives between chunks::
+
+    files = Path("resumes_json").glob("*.json")
+    top = stream_top_k(matcher, (load_resume(f) for f in files), jd, k=10)
+
+    top = stream_top_k(matcher, db.iter_resume_features(), jd, k=10,
+                       features=True, key=lambda f: f["id"])
+
+Within each chunk, items whose cheap-component score bound (the one
+``rank_top`` prunes with) cannot beat the running K-th score skip the skill
+and sentence kernels. An optional per-item ``upper_bound`` also skips items
+before they are vectorised, and stops the stream early when items arrive in
+non-increasing bound order.
+"""
+
+from __future__ import annotations
+
+import heapq
+from itertools import islice
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from src.matchers.matcher import PreparedJD, ResumeJDMatcher
+
+__all__ = ["stream_top_k"]
+
+
+def stream_top_k(
+    matcher: ResumeJDMatcher,
+    items: Iterable[Any],
+    jd: Dict[str, Any] | PreparedJD,
+    k: int = 10,
+    *,
+    chunk_size: int = 1024,
+    features: bool = False,
+    key: Optional[Callable[[Any], Hashable]] = None,
+    upper_bound: Optional[Callable[[Any], float]] = None,
+    bound_sorted: bool = False,
+    stats: Optional[Dict[str, int]] = None,
+) -> List[Tuple[Hashable, float]]:
+    """Top-``k`` (key, score) pairs of a résumé stream, best first.
+
+    Scores equal ``score_batch`` and ties keep stream order, so the result is
+    ``rank_resumes(list(items), jd)[:k]`` without materialising the pool.
+
+    Args:
+        matcher: Matcher used for vectorisation and scoring
+        items: Iterable of parsed résumés (or feature dicts with ``features=True``)
+        jd: Parsed JD or PreparedJD (encoded once)
+        k: Number of results kept
+        chunk_size: Items vectorised / scored together
+        features: Items are ``_vectorize_resume``-style feature dicts
+        key: Identifier stored for an item (default: its position in the stream)
+        upper_bound: Cheap upper bound of an item's score, checked before
+            vectorising; items whose bound cannot beat the current K-th score
+            are skipped unscored (vectorised items are always checked against
+            the matcher's own bound as well)
+        bound_sorted: Items arrive in non-increasing ``upper_bound`` order, so
+            the stream stops at the first item that cannot beat the K-th score
+        stats: Optional dict updated with seen / scored / skipped counts
+            (skipped covers both bounds)
+    """
+    jd_f = matcher.prepare_jd(jd)
+    counts = {"seen": 0, "scored": 0, "skipped": 0, "stopped_early": 0}
+    heap: List[Tuple[float, int, Hashable]] = []  # (score, -position, key): worst on top
+    iterator = iter(items)
+    position = 0
+
+    def threshold() -> float:
+        return heap[0][0] if len(heap) >= k else -np.inf
+
+    while k > 0:
+        chunk = list(islice(iterator, chunk_size))
+        if not chunk:
+            break
+        positions = range(position, position + len(chunk))
+        position += len(chunk)
+        counts["seen"] += len(chunk)
+
+        if upper_bound is not None:
+            kept = []
+            for i, item in zip(positions, chunk):
+                # a later item tying the K-th score loses on stream order
+                if upper_bound(item) > threshold():
+                    kept.append((i, item))
+                elif bound_sorted:
+                    counts["stopped_early"] = 1
+                    break
+                else:
+                    counts["skipped"] += 1
+            positions = [i for i, _ in kept]
+            chunk = [item for _, item in kept]
+
+        if chunk:
+            resume_fs = chunk if features else matcher._vectorize_resumes(chunk)
+            *stacked, skill_vocab = matcher._stack_features(resume_fs, jd_f)
+            # only the chunk's own top-k can enter the heap
+            chunk_stats: Dict[str, int] = {}
+            top, scores = matcher._top_n_stacked(
+                jd_f, *stacked, k, skill_vocab=skill_vocab, min_score=threshold(), stats=chunk_stats
+            )
+            counts["scored"] += chunk_stats["scored"]
+            counts["skipped"] += chunk_stats["pruned"]
+            for j, score in zip(top, scores):
+                entry = (float(score), -positions[j], key(chunk[j]) if key else positions[j])
+                if len(heap) < k:
+                    heapq.heappush(heap, entry)
+                elif entry[0] > heap[0][0]:
+                    heapq.heappushpop(heap, entry)
+        if counts["stopped_early"]:
+            break
+
+    if stats is not None:
+        stats.update(counts)
+    return [(item_key, score) for score, _, item_key in sorted(heap, key=lambda e: (-e[0], -e[1]))]
@@ -1,11 +1,17 @@
 """Database utilities for storing and retrieving resume vectors."""
 
+import io
 import os
-from typing import Dict, Any, List, Tuple, Optional
+import struct
+import threading
+from contextlib import contextmanager
+from typing import Dict, Any, Iterable, Iterator, List, Tuple, Optional
 import json
 import numpy as np
 import psycopg2
+import psycopg2.extensions
 from psycopg2.extras import execute_values
+from psycopg2.pool import ThreadedConnectionPool
 from pathlib import Path
 
 # Load environment variables from .env file
@@ -21,83 +27,460 @@ def _vector_to_string(vec: np.ndarray) -> str:
     return '[' + ','.join(map(str, vec.tolist())) + ']'
 
 
-class VectorDB:
-    def __init__(self, dsn: str | None = None):
-        """Connect to Postgres with pgvector."""
-        if dsn:
-            self.conn = psycopg2.connect(dsn)
-        else:
-            # Try individual parameters first (safer for special characters)
-            host = os.getenv("DB_HOST")
-            if host:
-                print(f"🔗 Connecting to {host}...")
-                self.conn = psycopg2.connect(
-                    host=host,
-                    port=os.getenv("DB_PORT", "5432"),
-                    database=os.getenv("DB_NAME", "postgres"),
-                    user=os.getenv("DB_USER", "postgres"),
-                    password=os.getenv("DB_PASSWORD")
-                )
+# PostgreSQL binary COPY framing (signature, flags, header extension length)
+_PGCOPY_HEADER = b"PGCOPY\n\xff\r\n\x00" + struct.pack("!ii", 0, 0)
+_PGCOPY_TRAILER = struct.pack("!h", -1)
+
+
+def _parse_vector(value: Optional[str], cur) -> Optional[np.ndarray]:
+    """psycopg2 typecaster: pgvector text output -> float32 ndarray (parsed in C)."""
+    if value is None:
+        return None
+    return np.fromstring(value[1:-1], dtype=np.float32, sep=",")
+
+
+def _binary_vector(vec: np.ndarray) -> bytes:
+    """pgvector binary wire format: int16 dim, int16 unused, big-endian float4s.
+
+    float16 arrays are written as ``halfvec`` (big-endian float2s).
+    """
+    vec = np.asarray(vec)
+    vec = vec.astype(">f2" if vec.dtype == np.float16 else ">f4").ravel()
+    return struct.pack("!hh", vec.shape[0], 0) + vec.tobytes()
+
+
+def _binary_copy_buffer(rows: Iterable[tuple]) -> io.BytesIO:
+    """Encode rows as a binary COPY stream.
+
+    Values are written as int4 (int), text (str) or vector (ndarray; halfvec
+    for float16 arrays), so the column list of the COPY must match those types.
+    """
+    buf = io.BytesIO()
+    buf.write(_PGCOPY_HEADER)
+    for row in rows:
+        buf.write(struct.pack("!h", len(row)))
+        for value in row:
+            if isinstance(value, np.ndarray):
+                data = _binary_vector(value)
+            elif isinstance(value, str):
+                data = value.encode("utf-8")
             else:
-                # Fall back to connection string
-                database_url = os.getenv("DATABASE_URL")
-                if not database_url:
-                    raise ValueError(
-                        "No database connection info found. Please set either:\n"
-                        "1. Individual env vars: DB_HOST, DB_USER, DB_PASSWORD, etc.\n"
-                        "2. DATABASE_URL connection string"
-                    )
-                print("🔗 Connecting via DATABASE_URL...")
-                self.conn = psycopg2.connect(database_url)
-        
-        self._check_pgvector()
-        self._ensure_tables()
+                data = struct.pack("!i", int(value))
+            buf.write(struct.pack("!i", len(data)) + data)
+    buf.write(_PGCOPY_TRAILER)
+    buf.seek(0)
+    return buf
 
-    def _check_pgvector(self):
-        """Verify pgvector extension is available."""
-        with self.conn.cursor() as cur:
-            cur.execute(
-                "SELECT EXISTS (SELECT 1 FROM pg_extension WHERE extname = 'vector');"
-            )
-            if not cur.fetchone()[0]:
+
+_RESUME_SKILL_COPY_SQL = (
+    "COPY resume_skills (resume_id, skill_id) FROM STDIN WITH (FORMAT binary)"
+)
+_SENTENCE_COPY_SQL = (
+    "COPY resume_sentence_vectors (resume_id, position, sentence_vec) FROM STDIN WITH (FORMAT binary)"
+)
+
+
+def _parse_binary_vectors(data: bytes) -> np.ndarray:
+    """Decode a binary COPY of a single NOT NULL vector / halfvec column into (n, dim) float32.
+
+    Every row has the same width, so the whole payload is reinterpreted with one
+    ``np.frombuffer`` instead of being parsed row by row.
+    """
+    body = len(_PGCOPY_HEADER)
+    ext_len = struct.unpack_from("!i", data, body - 4)[0]
+    body += ext_len
+    if len(data) - body <= len(_PGCOPY_TRAILER):
+        return np.empty((0, 0), dtype=np.float32)
+    length, dim = struct.unpack_from("!ih", data, body + 2)
+    width = (length - 4) // dim if dim else 4   # 4 for vector, 2 for halfvec
+    stride = 2 + 4 + 4 + width * dim      # field count, length, dim/unused, floats
+    n = (len(data) - body - len(_PGCOPY_TRAILER)) // stride
+    rows = np.frombuffer(data, dtype=np.uint8, count=n * stride, offset=body).reshape(n, stride)
+    return rows[:, 10:].copy().view(">f2" if width == 2 else ">f4").astype(np.float32)
+
+
+# Columns that get an ANN index: (table, column)
+_ANN_COLUMNS = [
+    ("resumes", "skill_vec"),
+    ("resumes", "exp_vec"),
+    ("skills", "vec"),
+]
+_INDEX_METHODS = ("hnsw", "ivfflat")
+
+# Per-skill / per-sentence vector columns that may be stored as halfvec
+_QUANTIZABLE_COLUMNS = [
+    ("skills", "vec"),
+    ("resume_sentence_vectors", "sentence_vec"),
+]
+_VECTOR_TYPES = ("vector", "halfvec")
+
+# Same definition as db_schema.sql; recreated after migrating legacy skill tables
+_RESUME_STATS_VIEW_SQL = """
+    CREATE OR REPLACE VIEW resume_stats AS
+    SELECT
+        r.id,
+        r.filename,
+        (r.meta->>'name')::text as name,
+        COUNT(rs.skill_id) as skill_count,
+        r.created_at
+    FROM resumes r
+    LEFT JOIN resume_skills rs ON rs.resume_id = r.id
+    GROUP BY r.id, r.filename, r.meta, r.created_at;
+"""
+
+# Schema checks / type registration run once per process per database
+_schema_lock = threading.Lock()
+_schema_ready: set = set()
+_registered_vector_oids: set = set()
+
+
+def _connection_args(dsn: str | None) -> Tuple[tuple, Dict[str, Any]]:
+    """Resolve psycopg2.connect arguments from ``dsn`` or the environment."""
+    if dsn:
+        return (dsn,), {}
+    # Try individual parameters first (safer for special characters)
+    host = os.getenv("DB_HOST")
+    if host:
+        print(f"🔗 Connecting to {host}...")
+        return (), dict(
+            host=host,
+            port=os.getenv("DB_PORT", "5432"),
+            database=os.getenv("DB_NAME", "postgres"),
+            user=os.getenv("DB_USER", "postgres"),
+            password=os.getenv("DB_PASSWORD")
+        )
+    # Fall back to connection string
+    database_url = os.getenv("DATABASE_URL")
+    if not database_url:
+        raise ValueError(
+            "No database connection info found. Please set either:\n"
+            "1. Individual env vars: DB_HOST, DB_USER, DB_PASSWORD, etc.\n"
+            "2. DATABASE_URL connection string"
+        )
+    print("🔗 Connecting via DATABASE_URL...")
+    return (database_url,), {}
+
+
+class VectorDB:
+    def __init__(
+        self,
+        dsn: str | None = None,
+        *,
+        min_connections: int = 1,
+        max_connections: int = 1,
+        dim: int | None = None,
+        index_method: str | None = "hnsw",
+        index_params: Dict[str, int] | None = None,
+        vector_type: str | None = None,
+    ):
+        """Connect to Postgres with pgvector.
+
+        Args:
+            dsn: Connection string; falls back to DB_* env vars / DATABASE_URL
+            min_connections: Connections opened up front in the pool
+            max_connections: Upper bound of concurrently borrowed connections;
+                extra threads block until a connection is returned
+            dim: Vector dimension; defaults to the loaded embedding model's
+            index_method: "hnsw", "ivfflat" or None to skip ANN index creation
+            index_params: Index build options (m / ef_construction for hnsw,
+                lists for ivfflat)
+            vector_type: Column type of skill and sentence vectors, "vector"
+                or "halfvec" (half the storage, needs pgvector >= 0.7);
+                existing columns are converted. None keeps the current type
+                ("vector" for new tables).
+        """
+        if vector_type is not None and vector_type not in _VECTOR_TYPES:
+            raise ValueError(f"Unknown vector type '{vector_type}', expected one of {_VECTOR_TYPES}")
+        if dim is None:
+            from src.utils.embedding_utils import embedding_dim
+            dim = embedding_dim()
+        self.dim = dim
+
+        args, kwargs = _connection_args(dsn)
+        self._pool = ThreadedConnectionPool(min_connections, max_connections, *args, **kwargs)
+        self._slots = threading.BoundedSemaphore(max_connections)
+
+        with self._connection() as conn:
+            key = (conn.dsn, vector_type)
+            with _schema_lock:
+                if key not in _schema_ready:
+                    self._check_pgvector(conn, vector_type)
+                    self._register_vector_type(conn)
+                    self._ensure_tables(conn, vector_type)
+                    if index_method:
+                        self._create_indexes(conn, index_method, index_params or {})
+                    _schema_ready.add(key)
+            with conn.cursor() as cur:
+                self._half_skills = self._column_type(cur, "skills", "vec")[0] == "halfvec"
+                self._half_sentences = self._column_type(cur, "resume_sentence_vectors", "sentence_vec")[0] == "halfvec"
+            conn.rollback()
+
+    @contextmanager
+    def _connection(self) -> Iterator[psycopg2.extensions.connection]:
+        """Borrow a pooled connection; safe to use from several threads."""
+        with self._slots:
+            conn = self._pool.getconn()
+            try:
+                yield conn
+            finally:
+                self._pool.putconn(conn)
+
+    def _check_pgvector(self, conn, vector_type: str | None = None):
+        """Verify pgvector extension is available (>= 0.7 for halfvec)."""
+        with conn.cursor() as cur:
+            cur.execute("SELECT extversion FROM pg_extension WHERE extname = 'vector';")
+            row = cur.fetchone()
+            if row is None:
                 raise RuntimeError(
                     "pgvector extension not found. Please run:\n"
                     "CREATE EXTENSION vector;"
                 )
+            version = tuple(int(part) for part in row[0].split(".")[:2])
+            if vector_type == "halfvec" and version < (0, 7):
+                raise RuntimeError(
+                    f"halfvec columns need pgvector >= 0.7 (installed: {row[0]}). Please run:\n"
+                    "ALTER EXTENSION vector UPDATE;"
+                )
+
+    def _register_vector_type(self, conn):
+        """Return vector columns as float32 ndarrays instead of strings.
+
+        Registered globally so every pooled connection picks it up.
+        """
+        with conn.cursor() as cur:
+            # halfvec (pgvector >= 0.7) has the same text format
+            cur.execute("SELECT to_regtype('vector')::oid, to_regtype('halfvec')::oid;")
+            oids = [oid for oid in cur.fetchone() if oid is not None]
+        for oid, name in zip(oids, ("VECTOR", "HALFVEC")):
+            if oid not in _registered_vector_oids:
+                vector_type = psycopg2.extensions.new_type((oid,), name, _parse_vector)
+                psycopg2.extensions.register_type(vector_type)
+                _registered_vector_oids.add(oid)
+
+    def _copy_vectors_out(self, cur, query: str, params: tuple) -> np.ndarray:
+        """Run ``COPY (query) TO STDOUT`` in binary and return an (n, dim) matrix.
 
-    def _ensure_tables(self):
-        """Ensure required tables exist."""
-        with self.conn.cursor() as cur:
+        ``query`` must select exactly one NOT NULL vector column.
+        """
+        buf = io.BytesIO()
+        sql = cur.mogrify(query, params).decode()
+        cur.copy_expert(f"COPY ({sql}) TO STDOUT WITH (FORMAT binary)", buf)
+        return _parse_binary_vectors(buf.getvalue())
+
+    @staticmethod
+    def _column_type(cur, table: str, column: str) -> Tuple[str, int]:
+        """(type name, typmod) of a column, e.g. ("halfvec", 384)."""
+        cur.execute(
+            """
+            SELECT format_type(atttypid, NULL), atttypmod FROM pg_attribute
+            WHERE attrelid = %s::regclass AND attname = %s;
+            """,
+            (table, column),
+        )
+        return cur.fetchone()
+
+    def _ensure_tables(self, conn, vector_type: str | None = None):
+        """Ensure required tables exist (skill / sentence vectors as ``vector_type``)."""
+        vec_type = vector_type or "vector"
+        with conn.cursor() as cur:
             # Create resumes table if not exists
             cur.execute("""
                 CREATE TABLE IF NOT EXISTS resumes (
                     id SERIAL PRIMARY KEY,
                     filename TEXT UNIQUE NOT NULL,
                     meta JSONB NOT NULL,
-                    skill_vec vector NOT NULL,
-                    exp_vec vector NOT NULL,
+                    skill_vec vector({dim}) NOT NULL,
+                    exp_vec vector({dim}) NOT NULL,
                     created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
                 );
-            """)
+            """.format(dim=self.dim))
             
-            # Create resume_skill_vectors table if not exists
+            # Skill vocabulary: one vector per distinct skill text
             cur.execute("""
-                CREATE TABLE IF NOT EXISTS resume_skill_vectors (
+                CREATE TABLE IF NOT EXISTS skills (
                     id SERIAL PRIMARY KEY,
+                    text TEXT UNIQUE NOT NULL,
+                    vec {vec_type}({dim}) NOT NULL
+                );
+                CREATE TABLE IF NOT EXISTS resume_skills (
                     resume_id INTEGER REFERENCES resumes(id) ON DELETE CASCADE,
-                    skill_text TEXT NOT NULL,
-                    skill_vec vector NOT NULL,
-                    created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
+                    skill_id INTEGER NOT NULL REFERENCES skills(id),
+                    PRIMARY KEY (resume_id, skill_id)
                 );
-                CREATE INDEX IF NOT EXISTS idx_resume_skill_vectors_resume_id 
-                ON resume_skill_vectors(resume_id);
-            """)
+                CREATE INDEX IF NOT EXISTS idx_resume_skills_skill_id
+                ON resume_skills(skill_id);
+            """.format(dim=self.dim, vec_type=vec_type))
+            cur.execute("SELECT to_regclass('resume_skill_vectors') IS NOT NULL;")
+            if cur.fetchone()[0]:
+                print(
+                    "⚠️ Legacy resume_skill_vectors table found; its skills are not searched "
+                    "until it is migrated (ingest_resumes.py --migrate-skill-vectors)"
+                )
+
+            # Experience + project bullet vectors, in _vectorize_resume order
+            cur.execute("""
+                CREATE TABLE IF NOT EXISTS resume_sentence_vectors (
+                    resume_id INTEGER REFERENCES resumes(id) ON DELETE CASCADE,
+                    position INTEGER NOT NULL,
+                    sentence_vec {vec_type}({dim}) NOT NULL,
+                    PRIMARY KEY (resume_id, position)
+                );
+            """.format(dim=self.dim, vec_type=vec_type))
+
+            # Tables created before dimensions were typed: pin them to ``dim``;
+            # switch skill / sentence columns to the requested vector type
+            for table, column in dict.fromkeys(_ANN_COLUMNS + _QUANTIZABLE_COLUMNS):
+                type_name, typmod = self._column_type(cur, table, column)
+                if typmod not in (-1, self.dim):
+                    raise RuntimeError(
+                        f"{table}.{column} is {type_name}({typmod}) but the embedding model "
+                        f"produces {self.dim} dimensions"
+                    )
+                target = vector_type if vector_type and (table, column) in _QUANTIZABLE_COLUMNS else type_name
+                if target != type_name:
+                    print(f"🔄 Converting {table}.{column} from {type_name} to {target}...")
+                    # the ANN operator class is type-specific; _create_indexes rebuilds it
+                    cur.execute(f"DROP INDEX IF EXISTS {self._index_name(table, column)};")
+                if typmod == -1 or target != type_name:
+                    cur.execute(
+                        f"ALTER TABLE {table} ALTER COLUMN {column} TYPE {target}({self.dim}) "
+                        f"USING {column}::{target}({self.dim});"
+                    )
             
-            self.conn.commit()
+            conn.commit()
+
+    def migrate_skill_vectors(self) -> bool:
+        """Move a legacy per-resume ``resume_skill_vectors`` table into skills / resume_skills.
+
+        The legacy table is dropped afterwards. Returns False if there was
+        nothing to migrate.
+        """
+        with self._connection() as conn:
+            with conn.cursor() as cur:
+                migrated = self._migrate_skill_vectors(cur)
+            conn.commit()
+        return migrated
+
+    @staticmethod
+    def _migrate_skill_vectors(cur) -> bool:
+        cur.execute("SELECT to_regclass('resume_skill_vectors') IS NOT NULL;")
+        if not cur.fetchone()[0]:
+            return False
+        print("🔄 Migrating resume_skill_vectors to the shared skills vocabulary...")
+        cur.execute("SELECT to_regclass('resume_stats') IS NOT NULL;")
+        had_stats_view = cur.fetchone()[0]
+        cur.execute("""
+            INSERT INTO skills (text, vec)
+            SELECT DISTINCT ON (skill_text) skill_text, skill_vec
+            FROM resume_skill_vectors
+            ORDER BY skill_text
+            ON CONFLICT (text) DO NOTHING;
+
+            INSERT INTO resume_skills (resume_id, skill_id)
+            SELECT DISTINCT v.resume_id, s.id
+            FROM resume_skill_vectors v
+            JOIN skills s ON s.text = v.skill_text
+            WHERE v.resume_id IS NOT NULL
+            ON CONFLICT DO NOTHING;
+
+            DROP TABLE resume_skill_vectors CASCADE;
+        """)
+        if had_stats_view:
+            cur.execute(_RESUME_STATS_VIEW_SQL)
+        return True
+
+    @staticmethod
+    def _index_name(table: str, column: str) -> str:
+        return f"idx_{table}_{column}_ann"
+
+    def _create_indexes(self, conn, method: str, params: Dict[str, int], *, rebuild: bool = False):
+        """Create (or drop and recreate) cosine ANN indexes on all vector columns."""
+        if method not in _INDEX_METHODS:
+            raise ValueError(f"Unknown index method '{method}', expected one of {_INDEX_METHODS}")
+        if method == "hnsw":
+            options = f"m = {int(params.get('m', 16))}, ef_construction = {int(params.get('ef_construction', 64))}"
+        else:
+            options = f"lists = {int(params.get('lists', 100))}"
+
+        with conn.cursor() as cur:
+            for table, column in _ANN_COLUMNS:
+                name = self._index_name(table, column)
+                if rebuild:
+                    cur.execute(f"DROP INDEX IF EXISTS {name};")
+                type_name = self._column_type(cur, table, column)[0]
+                cur.execute(
+                    f"CREATE INDEX IF NOT EXISTS {name} ON {table} "
+                    f"USING {method} ({column} {type_name}_cosine_ops) WITH ({options});"
+                )
+        conn.commit()
+
+    def rebuild_indexes(self, method: str = "hnsw", **params: int) -> None:
+        """Drop and rebuild the ANN indexes, e.g. after a bulk load or to switch method.
+
+        ivfflat should be (re)built once the tables hold data, since its lists
+        are trained on the rows present at build time.
+        """
+        with self._connection() as conn:
+            try:
+                self._create_indexes(conn, method, params, rebuild=True)
+            except Exception:
+                conn.rollback()
+                raise
+
+    def _store_skills(self, cur, skill_texts: List[str], skill_vecs: np.ndarray) -> Dict[str, int]:
+        """Upsert skills into the vocabulary; returns text -> skill id.
+
+        Vectors are only sent for texts the vocabulary does not hold yet, by
+        binary COPY into a staging table that is then merged into ``skills``.
+        """
+        vec_by_text: Dict[str, np.ndarray] = {}
+        for text, vec in zip(skill_texts, skill_vecs):
+            vec_by_text.setdefault(text, vec)
+        if not vec_by_text:
+            return {}
+
+        cur.execute("SELECT text, id FROM skills WHERE text = ANY(%s);", (list(vec_by_text),))
+        ids = dict(cur.fetchall())
+        missing = [text for text in vec_by_text if text not in ids]
+        if missing:
+            dtype = np.float16 if self._half_skills else np.float32
+            cur.execute(
+                """
+                DROP TABLE IF EXISTS skills_staging;
+                CREATE TEMP TABLE skills_staging ON COMMIT DROP AS
+                SELECT text, vec FROM skills WITH NO DATA;
+                """
+            )
+            cur.copy_expert(
+                "COPY skills_staging (text, vec) FROM STDIN WITH (FORMAT binary)",
+                _binary_copy_buffer(
+                    (text, np.asarray(vec_by_text[text], dtype=dtype).ravel()) for text in missing
+                ),
+            )
+            cur.execute(
+                """
+                INSERT INTO skills (text, vec)
+                SELECT text, vec FROM skills_staging
+                ON CONFLICT (text) DO NOTHING
+                RETURNING text, id;
+                """
+            )
+            ids.update(cur.fetchall())
+            # inserted concurrently by another writer
+            still_missing = [text for text in missing if text not in ids]
+            if still_missing:
+                cur.execute("SELECT text, id FROM skills WHERE text = ANY(%s);", (still_missing,))
+                ids.update(cur.fetchall())
+        return ids
+
+    def _sentence_rows(self, sentence_vecs) -> np.ndarray:
+        """Sentence vectors in the wire type of ``resume_sentence_vectors.sentence_vec``."""
+        dtype = np.float16 if self._half_sentences else np.float32
+        return np.asarray(sentence_vecs, dtype=dtype).reshape(-1, self.dim)
 
     def get_resume_by_filename(self, filename: str) -> Optional[Dict[str, Any]]:
         """Check if a resume with given filename exists and return its data if found."""
-        with self.conn.cursor() as cur:
+        with self._connection() as conn, conn.cursor() as cur:
             cur.execute(
                 """
                 SELECT id, meta, skill_vec, exp_vec 
@@ -124,7 +507,8 @@ class VectorDB:
         exp_vec: np.ndarray,
         skill_texts: List[str],
         skill_vecs: np.ndarray,
-        skip_if_exists: bool = True
+        skip_if_exists: bool = True,
+        sentence_vecs: Optional[np.ndarray] = None,
     ) -> Optional[int]:
         """Store a resume and its vectors.
         
@@ -136,6 +520,8 @@ class VectorDB:
             skill_texts: List of individual skill texts
             skill_vecs: Array of individual skill vectors
             skip_if_exists: If True, skip insertion if filename exists
+            sentence_vecs: Experience + project bullet vectors, stored so the
+                resume can be scored without re-embedding
             
         Returns:
             resume_id if stored successfully, None if skipped
@@ -149,100 +535,484 @@ class VectorDB:
             else:
                 raise ValueError(f"Resume with filename '{filename}' already exists")
 
-        try:
-            with self.conn.cursor() as cur:
-                # Insert main resume record
-                cur.execute(
-                    """
-                    INSERT INTO resumes (filename, meta, skill_vec, exp_vec)
-                    VALUES (%s, %s, %s, %s)
-                    RETURNING id;
-                    """,
-                    (
-                        filename,
-                        json.dumps(meta),
-                        _vector_to_string(skill_vec),
-                        _vector_to_string(exp_vec),
+        with self._connection() as conn:
+            try:
+                with conn.cursor() as cur:
+                    # Insert main resume record
+                    cur.execute(
+                        """
+                        INSERT INTO resumes (filename, meta, skill_vec, exp_vec)
+                        VALUES (%s, %s, %s, %s)
+                        RETURNING id;
+                        """,
+                        (
+                            filename,
+                            json.dumps(meta),
+                            _vector_to_string(skill_vec),
+                            _vector_to_string(exp_vec),
+                        )
                     )
-                )
-                resume_id = cur.fetchone()[0]
+                    resume_id = cur.fetchone()[0]
+
+                    # Link skills through the shared vocabulary (binary COPY)
+                    if len(skill_texts) > 0:
+                        skill_ids = self._store_skills(cur, skill_texts, skill_vecs)
+                        cur.copy_expert(
+                            _RESUME_SKILL_COPY_SQL,
+                            _binary_copy_buffer(
+                                (resume_id, skill_id) for skill_id in dict.fromkeys(skill_ids.values())
+                            ),
+                        )
+
+                    if sentence_vecs is not None and len(sentence_vecs):
+                        cur.copy_expert(
+                            _SENTENCE_COPY_SQL,
+                            _binary_copy_buffer(
+                                (resume_id, pos, vec) for pos, vec in enumerate(self._sentence_rows(sentence_vecs))
+                            ),
+                        )
+
+                conn.commit()
+                print(f"✅ Successfully stored resume: {filename}")
+                return resume_id
+
+            except Exception as e:
+                conn.rollback()
+                raise RuntimeError(f"Failed to store resume {filename}: {str(e)}") from e
+
+    def store_resumes_bulk(self, records: List[Dict[str, Any]]) -> Dict[str, int]:
+        """Store a batch of resumes in a single transaction.
+
+        Args:
+            records: Dicts with the same keys as ``store_resume`` arguments
+                (filename, meta, skill_vec, exp_vec, skill_texts, skill_vecs and
+                optionally sentence_vecs)
 
-                # Batch insert individual skill vectors
-                if len(skill_texts) > 0:
-                    execute_values(
+        Returns:
+            filename -> resume_id for the rows inserted. Filenames that already
+            exist are skipped (``ON CONFLICT (filename) DO NOTHING``).
+        """
+        # keep the first record per filename
+        by_name: Dict[str, Dict[str, Any]] = {}
+        for rec in records:
+            by_name.setdefault(rec["filename"], rec)
+        if not by_name:
+            return {}
+
+        with self._connection() as conn:
+            try:
+                with conn.cursor() as cur:
+                    rows = execute_values(
                         cur,
                         """
-                        INSERT INTO resume_skill_vectors
-                            (resume_id, skill_text, skill_vec)
-                        VALUES %s;
+                        INSERT INTO resumes (filename, meta, skill_vec, exp_vec)
+                        VALUES %s
+                        ON CONFLICT (filename) DO NOTHING
+                        RETURNING id, filename;
                         """,
                         [
-                            (resume_id, text, _vector_to_string(vec))
-                            for text, vec in zip(skill_texts, skill_vecs)
+                            (
+                                rec["filename"],
+                                json.dumps(rec["meta"]),
+                                _vector_to_string(rec["skill_vec"]),
+                                _vector_to_string(rec["exp_vec"]),
+                            )
+                            for rec in by_name.values()
                         ],
+                        page_size=len(by_name),
+                        fetch=True,
                     )
+                    ids = {filename: id_ for id_, filename in rows}
+
+                    # One vocabulary upsert for the whole batch, then link rows via binary COPY
+                    texts = [t for filename in ids for t in by_name[filename]["skill_texts"]]
+                    vecs = [v for filename in ids for v in by_name[filename]["skill_vecs"]]
+                    skill_ids = self._store_skills(cur, texts, vecs)
+                    link_rows = [
+                        (resume_id, skill_id)
+                        for filename, resume_id in ids.items()
+                        for skill_id in dict.fromkeys(skill_ids[t] for t in by_name[filename]["skill_texts"])
+                    ]
+                    if link_rows:
+                        cur.copy_expert(_RESUME_SKILL_COPY_SQL, _binary_copy_buffer(link_rows))
+
+                    sentence_rows = [
+                        (resume_id, pos, vec)
+                        for filename, resume_id in ids.items()
+                        for pos, vec in enumerate(self._sentence_rows(by_name[filename].get("sentence_vecs", ())))
+                    ]
+                    if sentence_rows:
+                        cur.copy_expert(_SENTENCE_COPY_SQL, _binary_copy_buffer(sentence_rows))
 
-            self.conn.commit()
-            print(f"✅ Successfully stored resume: {filename}")
-            return resume_id
+                conn.commit()
+                skipped = len(by_name) - len(ids)
+                print(f"✅ Stored {len(ids)} resumes" + (f" (skipped {skipped} existing)" if skipped else ""))
+                return ids
 
-        except Exception as e:
-            self.conn.rollback()
-            raise RuntimeError(f"Failed to store resume {filename}: {str(e)}") from e
+            except Exception as e:
+                conn.rollback()
+                raise RuntimeError(f"Failed to store batch of {len(by_name)} resumes: {str(e)}") from e
+
+    # Nearest neighbours first (ORDER BY distance LIMIT k lets Postgres walk
+    # the ANN index), similarity threshold applied to that short list only.
+    _CANDIDATES_SQL = """
+        SELECT id, 1 - distance AS similarity, filename, meta
+        FROM (
+            SELECT id, filename, meta, skill_vec <=> %(q)s::vector AS distance
+            FROM resumes
+            ORDER BY skill_vec <=> %(q)s::vector
+            LIMIT %(limit)s
+        ) nearest
+        WHERE 1 - distance > %(min_similarity)s
+        ORDER BY distance;
+    """
+
+    # Exact scan over a pre-filtered id set (e.g. from SkillIndex); the CTE is
+    # materialised so the planner cannot push the filter into the ANN index scan.
+    _SUBSET_CANDIDATES_SQL = """
+        WITH subset AS MATERIALIZED (
+            SELECT id, filename, meta, skill_vec <=> %(q)s::vector AS distance
+            FROM resumes
+            WHERE id = ANY(%(ids)s)
+        )
+        SELECT id, 1 - distance AS similarity, filename, meta
+        FROM subset
+        WHERE 1 - distance > %(min_similarity)s
+        ORDER BY distance
+        LIMIT %(limit)s;
+    """
+
+    @staticmethod
+    def _set_search_params(cur, probes: Optional[int], ef_search: Optional[int]) -> None:
+        """Tune ANN recall for the current transaction only."""
+        if probes is not None:
+            cur.execute("SELECT set_config('ivfflat.probes', %s, true);", (str(int(probes)),))
+        if ef_search is not None:
+            cur.execute("SELECT set_config('hnsw.ef_search', %s, true);", (str(int(ef_search)),))
 
     def find_candidates(
         self,
         jd_skill_vec: np.ndarray,
         limit: int = 1000,
-        min_similarity: float = 0.1
+        min_similarity: float = 0.1,
+        *,
+        probes: Optional[int] = None,
+        ef_search: Optional[int] = None,
+        candidate_ids: Optional[List[int]] = None,
     ) -> List[Tuple[int, float, str, Dict[str, Any]]]:
-        """Find resumes with similar mean skill vectors."""
-        vec_str = _vector_to_string(jd_skill_vec)
-        
-        with self.conn.cursor() as cur:
-            cur.execute(
-                """
-                SELECT 
-                    id,
-                    1 - (skill_vec <=> %s::vector) as similarity,
-                    filename,
-                    meta
-                FROM resumes
-                WHERE 1 - (skill_vec <=> %s::vector) > %s
-                ORDER BY similarity DESC
-                LIMIT %s;
-                """,
-                (vec_str, vec_str, min_similarity, limit)
-            )
+        """Find resumes with similar mean skill vectors.
+
+        Args:
+            jd_skill_vec: Mean JD skill vector
+            limit: Number of nearest neighbours fetched through the ANN index
+            min_similarity: Cosine similarity threshold applied after the index scan
+            probes: ``ivfflat.probes`` for this query (recall vs. speed)
+            ef_search: ``hnsw.ef_search`` for this query (recall vs. speed)
+            candidate_ids: Restrict the search to these ids (exact scan, no ANN)
+        """
+        params = {
+            "q": _vector_to_string(jd_skill_vec),
+            "limit": limit,
+            "min_similarity": min_similarity,
+        }
+        if candidate_ids is not None:
+            if len(candidate_ids) == 0:
+                return []
+            params["ids"] = [int(i) for i in candidate_ids]
+
+        with self._connection() as conn, conn.cursor() as cur:
+            if candidate_ids is None:
+                self._set_search_params(cur, probes, ef_search)
+                cur.execute(self._CANDIDATES_SQL, params)
+            else:
+                cur.execute(self._SUBSET_CANDIDATES_SQL, params)
             results = [
                 (id_, sim, filename, json.loads(meta) if isinstance(meta, str) else meta)
                 for id_, sim, filename, meta in cur.fetchall()
             ]
         return results
 
+    def explain_find_candidates(
+        self,
+        jd_skill_vec: np.ndarray,
+        limit: int = 1000,
+        min_similarity: float = 0.1,
+        *,
+        probes: Optional[int] = None,
+        ef_search: Optional[int] = None,
+        analyze: bool = False,
+    ) -> str:
+        """Return the ``EXPLAIN`` plan of ``find_candidates`` (to check the ANN index is used)."""
+        params = {
+            "q": _vector_to_string(jd_skill_vec),
+            "limit": limit,
+            "min_similarity": min_similarity,
+        }
+        with self._connection() as conn, conn.cursor() as cur:
+            self._set_search_params(cur, probes, ef_search)
+            cur.execute(("EXPLAIN ANALYZE " if analyze else "EXPLAIN ") + self._CANDIDATES_SQL, params)
+            return "\n".join(row[0] for row in cur.fetchall())
+
+    def iter_skill_texts(self, itersize: int = 10_000) -> Iterator[Tuple[int, str]]:
+        """Yield ``(resume_id, skill_text)`` for every stored skill (server-side cursor)."""
+        with self._connection() as conn, conn.cursor(name="skill_texts") as cur:
+            cur.itersize = itersize
+            cur.execute(
+                """
+                SELECT rs.resume_id, s.text
+                FROM resume_skills rs
+                JOIN skills s ON s.id = rs.skill_id
+                ORDER BY rs.resume_id;
+                """
+            )
+            yield from cur
+
     def get_skill_vectors(
         self, resume_id: int
     ) -> Tuple[List[str], np.ndarray]:
         """Get individual skill vectors for a resume."""
-        with self.conn.cursor() as cur:
+        with self._connection() as conn, conn.cursor() as cur:
             cur.execute(
                 """
-                SELECT skill_text, skill_vec
-                FROM resume_skill_vectors
-                WHERE resume_id = %s
-                ORDER BY skill_text;
+                SELECT s.text, s.vec
+                FROM resume_skills rs
+                JOIN skills s ON s.id = rs.skill_id
+                WHERE rs.resume_id = %s
+                ORDER BY s.text;
                 """,
                 (resume_id,)
             )
             rows = cur.fetchall()
             if not rows:
-                return [], np.empty((0, 384))  # Fixed dimension
+                return [], np.empty((0, self.dim), dtype=np.float32)
             texts, vecs = zip(*rows)
-            return list(texts), np.array([
-                np.array(vec.strip('[]').split(','), dtype=float)
-                for vec in vecs
-            ])
+            return list(texts), np.vstack(vecs)
+
+    def get_exp_vectors_bulk(self, resume_ids: List[int]) -> np.ndarray:
+        """Experience vectors for ``resume_ids`` (in that order) as an (n, dim) matrix."""
+        if not resume_ids:
+            return np.empty((0, self.dim), dtype=np.float32)
+        with self._connection() as conn, conn.cursor() as cur:
+            return self._copy_vectors_out(
+                cur,
+                """
+                SELECT r.exp_vec
+                FROM unnest(%s::int[]) WITH ORDINALITY AS u(id, ord)
+                JOIN resumes r ON r.id = u.id
+                ORDER BY u.ord
+                """,
+                (list(resume_ids),),
+            )
+
+    @staticmethod
+    def _group_order(sorted_ids: np.ndarray, ids: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Gather order and CSR offsets regrouping rows sorted by resume_id into ``ids`` order."""
+        left = np.searchsorted(sorted_ids, ids, side="left")
+        right = np.searchsorted(sorted_ids, ids, side="right")
+        counts = right - left
+        offsets = np.zeros(len(ids) + 1, dtype=np.int64)
+        np.cumsum(counts, out=offsets[1:])
+        order = np.repeat(left - offsets[:-1], counts) + np.arange(offsets[-1])
+        return order, offsets
+
+    def _fetch_grouped(
+        self,
+        resume_ids: List[int],
+        source: str,
+        vec_col: str,
+        text_col: Optional[str],
+        order_col: str,
+        itersize: int,
+    ) -> Tuple[List[str], np.ndarray, np.ndarray]:
+        """Stream per-resume vector rows for ``resume_ids`` and group them CSR-style.
+
+        ``source`` is the FROM clause (a table or join) with a ``resume_id``
+        column. Rows are streamed with a server-side cursor (ids / texts) and a
+        binary COPY (vectors) inside one REPEATABLE READ transaction, so both
+        see the same snapshot. Groups follow the order of ``resume_ids``.
+        """
+        ids = np.asarray(resume_ids, dtype=np.int64)
+        empty = np.empty((0, self.dim), dtype=np.float32)
+        if ids.size == 0:
+            return [], empty, np.zeros(1, dtype=np.int64)
+
+        id_list = sorted(set(ids.tolist()))
+        query = f"""
+            SELECT {{cols}}
+            FROM {source}
+            WHERE resume_id = ANY(%s)
+            ORDER BY resume_id, {order_col}
+        """
+        key_cols = "resume_id" + (f", {text_col}" if text_col else "")
+        with self._connection() as conn:
+            try:
+                with conn.cursor() as cur:
+                    cur.execute("SET TRANSACTION ISOLATION LEVEL REPEATABLE READ;")
+                with conn.cursor(name=f"{vec_col.rsplit('.', 1)[-1]}_bulk") as named:
+                    named.itersize = itersize
+                    named.execute(query.format(cols=key_cols), (id_list,))
+                    row_ids: List[int] = []
+                    row_texts: List[str] = []
+                    for row in named:
+                        row_ids.append(row[0])
+                        if text_col:
+                            row_texts.append(row[1])
+                with conn.cursor() as cur:
+                    matrix = self._copy_vectors_out(cur, query.format(cols=vec_col), (id_list,))
+            finally:
+                conn.rollback()
+
+        if not row_ids:
+            return [], empty, np.zeros(len(ids) + 1, dtype=np.int64)
+
+        # Rows arrive sorted by resume_id; regroup them in the requested order
+        order, offsets = self._group_order(np.asarray(row_ids, dtype=np.int64), ids)
+        texts = [row_texts[i] for i in order] if text_col else []
+        return texts, matrix[order], offsets
+
+    def get_skill_vectors_bulk(
+        self, resume_ids: List[int], *, itersize: int = 10_000
+    ) -> Tuple[List[str], np.ndarray, np.ndarray]:
+        """Get the skill vectors of many resumes in one round-trip.
+
+        Returns:
+            (skill_texts, matrix, offsets): ``matrix`` is (n, dim) float32 and the
+            skills of ``resume_ids[i]`` are rows ``offsets[i]:offsets[i + 1]``
+            (ordered by skill text, like ``get_skill_vectors``).
+        """
+        return self._fetch_grouped(
+            resume_ids,
+            "resume_skills rs JOIN skills s ON s.id = rs.skill_id",
+            "s.vec", "s.text", "s.text", itersize,
+        )
+
+    def get_skill_ids_bulk(self, resume_ids: List[int]) -> Tuple[np.ndarray, np.ndarray]:
+        """Skill ids of many resumes as (ids, offsets), ordered by skill text within each."""
+        ids = np.asarray(resume_ids, dtype=np.int64)
+        if ids.size == 0:
+            return np.empty(0, dtype=np.int64), np.zeros(1, dtype=np.int64)
+        with self._connection() as conn, conn.cursor() as cur:
+            cur.execute(
+                """
+                SELECT rs.resume_id, rs.skill_id
+                FROM resume_skills rs
+                JOIN skills s ON s.id = rs.skill_id
+                WHERE rs.resume_id = ANY(%s)
+                ORDER BY rs.resume_id, s.text;
+                """,
+                (sorted(set(ids.tolist())),),
+            )
+            rows = np.asarray(cur.fetchall(), dtype=np.int64).reshape(-1, 2)
+        order, offsets = self._group_order(rows[:, 0], ids)
+        return rows[order, 1], offsets
+
+    def get_skill_vectors_by_id(self, skill_ids: List[int]) -> np.ndarray:
+        """Vocabulary vectors for ``skill_ids`` (in that order) as an (n, dim) matrix."""
+        if len(skill_ids) == 0:
+            return np.empty((0, self.dim), dtype=np.float32)
+        with self._connection() as conn, conn.cursor() as cur:
+            return self._copy_vectors_out(
+                cur,
+                """
+                SELECT s.vec
+                FROM unnest(%s::int[]) WITH ORDINALITY AS u(id, ord)
+                JOIN skills s ON s.id = u.id
+                ORDER BY u.ord
+                """,
+                ([int(i) for i in skill_ids],),
+            )
+
+    def get_skill_vocabulary(self) -> Tuple[List[str], np.ndarray]:
+        """Every skill in the vocabulary as (texts, (n, dim) matrix), ordered by id."""
+        with self._connection() as conn, conn.cursor() as cur:
+            cur.execute("SELECT text FROM skills ORDER BY id;")
+            texts = [row[0] for row in cur.fetchall()]
+            matrix = self._copy_vectors_out(cur, "SELECT vec FROM skills ORDER BY id", ())
+        if not texts:
+            matrix = np.empty((0, self.dim), dtype=np.float32)
+        return texts, matrix
+
+    def get_sentence_vectors_bulk(
+        self, resume_ids: List[int], *, itersize: int = 10_000
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Get stored bullet vectors of many resumes as (matrix, offsets)."""
+        _, matrix, offsets = self._fetch_grouped(
+            resume_ids, "resume_sentence_vectors", "sentence_vec", None, "position", itersize
+        )
+        return matrix, offsets
+
+    def get_resume_features(self, resume_ids: List[int]) -> List[Dict[str, Any]]:
+        """Rebuild ``ResumeJDMatcher._vectorize_resume`` feature dicts from the DB alone.
+
+        Needs résumés ingested with sentence vectors and ``degree_level`` in
+        meta; no model inference or LLM call is made.
+        """
+        if not resume_ids:
+            return []
+        with self._connection() as conn, conn.cursor() as cur:
+            cur.execute(
+                """
+                SELECT r.id, r.meta->'years_experience', r.meta->>'degree_level'
+                FROM unnest(%s::int[]) WITH ORDINALITY AS u(id, ord)
+                JOIN resumes r ON r.id = u.id
+                ORDER BY u.ord;
+                """,
+                (list(resume_ids),),
+            )
+            meta_rows = cur.fetchall()
+            mean_mat = self._copy_vectors_out(
+                cur,
+                """
+                SELECT r.skill_vec
+                FROM unnest(%s::int[]) WITH ORDINALITY AS u(id, ord)
+                JOIN resumes r ON r.id = u.id
+                ORDER BY u.ord
+                """,
+                (list(resume_ids),),
+            )
+        if len(meta_rows) != len(resume_ids):
+            found = {row[0] for row in meta_rows}
+            raise ValueError(f"Unknown resume ids: {[i for i in resume_ids if i not in found]}")
+
+        exp_mat = self.get_exp_vectors_bulk(resume_ids)
+        # Shared skills are fetched once and gathered client-side
+        skill_ids, skill_off = self.get_skill_ids_bulk(resume_ids)
+        unique_ids, inverse = np.unique(skill_ids, return_inverse=True)
+        skill_mat = self.get_skill_vectors_by_id(unique_ids.tolist())[inverse.ravel()]
+        sent_mat, sent_off = self.get_sentence_vectors_bulk(resume_ids)
+
+        return [
+            {
+                "skill_vecs": skill_mat[skill_off[i]:skill_off[i + 1]],
+                "skill_vec": mean_mat[i],
+                "exp_vec": exp_mat[i],
+                "sentence_vecs": sent_mat[sent_off[i]:sent_off[i + 1]],
+                "years_experience": float(years or 0.0),
+                "degree_level": degree or "none",
+            }
+            for i, (_, years, degree) in enumerate(meta_rows)
+        ]
+
+    def iter_resume_features(self, chunk_size: int = 1000) -> Iterator[Dict[str, Any]]:
+        """Yield ``get_resume_features`` dicts (plus id / filename) for every resume.
+
+        Pages through ``resumes`` by id ``chunk_size`` rows at a time, so memory
+        stays bounded and no connection is held between chunks.
+        """
+        last_id = 0
+        while True:
+            with self._connection() as conn, conn.cursor() as cur:
+                cur.execute(
+                    "SELECT id, filename FROM resumes WHERE id > %s ORDER BY id LIMIT %s;",
+                    (last_id, chunk_size),
+                )
+                rows = cur.fetchall()
+            if not rows:
+                return
+            for (resume_id, filename), feats in zip(rows, self.get_resume_features([r[0] for r in rows])):
+                yield {"id": resume_id, "filename": filename, **feats}
+            last_id = rows[-1][0]
 
     def close(self):
-        """Close database connection."""
-        self.conn.close()
\ No newline at end of file
+        """Close all pooled database connections."""
+        self._pool.closeall()
\ No newline at end of file
@@ -0,0 +1,151 @@
+"""Content-addressed cache for text embeddings.
+
+Vectors are keyed by ``(model name, normalize flag, sha256(text))``. A bounded
+in-memory LRU sits in front of an optional on-disk SQLite store so repeated
+strings (skills like "react" or "sql") are encoded by the model only once.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import sqlite3
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+__all__ = ["EmbeddingCache"]
+
+CacheKey = Tuple[str, bool, str]
+
+
+def _text_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class EmbeddingCache:
+    """LRU + SQLite embedding cache with hit / miss counters.
+
+    Parameters
+    ----------
+    path: str | Path | None
+        SQLite file for the persistent layer. ``None`` keeps the cache in memory only.
+    max_items: int, default 100_000
+        Maximum number of vectors held in the in-memory LRU before eviction.
+    """
+
+    def __init__(self, path: str | Path | None = None, *, max_items: int = 100_000):
+        self.max_items = max_items
+        self._lru: "OrderedDict[CacheKey, np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self._conn: Optional[sqlite3.Connection] = None
+        if path is not None:
+            path = Path(path)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(str(path), check_same_thread=False)
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS embeddings (
+                    model TEXT NOT NULL,
+                    normalize INTEGER NOT NULL,
+                    text_hash TEXT NOT NULL,
+                    vec BLOB NOT NULL,
+                    PRIMARY KEY (model, normalize, text_hash)
+                )
+                """
+            )
+            self._conn.commit()
+
+    @staticmethod
+    def key(model_name: str, normalize: bool, text: str) -> CacheKey:
+        return (model_name, bool(normalize), _text_hash(text))
+
+    # --------------------------------------------------
+    # LRU helpers
+    # --------------------------------------------------
+
+    def _remember(self, key: CacheKey, vec: np.ndarray) -> None:
+        self._lru[key] = vec
+        self._lru.move_to_end(key)
+        while len(self._lru) > self.max_items:
+            self._lru.popitem(last=False)
+            self.evictions += 1
+
+    # --------------------------------------------------
+    # Public API
+    # --------------------------------------------------
+
+    def get_many(self, keys: Iterable[CacheKey]) -> Dict[CacheKey, np.ndarray]:
+        """Return the cached vectors for ``keys``; absent keys are omitted."""
+        found: Dict[CacheKey, np.ndarray] = {}
+        pending: List[CacheKey] = []
+        with self._lock:
+            for key in keys:
+                if key in found:
+                    continue
+                vec = self._lru.get(key)
+                if vec is not None:
+                    self._lru.move_to_end(key)
+                    found[key] = vec
+                    self.hits += 1
+                else:
+                    pending.append(key)
+
+            if pending and self._conn is not None:
+                for key in dict.fromkeys(pending):
+                    row = self._conn.execute(
+                        "SELECT vec FROM embeddings WHERE model = ? AND normalize = ? AND text_hash = ?",
+                        (key[0], int(key[1]), key[2]),
+                    ).fetchone()
+                    if row is not None:
+                        vec = np.frombuffer(row[0], dtype=np.float32)
+                        self._remember(key, vec)
+                        found[key] = vec
+                        self.hits += 1
+                        self.disk_hits += 1
+
+            self.misses += len({k for k in pending if k not in found})
+        return found
+
+    def put_many(self, items: Iterable[Tuple[CacheKey, np.ndarray]]) -> None:
+        """Insert freshly encoded vectors into both cache layers."""
+        rows = []
+        with self._lock:
+            for key, vec in items:
+                vec = np.ascontiguousarray(vec, dtype=np.float32)
+                self._remember(key, vec)
+                rows.append((key[0], int(key[1]), key[2], vec.tobytes()))
+            if rows and self._conn is not None:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO embeddings (model, normalize, text_hash, vec) VALUES (?, ?, ?, ?)",
+                    rows,
+                )
+                self._conn.commit()
+
+    def stats(self) -> Dict[str, int]:
+        """Return hit / miss counters and current in-memory size."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "memory_items": len(self._lru),
+            }
+
+    def clear_memory(self) -> None:
+        """Drop the in-memory LRU (the on-disk layer is kept)."""
+        with self._lock:
+            self._lru.clear()
+
+    def close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
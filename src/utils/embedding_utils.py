@@ -5,7 +5,12 @@ from typing import List
 import numpy as np
 from sentence_transformers import SentenceTransformer
 
+from src.utils.embedding_cache import EmbeddingCache
+
 DEFAULT_MODEL_NAME = os.getenv("EMBEDDING_MODEL", "sentence-transformers/all-MiniLM-L6-v2")
+# Set EMBEDDING_CACHE_PATH to persist the embedding cache in a SQLite file.
+EMBEDDING_CACHE_PATH = os.getenv("EMBEDDING_CACHE_PATH")
+EMBEDDING_CACHE_SIZE = int(os.getenv("EMBEDDING_CACHE_SIZE", "100000"))
 
 
 @lru_cache(maxsize=1)
@@ -14,7 +19,20 @@ def _load_model(model_name: str = DEFAULT_MODEL_NAME) -> SentenceTransformer:
     return SentenceTransformer(model_name)
 
 
-def embed_texts(texts: List[str], *, normalize: bool = True) -> np.ndarray:
+@lru_cache(maxsize=1)
+def get_embedding_cache() -> EmbeddingCache:
+    """Return the process-wide embedding cache (see ``cache_stats`` for counters)."""
+    return EmbeddingCache(EMBEDDING_CACHE_PATH, max_items=EMBEDDING_CACHE_SIZE)
+
+
+def cache_stats() -> dict:
+    """Hit / miss counters of the embedding cache."""
+    return get_embedding_cache().stats()
+
+
+def embed_texts(
+    texts: List[str], *, normalize: bool = True, batch_size: int = 32, use_cache: bool = True
+) -> np.ndarray:
     """Return embeddings for a list of strings.
 
     Parameters
@@ -23,6 +41,10 @@ def embed_texts(texts: List[str], *, normalize: bool = True) -> np.ndarray:
         Sentences / skills / bullets to embed.
     normalize: bool, default True
         Whether to L2-normalize the output vectors (cosine sim becomes dot-product).
+    batch_size: int, default 32
+        Number of texts the model encodes per forward pass.
+    use_cache: bool, default True
+        Look texts up in the embedding cache and only encode the misses.
 
     Returns
     -------
@@ -31,8 +53,29 @@ def embed_texts(texts: List[str], *, normalize: bool = True) -> np.ndarray:
     if not texts:
         return np.empty((0, _load_model().get_sentence_embedding_dimension()))
 
-    vecs = _load_model().encode(texts, normalize_embeddings=normalize)
-    return np.asarray(vecs)
+    if not use_cache:
+        vecs = _load_model().encode(texts, normalize_embeddings=normalize, batch_size=batch_size)
+        return np.asarray(vecs)
+
+    cache = get_embedding_cache()
+    keys = [cache.key(DEFAULT_MODEL_NAME, normalize, t) for t in texts]
+    found = cache.get_many(keys)
+
+    missing = {k: t for k, t in zip(keys, texts) if k not in found}
+    if missing:
+        new_vecs = _load_model().encode(
+            list(missing.values()), normalize_embeddings=normalize, batch_size=batch_size
+        )
+        new_items = list(zip(missing.keys(), np.asarray(new_vecs, dtype=np.float32)))
+        cache.put_many(new_items)
+        found.update(new_items)
+
+    return np.vstack([found[k] for k in keys])
+
+
+def embedding_dim() -> int:
+    """Dimension of the vectors produced by the loaded embedding model."""
+    return _load_model().get_sentence_embedding_dimension()
 
 
 def aggregate_mean(vecs: np.ndarray) -> np.ndarray:
@@ -0,0 +1,418 @@
+"""In-process FAISS résumé index mirroring the ``VectorDB`` API.
+
+Mean skill vectors live in a FAISS index (HNSW, IVF or exact flat) searched
+by cosine similarity; per-skill and per-sentence vectors live in contiguous
+float32 arrays with CSR-style offsets (optionally stored as float16 or
+per-row scaled int8, see ``src.utils.quantization``). The whole index can be saved to and
+loaded from a directory, so batch jobs and tests get low-latency search
+without a Postgres round-trip.
+"""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import faiss
+import numpy as np
+
+from src.utils.quantization import VECTOR_DTYPES, Int8Matrix, concat, dequantize, quantize
+
+__all__ = ["LocalVectorIndex"]
+
+_INDEX_TYPES = ("hnsw", "ivf", "flat")
+# FAISS wants ~39 training points per IVF list; smaller sets get fewer lists
+_IVF_POINTS_PER_LIST = 39
+
+
+def _normalize(mat: np.ndarray) -> np.ndarray:
+    """Row-normalise so inner product == cosine similarity (zero rows stay zero)."""
+    mat = np.ascontiguousarray(mat, dtype=np.float32).reshape(-1, mat.shape[-1])
+    norms = np.linalg.norm(mat, axis=1, keepdims=True)
+    return mat / np.where(norms == 0, 1.0, norms)
+
+
+class _RaggedStore:
+    """Append-only (n, dim) rows grouped per résumé with CSR offsets.
+
+    Rows are kept in ``vector_dtype`` (see ``src.utils.quantization``);
+    ``get`` / ``gather`` return float32.
+    """
+
+    def __init__(self, dim: int, vector_dtype: str = "float32"):
+        self.dim = dim
+        self.vector_dtype = vector_dtype
+        self._chunks: List[np.ndarray] = []
+        self._matrix = quantize(np.empty((0, dim), dtype=np.float32), vector_dtype)
+        self.offsets = np.zeros(1, dtype=np.int64)
+        self._counts: List[int] = []
+
+    def append(self, vecs: Optional[np.ndarray]) -> None:
+        vecs = np.empty((0, self.dim), dtype=np.float32) if vecs is None else vecs
+        vecs = np.asarray(vecs, dtype=np.float32).reshape(-1, self.dim)
+        self._chunks.append(quantize(vecs, self.vector_dtype))
+        self._counts.append(len(vecs))
+
+    @property
+    def matrix(self) -> np.ndarray:
+        """Contiguous matrix of all stored rows (appended chunks are merged lazily)."""
+        if self._chunks:
+            self._matrix = concat([self._matrix, *self._chunks])
+            self.offsets = np.concatenate([
+                self.offsets, self.offsets[-1] + np.cumsum(self._counts, dtype=np.int64)
+            ])
+            self._chunks, self._counts = [], []
+        return self._matrix
+
+    def get(self, row: int) -> np.ndarray:
+        mat = self.matrix
+        return dequantize(mat[self.offsets[row]:self.offsets[row + 1]])
+
+    def gather(self, rows: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Rows of several résumés as (matrix, offsets) in the order of ``rows``."""
+        mat = self.matrix
+        left = self.offsets[rows]
+        counts = self.offsets[rows + 1] - left
+        offsets = np.zeros(len(rows) + 1, dtype=np.int64)
+        np.cumsum(counts, out=offsets[1:])
+        order = np.repeat(left - offsets[:-1], counts) + np.arange(offsets[-1])
+        return dequantize(mat[order]), offsets
+
+    def save(self, path: Path, name: str) -> None:
+        mat = self.matrix
+        if isinstance(mat, Int8Matrix):
+            np.save(path / f"{name}.npy", mat.codes)
+            np.save(path / f"{name}_scales.npy", mat.scales)
+        else:
+            np.save(path / f"{name}.npy", mat)
+        np.save(path / f"{name}_offsets.npy", self.offsets)
+
+    @classmethod
+    def load(cls, path: Path, name: str, dim: int, vector_dtype: str = "float32") -> "_RaggedStore":
+        store = cls(dim, vector_dtype)
+        store._matrix = np.load(path / f"{name}.npy")
+        if vector_dtype == "int8":
+            store._matrix = Int8Matrix(store._matrix, np.load(path / f"{name}_scales.npy"))
+        store.offsets = np.load(path / f"{name}_offsets.npy")
+        return store
+
+
+class LocalVectorIndex:
+    """FAISS-backed drop-in for ``VectorDB`` (store / search / vector fetch).
+
+    Resume ids start at 1 and follow insertion order, like a SERIAL column.
+
+    Args:
+        dim: Vector dimension; defaults to the loaded embedding model's
+        index_type: "hnsw" (default), "ivf" or "flat" (exact search)
+        hnsw_m: HNSW graph degree
+        ivf_nlist: Maximum number of IVF lists (fewer while the collection is
+            small, see ``_sync_index``)
+        ivf_nprobe: IVF lists searched per query unless ``probes`` is given
+        vector_dtype: Storage of per-skill / per-sentence vectors: "float32",
+            "float16" or "int8" (per-row scaled); reads return float32
+    """
+
+    def __init__(
+        self,
+        dim: int | None = None,
+        *,
+        index_type: str = "hnsw",
+        hnsw_m: int = 32,
+        ivf_nlist: int = 100,
+        ivf_nprobe: int = 10,
+        vector_dtype: str = "float32",
+    ):
+        if index_type not in _INDEX_TYPES:
+            raise ValueError(f"Unknown index type '{index_type}', expected one of {_INDEX_TYPES}")
+        if vector_dtype not in VECTOR_DTYPES:
+            raise ValueError(f"Unknown vector dtype '{vector_dtype}', expected one of {VECTOR_DTYPES}")
+        if dim is None:
+            from src.utils.embedding_utils import embedding_dim
+            dim = embedding_dim()
+        self.dim = dim
+        self.index_type = index_type
+        self.hnsw_m = hnsw_m
+        self.ivf_nlist = ivf_nlist
+        self.ivf_nprobe = ivf_nprobe
+        self.vector_dtype = vector_dtype
+
+        self._filenames: List[str] = []
+        self._by_filename: Dict[str, int] = {}
+        self._meta: List[Dict[str, Any]] = []
+        self._skill_texts: List[List[str]] = []
+        self._mean = _RaggedStore(dim)    # one row per résumé
+        self._exp = _RaggedStore(dim)     # one row per résumé
+        self._skills = _RaggedStore(dim, vector_dtype)
+        self._sentences = _RaggedStore(dim, vector_dtype)
+        self._index: Optional[faiss.Index] = None
+        self._indexed = 0                 # résumés already added to the FAISS index
+
+    # --------------------------------------------------
+    # FAISS index helpers
+    # --------------------------------------------------
+
+    def _nlist(self, n: int) -> int:
+        return max(1, min(self.ivf_nlist, n // _IVF_POINTS_PER_LIST))
+
+    def _new_index(self, n: int) -> faiss.Index:
+        if self.index_type == "hnsw":
+            return faiss.IndexHNSWFlat(self.dim, self.hnsw_m, faiss.METRIC_INNER_PRODUCT)
+        nlist = self._nlist(n)
+        if self.index_type == "flat" or nlist == 1:
+            # a single IVF list is an exact scan anyway, without the training
+            return faiss.IndexFlatIP(self.dim)
+        quantizer = faiss.IndexFlatIP(self.dim)
+        index = faiss.IndexIVFFlat(quantizer, self.dim, nlist, faiss.METRIC_INNER_PRODUCT)
+        index.nprobe = min(self.ivf_nprobe, nlist)
+        return index
+
+    def _sync_index(self) -> faiss.Index:
+        """Add résumés stored since the last search to the FAISS index.
+
+        An IVF index is rebuilt and retrained on every résumé when the stored
+        count calls for a different number of lists (i.e. until ``ivf_nlist``
+        is reached); otherwise new résumés join the existing lists. Below two
+        lists' worth of résumés the "IVF" index is an exact flat scan.
+        """
+        n = len(self._filenames)
+        if self._index is not None and self._indexed == n:
+            return self._index
+        mean = _normalize(self._mean.matrix)
+        if self.index_type == "ivf" and (
+            self._index is None or getattr(self._index, "nlist", 1) != self._nlist(n)
+        ):
+            self._index = self._new_index(n)
+            self._index.train(mean)
+            self._index.add(mean)
+        else:
+            if self._index is None:
+                self._index = self._new_index(n)
+            self._index.add(mean[self._indexed:])
+        self._indexed = n
+        return self._index
+
+    # --------------------------------------------------
+    # VectorDB-compatible API
+    # --------------------------------------------------
+
+    def get_resume_by_filename(self, filename: str) -> Optional[Dict[str, Any]]:
+        """Return id, meta and mean vectors of a stored résumé, or None."""
+        resume_id = self._by_filename.get(filename)
+        if resume_id is None:
+            return None
+        row = resume_id - 1
+        return {
+            "id": resume_id,
+            "meta": self._meta[row],
+            "skill_vec": self._mean.get(row)[0],
+            "exp_vec": self._exp.get(row)[0],
+        }
+
+    def store_resume(
+        self,
+        filename: str,
+        meta: Dict[str, Any],
+        skill_vec: np.ndarray,
+        exp_vec: np.ndarray,
+        skill_texts: List[str],
+        skill_vecs: np.ndarray,
+        skip_if_exists: bool = True,
+        sentence_vecs: Optional[np.ndarray] = None,
+    ) -> Optional[int]:
+        """Store a résumé and its vectors; same contract as ``VectorDB.store_resume``."""
+        if filename in self._by_filename:
+            if skip_if_exists:
+                print(f"⚠️ Skipping existing resume: {filename}")
+                return None
+            raise ValueError(f"Resume with filename '{filename}' already exists")
+
+        resume_id = len(self._filenames) + 1
+        self._filenames.append(filename)
+        self._by_filename[filename] = resume_id
+        self._meta.append(meta)
+        self._skill_texts.append(list(skill_texts))
+        self._mean.append(skill_vec)
+        self._exp.append(exp_vec)
+        self._skills.append(skill_vecs)
+        self._sentences.append(sentence_vecs)
+        return resume_id
+
+    def store_resumes_bulk(self, records: List[Dict[str, Any]]) -> Dict[str, int]:
+        """Store a batch of résumés; returns filename -> id for new rows."""
+        ids: Dict[str, int] = {}
+        for rec in records:
+            if rec["filename"] in self._by_filename:
+                continue
+            ids[rec["filename"]] = self.store_resume(
+                rec["filename"], rec["meta"], rec["skill_vec"], rec["exp_vec"],
+                rec["skill_texts"], rec["skill_vecs"],
+                sentence_vecs=rec.get("sentence_vecs"),
+            )
+        return ids
+
+    def find_candidates(
+        self,
+        jd_skill_vec: np.ndarray,
+        limit: int = 1000,
+        min_similarity: float = 0.1,
+        *,
+        probes: Optional[int] = None,
+        ef_search: Optional[int] = None,
+        candidate_ids: Optional[List[int]] = None,
+    ) -> List[Tuple[int, float, str, Dict[str, Any]]]:
+        """Find résumés with similar mean skill vectors (cosine similarity).
+
+        ``candidate_ids`` restricts the search to a pre-filtered set, scored
+        exactly instead of through the FAISS index.
+        """
+        if not self._filenames:
+            return []
+        if candidate_ids is not None:
+            rows = self._rows(candidate_ids)
+            sims = _normalize(self._mean.matrix[rows]) @ _normalize(jd_skill_vec.reshape(1, -1))[0]
+            order = np.argsort(-sims, kind="stable")[:limit]
+            return [
+                (int(rows[i]) + 1, float(sims[i]), self._filenames[rows[i]], self._meta[rows[i]])
+                for i in order
+                if sims[i] > min_similarity
+            ]
+        index = self._sync_index()
+        if probes is not None and isinstance(index, faiss.IndexIVF):
+            index.nprobe = probes
+        if ef_search is not None and self.index_type == "hnsw":
+            index.hnsw.efSearch = ef_search
+
+        k = min(limit, len(self._filenames))
+        sims, rows = index.search(_normalize(jd_skill_vec.reshape(1, -1)), k)
+        return [
+            (int(row) + 1, float(sim), self._filenames[row], self._meta[row])
+            for sim, row in zip(sims[0], rows[0])
+            if row >= 0 and sim > min_similarity
+        ]
+
+    def iter_skill_texts(self) -> Iterator[Tuple[int, str]]:
+        """Yield ``(resume_id, skill_text)`` for every stored skill."""
+        for row, texts in enumerate(self._skill_texts):
+            for text in texts:
+                yield row + 1, text
+
+    def get_skill_vectors(self, resume_id: int) -> Tuple[List[str], np.ndarray]:
+        """Get individual skill vectors for a résumé (ordered by skill text)."""
+        row = resume_id - 1
+        texts = self._skill_texts[row]
+        order = sorted(range(len(texts)), key=texts.__getitem__)
+        return [texts[i] for i in order], self._skills.get(row)[order]
+
+    def _rows(self, resume_ids: List[int]) -> np.ndarray:
+        rows = np.asarray(resume_ids, dtype=np.int64) - 1
+        if rows.size and (rows.min() < 0 or rows.max() >= len(self._filenames)):
+            raise ValueError("Unknown resume ids")
+        return rows
+
+    def get_skill_vectors_bulk(self, resume_ids: List[int]) -> Tuple[List[str], np.ndarray, np.ndarray]:
+        """Skill texts, (n, dim) matrix and offsets for many résumés (ordered by skill text within each)."""
+        rows = self._rows(resume_ids)
+        matrix, offsets = self._skills.gather(rows)
+        order: List[int] = []
+        for i, row in enumerate(rows):
+            texts = self._skill_texts[row]
+            order.extend(int(offsets[i]) + j for j in sorted(range(len(texts)), key=texts.__getitem__))
+        flat = [t for row in rows for t in self._skill_texts[row]]
+        return [flat[j] for j in order], matrix[order], offsets
+
+    def get_skill_vocabulary(self) -> Tuple[List[str], np.ndarray]:
+        """Distinct skill texts and their vectors (first occurrence wins)."""
+        first: Dict[str, int] = {}
+        for row, text in enumerate(t for texts in self._skill_texts for t in texts):
+            first.setdefault(text, row)
+        return list(first), dequantize(self._skills.matrix[list(first.values())])
+
+    def get_sentence_vectors_bulk(self, resume_ids: List[int]) -> Tuple[np.ndarray, np.ndarray]:
+        return self._sentences.gather(self._rows(resume_ids))
+
+    def get_exp_vectors_bulk(self, resume_ids: List[int]) -> np.ndarray:
+        return self._exp.matrix[self._rows(resume_ids)]
+
+    def get_resume_features(self, resume_ids: List[int]) -> List[Dict[str, Any]]:
+        """Rebuild ``ResumeJDMatcher._vectorize_resume`` feature dicts from the index."""
+        rows = self._rows(resume_ids)
+        skill_mat, skill_off = self._skills.gather(rows)
+        sent_mat, sent_off = self._sentences.gather(rows)
+        mean, exp = self._mean.matrix, self._exp.matrix
+        return [
+            {
+                "skill_vecs": skill_mat[skill_off[i]:skill_off[i + 1]],
+                "skill_vec": mean[row],
+                "exp_vec": exp[row],
+                "sentence_vecs": sent_mat[sent_off[i]:sent_off[i + 1]],
+                "years_experience": float(self._meta[row].get("years_experience") or 0.0),
+                "degree_level": self._meta[row].get("degree_level") or "none",
+            }
+            for i, row in enumerate(rows)
+        ]
+
+    def iter_resume_features(self, chunk_size: int = 1000) -> Iterator[Dict[str, Any]]:
+        """Yield ``get_resume_features`` dicts (plus id / filename) in id order."""
+        for start in range(0, len(self._filenames), chunk_size):
+            ids = list(range(start + 1, min(start + chunk_size, len(self._filenames)) + 1))
+            for resume_id, feats in zip(ids, self.get_resume_features(ids)):
+                yield {"id": resume_id, "filename": self._filenames[resume_id - 1], **feats}
+
+    def close(self):
+        """No-op, for ``VectorDB`` compatibility."""
+
+    # --------------------------------------------------
+    # Persistence
+    # --------------------------------------------------
+
+    def save(self, path: str | Path) -> None:
+        """Write the index and all vectors to directory ``path``."""
+        path = Path(path)
+        path.mkdir(parents=True, exist_ok=True)
+        for name, store in (("mean", self._mean), ("exp", self._exp),
+                            ("skills", self._skills), ("sentences", self._sentences)):
+            store.save(path, name)
+        if self._filenames:
+            faiss.write_index(self._sync_index(), str(path / "mean.faiss"))
+        with open(path / "meta.json", "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "dim": self.dim,
+                    "index_type": self.index_type,
+                    "hnsw_m": self.hnsw_m,
+                    "ivf_nlist": self.ivf_nlist,
+                    "ivf_nprobe": self.ivf_nprobe,
+                    "vector_dtype": self.vector_dtype,
+                    "filenames": self._filenames,
+                    "meta": self._meta,
+                    "skill_texts": self._skill_texts,
+                },
+                f,
+            )
+
+    @classmethod
+    def load(cls, path: str | Path) -> "LocalVectorIndex":
+        """Load an index written by :meth:`save`."""
+        path = Path(path)
+        with open(path / "meta.json", encoding="utf-8") as f:
+            data = json.load(f)
+        idx = cls(
+            data["dim"], index_type=data["index_type"],
+            hnsw_m=data["hnsw_m"], ivf_nlist=data["ivf_nlist"],
+            ivf_nprobe=data.get("ivf_nprobe", 10),
+            vector_dtype=data.get("vector_dtype", "float32"),
+        )
+        idx._filenames = data["filenames"]
+        idx._by_filename = {name: i + 1 for i, name in enumerate(idx._filenames)}
+        idx._meta = data["meta"]
+        idx._skill_texts = data["skill_texts"]
+        idx._mean = _RaggedStore.load(path, "mean", idx.dim)
+        idx._exp = _RaggedStore.load(path, "exp", idx.dim)
+        idx._skills = _RaggedStore.load(path, "skills", idx.dim, idx.vector_dtype)
+        idx._sentences = _RaggedStore.load(path, "sentences", idx.dim, idx.vector_dtype)
+        if (path / "mean.faiss").exists():
+            idx._index = faiss.read_index(str(path / "mean.faiss"))
+            idx._indexed = len(idx._filenames)
+        return idx
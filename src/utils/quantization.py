@@ -0,0 +1,145 @@
+"""Reduced-precision storage for skill and sentence vectors.
+
+Three representations are supported for an ``(n, dim)`` matrix of unit
+vectors:
+
+* ``"float32"`` – the default, unchanged;
+* ``"float16"`` – a plain ``np.float16`` array (half the memory);
+* ``"int8"``    – an :class:`Int8Matrix`: int8 codes plus one float32 scale
+  per row, ``row ≈ codes * scale`` (about a quarter of the memory).
+
+``dot_t`` computes ``vecs @ matrix.T`` for any of them, so the segmented
+kernels in ``batch_ops`` run on quantized arrays block by block without ever
+dequantizing the whole matrix.
+"""
+
+from __future__ import annotations
+
+from typing import Sequence, Union
+
+import numpy as np
+
+__all__ = ["VECTOR_DTYPES", "Int8Matrix", "concat", "dequantize", "dot_t", "norm_bound", "quantize"]
+
+VECTOR_DTYPES = ("float32", "float16", "int8")
+
+
+class Int8Matrix:
+    """Per-row scaled int8 matrix: row ``i`` is ``codes[i] * scales[i]``.
+
+    Supports the slicing / fancy indexing the batched kernels use; indexing
+    always returns another ``Int8Matrix``.
+    """
+
+    def __init__(self, codes: np.ndarray, scales: np.ndarray):
+        self.codes = codes
+        self.scales = scales
+
+    @classmethod
+    def quantize(cls, matrix: np.ndarray) -> "Int8Matrix":
+        """Symmetric per-row quantization: the largest |value| of a row maps to 127."""
+        matrix = np.asarray(matrix, dtype=np.float32)
+        matrix = matrix.reshape(len(matrix), -1) if matrix.ndim != 2 else matrix
+        peak = np.abs(matrix).max(axis=1) if matrix.size else np.zeros(len(matrix), dtype=np.float32)
+        scales = (peak / 127.0).astype(np.float32)
+        safe = np.where(scales == 0, 1.0, scales)[:, None]
+        codes = np.clip(np.rint(matrix / safe), -127, 127).astype(np.int8)
+        return cls(codes, scales)
+
+    @property
+    def shape(self):
+        return self.codes.shape
+
+    @property
+    def size(self) -> int:
+        return self.codes.size
+
+    @property
+    def nbytes(self) -> int:
+        return self.codes.nbytes + self.scales.nbytes
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def __getitem__(self, key) -> "Int8Matrix":
+        if isinstance(key, (int, np.integer)):
+            key = slice(key, key + 1)
+        return Int8Matrix(self.codes[key], self.scales[key])
+
+    def dequantize(self) -> np.ndarray:
+        return self.codes.astype(np.float32) * self.scales[:, None]
+
+
+Matrix = Union[np.ndarray, Int8Matrix]
+
+
+def quantize(matrix: np.ndarray, dtype: str = "float32") -> Matrix:
+    """Convert a float matrix to one of ``VECTOR_DTYPES``."""
+    if dtype == "float32":
+        return np.asarray(matrix, dtype=np.float32)
+    if dtype == "float16":
+        return np.asarray(matrix, dtype=np.float16)
+    if dtype == "int8":
+        return Int8Matrix.quantize(matrix)
+    raise ValueError(f"Unknown vector dtype '{dtype}', expected one of {VECTOR_DTYPES}")
+
+
+def dequantize(matrix: Matrix) -> np.ndarray:
+    """float32 copy (or view) of a possibly quantized matrix."""
+    if isinstance(matrix, Int8Matrix):
+        return matrix.dequantize()
+    return np.asarray(matrix, dtype=np.float32)
+
+
+def concat(matrices: Sequence[Matrix]) -> Matrix:
+    """``np.vstack`` for matrices of one representation."""
+    if matrices and isinstance(matrices[0], Int8Matrix):
+        return Int8Matrix(
+            np.vstack([m.codes for m in matrices]),
+            np.concatenate([m.scales for m in matrices]),
+        )
+    return np.vstack(matrices)
+
+
+def norm_bound(matrix: Matrix) -> float:
+    """Upper bound of the row norms of a (quantized) matrix of unit vectors.
+
+    Covers float32 rounding, float16's 2**-11 relative error and int8's
+    per-element error of at most half a scale step.
+    """
+    if isinstance(matrix, Int8Matrix):
+        step = float(matrix.scales.max()) if len(matrix) else 0.0
+        return 1.0 + 1e-4 + 0.5 * step * np.sqrt(matrix.shape[1])
+    if matrix.dtype == np.float16:
+        return 1.0 + 1e-3
+    return 1.0 + 1e-4
+
+
+def dot_t(vecs: np.ndarray, matrix: Matrix, *, chunk_rows: int = 256) -> np.ndarray:
+    """``vecs @ matrix.T`` as float32 for a float32, float16 or int8 ``matrix``.
+
+    Rows are widened to float64 ``chunk_rows`` at a time into a cache-sized
+    buffer, so the product reads the (narrow) array only once. Accumulating in
+    float64 makes every similarity independent of the product's shape, so a
+    résumé scored alone gets bit-identical values to one scored in a batch.
+    int8 rows are multiplied as codes and scaled per column afterwards.
+    """
+    if isinstance(matrix, Int8Matrix):
+        sims = _dot_t_chunked(vecs, matrix.codes, chunk_rows)
+        sims *= matrix.scales
+        return sims
+    return _dot_t_chunked(vecs, matrix, chunk_rows)
+
+
+def _dot_t_chunked(vecs: np.ndarray, narrow: np.ndarray, chunk_rows: int) -> np.ndarray:
+    vecs = np.asarray(vecs, dtype=np.float64)
+    out = np.empty((len(vecs), len(narrow)), dtype=np.float32)
+    buf = np.empty((min(chunk_rows, len(narrow)), narrow.shape[1]), dtype=np.float64)
+    tmp = np.empty((len(vecs), min(chunk_rows, len(narrow))), dtype=np.float64)
+    for lo in range(0, len(narrow), chunk_rows):
+        block = buf[:min(chunk_rows, len(narrow) - lo)]
+        np.copyto(block, narrow[lo:lo + chunk_rows], casting="unsafe")
+        t = tmp[:, :len(block)]
+        np.matmul(vecs, block.T, out=t)
+        out[:, lo:lo + len(block)] = t
+    return out
@@ -0,0 +1,255 @@
+"""Memory-mapped columnar snapshot of résumé vectors.
+
+A snapshot is a directory of raw little-endian arrays plus a JSON manifest::
+
+    manifest.json          dim, row counts, filenames, degree vocabulary
+    ids.i64                résumé ids                      (n,)
+    mean_vecs.f32          mean skill vectors              (n, dim)
+    exp_vecs.f32           experience vectors              (n, dim)
+    skill_vecs.f32         per-skill vectors               (n_skills, dim)
+    skill_offsets.i64      CSR offsets into skill_vecs     (n + 1,)
+    sentence_vecs.f32      bullet vectors                  (n_sentences, dim)
+    sentence_offsets.i64   CSR offsets into sentence_vecs  (n + 1,)
+    years.f64              years of experience             (n,)
+    degree.i8              index into manifest["degree_levels"]  (n,)
+
+Snapshots written with ``vector_dtype="float16"`` store ``skill_vecs`` and
+``sentence_vecs`` as ``.f16``; with ``"int8"`` they are ``.i8`` codes plus
+``skill_scales.f32`` / ``sentence_scales.f32`` (one scale per row), and
+``rank`` scores the quantized rows directly.
+
+``ResumeSnapshot.open`` maps every array with ``np.memmap``, so a ranking
+process starts in milliseconds and worker processes share the page cache.
+"""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from src.utils.quantization import VECTOR_DTYPES, Int8Matrix, dequantize, quantize
+
+__all__ = ["ResumeSnapshot", "SnapshotWriter", "export_from_db"]
+
+DEGREE_LEVELS = ["none", "diploma", "bachelors", "masters", "phd"]
+
+_COLUMNS = {
+    "ids": np.int64,
+    "mean_vecs": np.float32,
+    "exp_vecs": np.float32,
+    "skill_vecs": np.float32,
+    "skill_offsets": np.int64,
+    "sentence_vecs": np.float32,
+    "sentence_offsets": np.int64,
+    "years": np.float64,
+    "degree": np.int8,
+}
+_SUFFIX = {np.float32: "f32", np.float64: "f64", np.int64: "i64", np.int8: "i8", np.float16: "f16"}
+
+# Per-row vector columns that follow the snapshot's vector_dtype
+_QUANTIZED = ("skill_vecs", "sentence_vecs")
+_VECTOR_TYPES = {"float32": np.float32, "float16": np.float16, "int8": np.int8}
+
+
+def _columns(vector_dtype: str) -> Dict[str, Any]:
+    columns = dict(_COLUMNS)
+    for name in _QUANTIZED:
+        columns[name] = _VECTOR_TYPES[vector_dtype]
+        if vector_dtype == "int8":
+            columns[name.replace("_vecs", "_scales")] = np.float32
+    return columns
+
+
+def _column_path(path: Path, name: str, columns: Dict[str, Any] = _COLUMNS) -> Path:
+    return path / f"{name}.{_SUFFIX[columns[name]]}"
+
+
+class SnapshotWriter:
+    """Append résumé features to a snapshot directory, streaming to disk.
+
+    Use as a context manager; the manifest and offsets are written on close.
+    ``vector_dtype`` ("float32", "float16" or "int8") sets how skill and
+    sentence vectors are stored.
+    """
+
+    def __init__(self, path: str | Path, dim: int, *, vector_dtype: str = "float32"):
+        if vector_dtype not in VECTOR_DTYPES:
+            raise ValueError(f"Unknown vector dtype '{vector_dtype}', expected one of {VECTOR_DTYPES}")
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.dim = dim
+        self.vector_dtype = vector_dtype
+        self._columns = _columns(vector_dtype)
+        self._files = {
+            name: open(_column_path(self.path, name, self._columns), "wb")
+            for name in self._columns
+            if not name.endswith("_offsets")
+        }
+        self._filenames: List[str] = []
+        self._skill_counts: List[int] = []
+        self._sentence_counts: List[int] = []
+
+    def _write(self, name: str, values: Any) -> None:
+        arr = np.ascontiguousarray(values, dtype=self._columns[name])
+        self._files[name].write(arr.astype(arr.dtype.newbyteorder("<"), copy=False).tobytes())
+
+    def append(self, resume_id: int, filename: str, features: Dict[str, Any]) -> None:
+        """Append one résumé's ``_vectorize_resume``-style feature dict."""
+        skill_vecs = np.asarray(features["skill_vecs"], dtype=np.float32).reshape(-1, self.dim)
+        sent_vecs = np.asarray(features["sentence_vecs"], dtype=np.float32).reshape(-1, self.dim)
+        self._write("ids", [resume_id])
+        self._write("mean_vecs", np.asarray(features["skill_vec"]).reshape(1, self.dim))
+        self._write("exp_vecs", np.asarray(features["exp_vec"]).reshape(1, self.dim))
+        for name, vecs in (("skill_vecs", skill_vecs), ("sentence_vecs", sent_vecs)):
+            stored = quantize(vecs, self.vector_dtype)
+            if isinstance(stored, Int8Matrix):
+                self._write(name, stored.codes)
+                self._write(name.replace("_vecs", "_scales"), stored.scales)
+            else:
+                self._write(name, stored)
+        self._write("years", [features["years_experience"]])
+        level = features.get("degree_level") or "none"
+        self._write("degree", [DEGREE_LEVELS.index(level) if level in DEGREE_LEVELS else 0])
+        self._filenames.append(filename)
+        self._skill_counts.append(len(skill_vecs))
+        self._sentence_counts.append(len(sent_vecs))
+
+    def close(self) -> None:
+        for f in self._files.values():
+            f.close()
+        for name, counts in (("skill_offsets", self._skill_counts), ("sentence_offsets", self._sentence_counts)):
+            offsets = np.zeros(len(counts) + 1, dtype=np.int64)
+            np.cumsum(counts, out=offsets[1:])
+            offsets.astype("<i8").tofile(_column_path(self.path, name))
+        manifest = {
+            "version": 1,
+            "dim": self.dim,
+            "vector_dtype": self.vector_dtype,
+            "count": len(self._filenames),
+            "skill_rows": int(sum(self._skill_counts)),
+            "sentence_rows": int(sum(self._sentence_counts)),
+            "degree_levels": DEGREE_LEVELS,
+            "filenames": self._filenames,
+        }
+        with open(self.path / "manifest.json", "w", encoding="utf-8") as f:
+            json.dump(manifest, f)
+
+    def __enter__(self) -> "SnapshotWriter":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+class ResumeSnapshot:
+    """Read-only, memory-mapped view of a snapshot directory."""
+
+    def __init__(self, path: Path, manifest: Dict[str, Any], arrays: Dict[str, np.ndarray]):
+        self.path = path
+        self.dim: int = manifest["dim"]
+        self.filenames: List[str] = manifest["filenames"]
+        self.degree_levels: List[str] = manifest["degree_levels"]
+        self.vector_dtype: str = manifest.get("vector_dtype", "float32")
+        for name, arr in arrays.items():
+            setattr(self, name, arr)
+        if self.vector_dtype == "int8":
+            # kernels take the codes and their per-row scales as one matrix
+            for name in _QUANTIZED:
+                scales = name.replace("_vecs", "_scales")
+                setattr(self, name, Int8Matrix(arrays[name], arrays[scales]))
+
+    @classmethod
+    def open(cls, path: str | Path) -> "ResumeSnapshot":
+        path = Path(path)
+        with open(path / "manifest.json", encoding="utf-8") as f:
+            manifest = json.load(f)
+        n, dim = manifest["count"], manifest["dim"]
+        columns = _columns(manifest.get("vector_dtype", "float32"))
+        shapes = {
+            "ids": (n,),
+            "mean_vecs": (n, dim),
+            "exp_vecs": (n, dim),
+            "skill_vecs": (manifest["skill_rows"], dim),
+            "skill_offsets": (n + 1,),
+            "sentence_vecs": (manifest["sentence_rows"], dim),
+            "sentence_offsets": (n + 1,),
+            "years": (n,),
+            "degree": (n,),
+            "skill_scales": (manifest["skill_rows"],),
+            "sentence_scales": (manifest["sentence_rows"],),
+        }
+        arrays = {}
+        for name, dtype in columns.items():
+            shape = shapes[name]
+            dtype = np.dtype(dtype).newbyteorder("<")
+            if shape[0] == 0:
+                arrays[name] = np.empty(shape, dtype=dtype)  # np.memmap rejects empty files
+            else:
+                arrays[name] = np.memmap(_column_path(path, name, columns), dtype=dtype, mode="r", shape=shape)
+        return cls(path, manifest, arrays)
+
+    def __len__(self) -> int:
+        return len(self.filenames)
+
+    def degree_names(self, rows: Optional[np.ndarray] = None) -> List[str]:
+        codes = self.degree if rows is None else self.degree[rows]
+        return [self.degree_levels[c] for c in codes]
+
+    def features(self, row: int) -> Dict[str, Any]:
+        """``_vectorize_resume``-style feature dict for snapshot row ``row``."""
+        s0, s1 = self.skill_offsets[row], self.skill_offsets[row + 1]
+        t0, t1 = self.sentence_offsets[row], self.sentence_offsets[row + 1]
+        return {
+            "skill_vecs": dequantize(self.skill_vecs[s0:s1]),
+            "skill_vec": self.mean_vecs[row],
+            "exp_vec": self.exp_vecs[row],
+            "sentence_vecs": dequantize(self.sentence_vecs[t0:t1]),
+            "years_experience": float(self.years[row]),
+            "degree_level": self.degree_levels[self.degree[row]],
+        }
+
+    def iter_features(self) -> Iterable[Dict[str, Any]]:
+        for row in range(len(self)):
+            yield self.features(row)
+
+    def rank(self, matcher, jd, top_n: int = 10, *, prune: bool = True) -> List[Tuple[int, str, float]]:
+        """Score the whole snapshot against a JD; returns (id, filename, score) best first.
+
+        The CSR layout is already what the batched kernels expect, so the
+        arrays are scored in place without stacking. With ``prune`` only
+        résumés whose score upper bound can reach the top ``top_n`` go through
+        the skill / sentence kernels (same result as exhaustive scoring).
+        """
+        jd_f = matcher.prepare_jd(jd)
+        top, scores = matcher._top_n_stacked(
+            jd_f,
+            self.skill_vecs,
+            self.skill_offsets,
+            self.sentence_vecs,
+            self.sentence_offsets,
+            self.exp_vecs,
+            self.degree_names(),
+            self.years,
+            top_n,
+            prune=prune,
+        )
+        return [(int(self.ids[i]), self.filenames[i], float(score)) for i, score in zip(top, scores)]
+
+
+def export_from_db(db, path: str | Path, *, chunk_size: int = 1000, vector_dtype: str = "float32") -> int:
+    """Export every stored résumé of ``db`` to a snapshot.
+
+    ``db`` is a ``VectorDB`` or ``LocalVectorIndex``; résumés are read
+    ``chunk_size`` at a time via ``iter_resume_features`` and stored with
+    ``vector_dtype`` skill / sentence vectors.
+    Returns the number of résumés written.
+    """
+    count = 0
+    with SnapshotWriter(path, db.dim, vector_dtype=vector_dtype) as writer:
+        for feats in db.iter_resume_features(chunk_size):
+            writer.append(feats["id"], feats["filename"], feats)
+            count += 1
+    return count
@@ -0,0 +1,186 @@
+"""Inverted index from normalised skill token to résumé ids.
+
+Built from ``resume_to_embed_payload`` skill_texts, it narrows the candidate
+set for hard must-have skills (set intersection / union with synonym
+expansion) before any vector math. Postings are sorted int64 arrays so the
+set operations run in NumPy; the index can be saved next to a vector store.
+"""
+
+from __future__ import annotations
+
+import json
+import re
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set
+
+import numpy as np
+import yaml
+
+__all__ = ["SkillIndex", "normalize_skill", "skill_tokens"]
+
+_SYNONYMS_PATH = Path(__file__).resolve().parents[2] / "config" / "skill_synonyms.yml"
+_SPLIT_RE = re.compile(r"\s*(?:/|,|&|\||;|\band\b)\s*")
+_VERSION_RE = re.compile(r"\s+\+$")            # "angular +" left over from "Angular 2+"
+_JOIN_RE = re.compile(r"[\s.\-_]+")
+_EDGE_RE = re.compile(r"^[^a-z0-9#+]+|[^a-z0-9#+]+$")
+
+
+def normalize_skill(text: str) -> str:
+    """Canonical spelling of a skill: lowercase, no spaces / dots / dashes."""
+    text = _VERSION_RE.sub("", text.strip().lower())
+    return _EDGE_RE.sub("", _JOIN_RE.sub("", text))
+
+
+def skill_tokens(text: str) -> Set[str]:
+    """Index tokens for a skill string: the whole skill plus its compound parts."""
+    tokens = {normalize_skill(text)}
+    parts = _SPLIT_RE.split(text.lower())
+    if len(parts) > 1:
+        tokens.update(normalize_skill(p) for p in parts)
+    tokens.discard("")
+    return tokens
+
+
+@lru_cache(maxsize=4)
+def _synonym_groups(path: str | None = None) -> Dict[str, Set[str]]:
+    """token -> every spelling in its synonym group (including itself)."""
+    path = Path(path or _SYNONYMS_PATH)
+    if not path.exists():
+        return {}
+    with path.open("r", encoding="utf-8") as f:
+        raw = yaml.safe_load(f) or {}
+    groups: Dict[str, Set[str]] = {}
+    for canonical, aliases in raw.items():
+        group = {normalize_skill(str(canonical))} | {normalize_skill(str(a)) for a in aliases or []}
+        for token in group:
+            groups.setdefault(token, set()).update(group)
+    return groups
+
+
+class SkillIndex:
+    """Skill token -> sorted résumé-id postings."""
+
+    def __init__(self, synonyms_path: str | Path | None = None):
+        self.synonyms_path = str(synonyms_path) if synonyms_path else None
+        self._pending: Dict[str, List[int]] = {}
+        self._postings: Dict[str, np.ndarray] = {}
+        self._all_ids: List[int] = []
+
+    # --------------------------------------------------
+    # Building
+    # --------------------------------------------------
+
+    def add(self, resume_id: int, skill_texts: Iterable[str]) -> None:
+        """Index the skills of one résumé."""
+        self._all_ids.append(resume_id)
+        tokens: Set[str] = set()
+        for text in skill_texts:
+            tokens |= skill_tokens(text)
+        for token in tokens:
+            self._pending.setdefault(token, []).append(resume_id)
+
+    def _flush(self) -> None:
+        for token, ids in self._pending.items():
+            new = np.asarray(ids, dtype=np.int64)
+            old = self._postings.get(token)
+            self._postings[token] = np.unique(new if old is None else np.concatenate([old, new]))
+        self._pending.clear()
+
+    @classmethod
+    def from_db(cls, db, synonyms_path: str | Path | None = None) -> "SkillIndex":
+        """Build the index from the skills stored in a VectorDB / LocalVectorIndex.
+
+        Résumés with no stored skills are not indexed (they cannot satisfy a
+        must-have filter).
+        """
+        index = cls(synonyms_path)
+        for resume_id, text in db.iter_skill_texts():
+            index._all_ids.append(resume_id)
+            for token in skill_tokens(text):
+                index._pending.setdefault(token, []).append(resume_id)
+        return index
+
+    # --------------------------------------------------
+    # Queries
+    # --------------------------------------------------
+
+    def expand(self, skill: str) -> Set[str]:
+        """Tokens matching ``skill``, including its synonym group."""
+        groups = _synonym_groups(self.synonyms_path)
+        tokens = set()
+        for token in skill_tokens(skill):
+            tokens |= groups.get(token, {token})
+        return tokens
+
+    def postings(self, skill: str, *, expand: bool = True) -> np.ndarray:
+        """Sorted ids of résumés listing ``skill`` (or a synonym)."""
+        self._flush()
+        tokens = self.expand(skill) if expand else {normalize_skill(skill)}
+        arrays = [self._postings[t] for t in tokens if t in self._postings]
+        if not arrays:
+            return np.empty(0, dtype=np.int64)
+        return arrays[0] if len(arrays) == 1 else np.unique(np.concatenate(arrays))
+
+    def match_all(self, skills: Iterable[str], *, expand: bool = True) -> np.ndarray:
+        """Ids of résumés having every skill (intersection)."""
+        postings = sorted((self.postings(s, expand=expand) for s in skills), key=len)
+        if not postings:
+            return self.all_ids()
+        result = postings[0]
+        for arr in postings[1:]:
+            if result.size == 0:
+                break
+            result = np.intersect1d(result, arr, assume_unique=True)
+        return result
+
+    def match_any(self, skills: Iterable[str], *, expand: bool = True) -> np.ndarray:
+        """Ids of résumés having at least one of the skills (union)."""
+        arrays = [self.postings(s, expand=expand) for s in skills]
+        arrays = [a for a in arrays if a.size]
+        return np.unique(np.concatenate(arrays)) if arrays else np.empty(0, dtype=np.int64)
+
+    def candidates(
+        self, must_have: Iterable[str] = (), any_of: Optional[Iterable[str]] = None, *, expand: bool = True
+    ) -> np.ndarray:
+        """Résumés having all ``must_have`` skills and, if given, one of ``any_of``."""
+        result = self.match_all(must_have, expand=expand)
+        if any_of is not None:
+            result = np.intersect1d(result, self.match_any(any_of, expand=expand), assume_unique=True)
+        return result
+
+    def all_ids(self) -> np.ndarray:
+        return np.unique(np.asarray(self._all_ids, dtype=np.int64))
+
+    def __len__(self) -> int:
+        return len(self.all_ids())
+
+    # --------------------------------------------------
+    # Persistence
+    # --------------------------------------------------
+
+    def save(self, path: str | Path) -> None:
+        """Write the index to directory ``path`` (e.g. next to a snapshot)."""
+        self._flush()
+        path = Path(path)
+        path.mkdir(parents=True, exist_ok=True)
+        tokens = sorted(self._postings)
+        counts = [len(self._postings[t]) for t in tokens]
+        offsets = np.zeros(len(tokens) + 1, dtype=np.int64)
+        np.cumsum(counts, out=offsets[1:])
+        ids = np.concatenate([self._postings[t] for t in tokens]) if tokens else np.empty(0, dtype=np.int64)
+        np.savez(path / "skill_index.npz", ids=ids, offsets=offsets, all_ids=self.all_ids())
+        with open(path / "skill_index_tokens.json", "w", encoding="utf-8") as f:
+            json.dump(tokens, f)
+
+    @classmethod
+    def load(cls, path: str | Path, synonyms_path: str | Path | None = None) -> "SkillIndex":
+        path = Path(path)
+        with open(path / "skill_index_tokens.json", encoding="utf-8") as f:
+            tokens = json.load(f)
+        data = np.load(path / "skill_index.npz")
+        ids, offsets = data["ids"], data["offsets"]
+        index = cls(synonyms_path)
+        index._postings = {t: ids[offsets[i]:offsets[i + 1]] for i, t in enumerate(tokens)}
+        index._all_ids = data["all_ids"].tolist()
+        return index
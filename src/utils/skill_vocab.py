@@ -0,0 +1,180 @@
+"""Shared skill vocabulary: one embedding per distinct skill text.
+
+The same handful of skills ("javascript", "sql", "react") appears in most
+résumés, so vectors are kept once per text and résumés refer to them by id.
+Ingest uses the vocabulary to embed only skills it has not seen before, and
+coverage scoring can run on small integer id arrays against ``matrix``.
+``SkillNeighbours`` precomputes each skill's top-k most similar skills so
+coverage can be looked up instead of recomputed.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+from src.utils.quantization import dot_t
+
+__all__ = ["SkillNeighbours", "SkillVocabulary"]
+
+
+class SkillVocabulary:
+    """Append-only ``text -> id`` map with an ``(n, dim)`` vector matrix.
+
+    Ids are row numbers of :attr:`matrix` (0-based, insertion order); they are
+    local to this object and independent of database ids.
+    """
+
+    def __init__(self, dim: int):
+        self.dim = dim
+        self._ids: Dict[str, int] = {}
+        self._texts: List[str] = []
+        self._chunks: List[np.ndarray] = []
+        self._matrix = np.empty((0, dim), dtype=np.float32)
+
+    def __len__(self) -> int:
+        return len(self._texts)
+
+    def __contains__(self, text: str) -> bool:
+        return text in self._ids
+
+    @property
+    def texts(self) -> List[str]:
+        return self._texts
+
+    @property
+    def matrix(self) -> np.ndarray:
+        """Contiguous float32 matrix, row ``i`` is the vector of skill id ``i``."""
+        if self._chunks:
+            self._matrix = np.vstack([self._matrix, *self._chunks])
+            self._chunks = []
+        return self._matrix
+
+    def ids(self, texts: Iterable[str]) -> np.ndarray:
+        """Ids of ``texts`` (-1 for unknown skills)."""
+        return np.fromiter((self._ids.get(t, -1) for t in texts), dtype=np.int64)
+
+    def add(self, texts: Sequence[str], vecs: np.ndarray) -> np.ndarray:
+        """Add skills (already-known texts keep their vector); returns their ids."""
+        vecs = np.asarray(vecs, dtype=np.float32).reshape(-1, self.dim)
+        new_rows = []
+        for text, row in zip(texts, range(len(vecs))):
+            if text not in self._ids:
+                self._ids[text] = len(self._texts)
+                self._texts.append(text)
+                new_rows.append(row)
+        if new_rows:
+            self._chunks.append(vecs[new_rows])
+        return self.ids(texts)
+
+    def encode(self, texts: Sequence[str], *, batch_size: int = 256) -> np.ndarray:
+        """Ids of ``texts``, embedding only the skills not in the vocabulary yet."""
+        unseen = list(dict.fromkeys(t for t in texts if t not in self._ids))
+        if unseen:
+            from src.utils.embedding_utils import embed_texts
+            self.add(unseen, embed_texts(unseen, batch_size=batch_size))
+        return self.ids(texts)
+
+    @classmethod
+    def from_db(cls, db) -> "SkillVocabulary":
+        """Load every stored skill from a ``VectorDB`` / ``LocalVectorIndex``."""
+        texts, matrix = db.get_skill_vocabulary()
+        vocab = cls(db.dim)
+        vocab.add(texts, matrix)
+        return vocab
+
+
+def _model_name() -> str:
+    from src.utils.embedding_utils import DEFAULT_MODEL_NAME
+    return DEFAULT_MODEL_NAME
+
+
+def _fingerprint(vocab: SkillVocabulary, size: int) -> str:
+    """Hash of the first ``size`` skills and a sample of their vectors."""
+    h = hashlib.sha256()
+    h.update("\n".join(vocab.texts[:size]).encode("utf-8"))
+    h.update(np.ascontiguousarray(vocab.matrix[:min(size, 256)]).tobytes())
+    return h.hexdigest()
+
+
+class SkillNeighbours:
+    """Sparse top-``k`` skill-to-skill cosine table over a ``SkillVocabulary``.
+
+    Row ``i`` lists the ``k`` most similar vocabulary skills of skill ``i``
+    (best first, padded with -1 / -inf). The table records the embedding model
+    and a fingerprint of the vocabulary it was built from; :meth:`load` rejects
+    tables built with another model, so a model change rebuilds it.
+    """
+
+    def __init__(self, nbr_ids: np.ndarray, nbr_sims: np.ndarray, model: str, fingerprint: str):
+        self.nbr_ids = nbr_ids
+        self.nbr_sims = nbr_sims
+        self.model = model
+        self.fingerprint = fingerprint
+
+    def __len__(self) -> int:
+        return len(self.nbr_ids)
+
+    @property
+    def k(self) -> int:
+        return self.nbr_ids.shape[1]
+
+    @classmethod
+    def build(cls, vocab: SkillVocabulary, k: int = 32, *, block_rows: int = 4096) -> "SkillNeighbours":
+        """Exact top-``k`` neighbours of every vocabulary skill, ``block_rows`` at a time."""
+        matrix = vocab.matrix
+        n = len(matrix)
+        kk = min(k, n)
+        nbr_ids = np.full((n, k), -1, dtype=np.int64)
+        nbr_sims = np.full((n, k), -np.inf, dtype=np.float32)
+        for lo in range(0, n, block_rows):
+            sims = dot_t(matrix[lo:lo + block_rows], matrix)
+            top = np.argpartition(sims, n - kk, axis=1)[:, n - kk:]
+            top_sims = np.take_along_axis(sims, top, axis=1)
+            order = np.argsort(-top_sims, axis=1, kind="stable")
+            nbr_ids[lo:lo + block_rows, :kk] = np.take_along_axis(top, order, axis=1)
+            nbr_sims[lo:lo + block_rows, :kk] = np.take_along_axis(top_sims, order, axis=1)
+        return cls(nbr_ids, nbr_sims, _model_name(), _fingerprint(vocab, n))
+
+    def is_valid_for(self, vocab: SkillVocabulary) -> bool:
+        """True if built with the current model over a prefix of ``vocab``."""
+        return (
+            self.model == _model_name()
+            and len(self) <= len(vocab)
+            and self.fingerprint == _fingerprint(vocab, len(self))
+        )
+
+    def save(self, path: str | Path) -> None:
+        path = Path(path)
+        path.mkdir(parents=True, exist_ok=True)
+        np.savez(path / "skill_neighbours.npz", ids=self.nbr_ids, sims=self.nbr_sims)
+        with open(path / "skill_neighbours.json", "w", encoding="utf-8") as f:
+            json.dump({"model": self.model, "fingerprint": self.fingerprint, "k": self.k}, f)
+
+    @classmethod
+    def load(cls, path: str | Path, vocab: SkillVocabulary) -> Optional["SkillNeighbours"]:
+        """Load a saved table, or None if missing or stale for ``vocab`` / the model."""
+        path = Path(path)
+        if not (path / "skill_neighbours.json").exists():
+            return None
+        with open(path / "skill_neighbours.json", encoding="utf-8") as f:
+            info = json.load(f)
+        data = np.load(path / "skill_neighbours.npz")
+        table = cls(data["ids"], data["sims"], info["model"], info["fingerprint"])
+        if not table.is_valid_for(vocab):
+            print(f"⚠️ Skill neighbour table at {path} is stale, ignoring it")
+            return None
+        return table
+
+    @classmethod
+    def load_or_build(cls, path: str | Path, vocab: SkillVocabulary, k: int = 32) -> "SkillNeighbours":
+        """Load the table at ``path``; rebuild and save it when missing, stale or outgrown."""
+        table = cls.load(path, vocab)
+        if table is None or len(table) < len(vocab) or table.k != k:
+            table = cls.build(vocab, k)
+            table.save(path)
+        return table
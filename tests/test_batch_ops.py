@@ -0,0 +1,30 @@
+"""Memory bound of the padded top-k kernel in ``batch_ops``."""
+
+import numpy as np
+import pytest
+
+from src.matchers import batch_ops
+
+
+@pytest.mark.parametrize("max_cells", [1, 50, 400])
+def test_topk_mean_block_padding_is_bounded(monkeypatch, max_cells):
+    rng = np.random.default_rng(0)
+    counts = rng.integers(0, 12, size=60)
+    counts[7] = 40                                   # one long segment
+    starts = np.r_[0, np.cumsum(counts)[:-1]]
+    sims = rng.normal(size=(5, int(counts.sum()))).astype(np.float32)
+    expected = batch_ops._topk_mean_block(sims, starts, counts, 20)
+
+    sizes = []
+    padded = batch_ops._topk_mean_padded
+
+    def record(sims, starts, counts, k):
+        sizes.append((len(counts), max(1, int(counts.max())) * sims.shape[0]))
+        return padded(sims, starts, counts, k)
+
+    monkeypatch.setattr(batch_ops, "_topk_mean_padded", record)
+    got = batch_ops._topk_mean_block(sims, starts, counts, 20, max_cells=max_cells)
+    np.testing.assert_allclose(got, expected, rtol=1e-12)
+    assert sum(n for n, _ in sizes) == len(counts)
+    # a run is one segment, or fits the budget
+    assert all(n == 1 or n * cells <= max_cells for n, cells in sizes)
@@ -0,0 +1,104 @@
+"""Batched scoring must give exactly the same scores as ``ResumeJDMatcher.score``."""
+
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+pytest.importorskip("sentence_transformers")
+
+from src.matchers.matcher import ResumeJDMatcher
+from src.utils import embedding_utils
+
+DIM = 384
+LEVELS = ["none", "bachelors", "masters", "phd", None]
+
+
+def _unit(rng, n, dim=DIM):
+    vecs = rng.normal(size=(n, dim)).astype(np.float32)
+    return vecs / np.linalg.norm(vecs, axis=1, keepdims=True)
+
+
+def _pool(rng, n):
+    return [
+        dict(
+            skill_vecs=_unit(rng, int(rng.integers(0, 15))),
+            sentence_vecs=_unit(rng, int(rng.integers(0, 12))),
+            exp_vec=_unit(rng, 1)[0] if rng.random() < 0.95 else np.zeros(DIM, dtype=np.float32),
+            years_experience=float(rng.integers(0, 20)),
+            degree_level=LEVELS[rng.integers(0, len(LEVELS))],
+        )
+        for _ in range(n)
+    ]
+
+
+def _jd(rng):
+    return dict(
+        skill_vecs=_unit(rng, 10),
+        sentence_vecs=_unit(rng, 8),
+        skill_vec=_unit(rng, 1)[0],
+        exp_vec=_unit(rng, 1)[0],
+        years_required=5.0,
+        degree_required="bachelors",
+    )
+
+
+@pytest.mark.parametrize("seed", [0, 1])
+def test_batch_scores_equal_single_scores(seed):
+    rng = np.random.default_rng(seed)
+    matcher = ResumeJDMatcher()
+    pool, jd_f = _pool(rng, 4000), _jd(rng)
+
+    batch = matcher._score_features_batch(pool, jd_f)
+    single = np.array([matcher._score_features(f, jd_f) for f in pool])
+    np.testing.assert_array_equal(batch, single)
+
+
+def test_similarity_components_are_bit_identical():
+    # before rounding, so differences in summation order are not hidden by it
+    rng = np.random.default_rng(3)
+    matcher = ResumeJDMatcher()
+    pool, jd_f = _pool(rng, 2000), _jd(rng)
+
+    *stacked, skill_vocab = matcher._stack_features(pool, jd_f)
+    skill_mat, skill_off, sent_mat, sent_off = stacked[:4]
+    skill_sim, sent_sim = matcher._similarity_components(jd_f, skill_mat, skill_off, sent_mat, sent_off)
+    np.testing.assert_array_equal(
+        skill_sim, [matcher._skill_coverage(jd_f["skill_vecs"], f["skill_vecs"]) for f in pool]
+    )
+    np.testing.assert_array_equal(
+        sent_sim, [matcher._topk_sentence_similarity(jd_f["sentence_vecs"], f["sentence_vecs"]) for f in pool]
+    )
+
+
+def test_score_many_rows_equal_batch_scores():
+    rng = np.random.default_rng(2)
+    matcher = ResumeJDMatcher()
+    pool, jds = _pool(rng, 1000), [_jd(rng) for _ in range(3)]
+
+    many = matcher._score_features_many(pool, jds, tile_size=50_000)
+    for row, jd_f in zip(many, jds):
+        np.testing.assert_array_equal(row, matcher._score_features_batch(pool, jd_f))
+
+
+def test_resume_without_bullets_uses_model_dimension(monkeypatch):
+    dim = 8
+    monkeypatch.setattr(
+        embedding_utils, "_load_model", lambda *args: SimpleNamespace(get_sentence_embedding_dimension=lambda: dim)
+    )
+    rng = np.random.default_rng(4)
+    unit = lambda n: _unit(rng, n, dim)
+    empty = np.empty((0, dim), dtype=np.float32)
+    matcher = ResumeJDMatcher()
+
+    bare = matcher._resume_features({}, unit(3), empty, empty, 2.0)
+    full = matcher._resume_features({}, unit(2), unit(2), unit(1), 4.0)
+    assert bare["sentence_vecs"].shape == (0, dim)
+    assert bare["exp_vec"].shape == (dim,)
+
+    jd_f = dict(
+        skill_vecs=unit(3), sentence_vecs=unit(2), skill_vec=unit(1)[0], exp_vec=unit(1)[0],
+        years_required=3.0, degree_required=None,
+    )
+    batch = matcher._score_features_batch([bare, full], jd_f)
+    np.testing.assert_array_equal(batch, [matcher._score_features(f, jd_f) for f in (bare, full)])
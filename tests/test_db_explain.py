@@ -0,0 +1,54 @@
+"""EXPLAIN check for the ANN candidate query (needs Postgres with pgvector)."""
+
+import os
+import uuid
+
+import numpy as np
+import pytest
+
+psycopg2 = pytest.importorskip("psycopg2")
+from psycopg2.extensions import make_dsn
+from psycopg2.extras import execute_values
+
+from src.utils.db_utils import VectorDB, _vector_to_string
+
+DSN = os.getenv("DATABASE_URL")
+DIM = 8
+
+pytestmark = pytest.mark.skipif(not DSN, reason="DATABASE_URL is not set")
+
+
+@pytest.fixture
+def db():
+    """VectorDB on a throwaway schema of the configured database."""
+    schema = f"test_{uuid.uuid4().hex[:12]}"
+    admin = psycopg2.connect(DSN)
+    admin.autocommit = True
+    with admin.cursor() as cur:
+        cur.execute(f"CREATE SCHEMA {schema};")
+    vdb = VectorDB(make_dsn(DSN, options=f"-csearch_path={schema},public"), dim=DIM)
+    try:
+        yield vdb
+    finally:
+        vdb.close()
+        with admin.cursor() as cur:
+            cur.execute(f"DROP SCHEMA {schema} CASCADE;")
+        admin.close()
+
+
+def _seed_resumes(db: VectorDB, n: int = 2000) -> None:
+    rng = np.random.default_rng(0)
+    vecs = rng.normal(size=(n, DIM)).astype(np.float32)
+    vecs /= np.linalg.norm(vecs, axis=1, keepdims=True)
+    rows = [(f"resume_{i}.json", "{}", _vector_to_string(v), _vector_to_string(v)) for i, v in enumerate(vecs)]
+    with db._connection() as conn, conn.cursor() as cur:
+        execute_values(cur, "INSERT INTO resumes (filename, meta, skill_vec, exp_vec) VALUES %s", rows)
+        cur.execute("ANALYZE resumes;")
+        conn.commit()
+
+
+def test_find_candidates_uses_ann_index(db):
+    _seed_resumes(db)
+    query = np.ones(DIM, dtype=np.float32) / np.sqrt(DIM)
+    plan = db.explain_find_candidates(query, limit=10)
+    assert "idx_resumes_skill_vec_ann" in plan
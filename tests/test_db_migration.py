@@ -0,0 +1,71 @@
+"""Legacy ``resume_skill_vectors`` migration (needs Postgres with pgvector)."""
+
+import os
+import uuid
+
+import pytest
+
+psycopg2 = pytest.importorskip("psycopg2")
+from psycopg2.extensions import make_dsn
+
+from src.utils.db_utils import VectorDB
+
+DSN = os.getenv("DATABASE_URL")
+DIM = 8
+
+pytestmark = pytest.mark.skipif(not DSN, reason="DATABASE_URL is not set")
+
+
+@pytest.fixture
+def schema_dsn():
+    """DSN whose search_path starts at a throwaway schema holding a legacy table."""
+    schema = f"test_{uuid.uuid4().hex[:12]}"
+    admin = psycopg2.connect(DSN)
+    admin.autocommit = True
+    with admin.cursor() as cur:
+        cur.execute(f"CREATE SCHEMA {schema};")
+        cur.execute(f"""
+            CREATE TABLE {schema}.resume_skill_vectors (
+                resume_id INTEGER, skill_text TEXT NOT NULL, skill_vec vector({DIM}) NOT NULL
+            );
+            INSERT INTO {schema}.resume_skill_vectors VALUES
+                (1, 'python', '[1,0,0,0,0,0,0,0]'), (1, 'sql', '[0,1,0,0,0,0,0,0]');
+        """)
+    try:
+        yield make_dsn(DSN, options=f"-csearch_path={schema},public")
+    finally:
+        with admin.cursor() as cur:
+            cur.execute(f"DROP SCHEMA {schema} CASCADE;")
+        admin.close()
+
+
+def _has_legacy_table(db: VectorDB) -> bool:
+    with db._connection() as conn, conn.cursor() as cur:
+        cur.execute("SELECT to_regclass('resume_skill_vectors') IS NOT NULL;")
+        return cur.fetchone()[0]
+
+
+def test_opening_db_does_not_migrate(schema_dsn):
+    db = VectorDB(schema_dsn, dim=DIM)
+    try:
+        assert _has_legacy_table(db)
+    finally:
+        db.close()
+
+
+def test_migrate_skill_vectors_moves_rows(schema_dsn):
+    db = VectorDB(schema_dsn, dim=DIM)
+    try:
+        with db._connection() as conn, conn.cursor() as cur:
+            cur.execute(
+                "INSERT INTO resumes (filename, meta, skill_vec, exp_vec) VALUES (%s, '{}', %s, %s);",
+                ("r1.json", "[1,1,0,0,0,0,0,0]", "[1,1,0,0,0,0,0,0]"),
+            )
+            conn.commit()
+        assert db.migrate_skill_vectors()
+        assert not _has_legacy_table(db)
+        texts, matrix, offsets = db.get_skill_vectors_bulk([1])
+        assert texts == ["python", "sql"] and matrix.shape == (2, DIM)
+        assert not db.migrate_skill_vectors()
+    finally:
+        db.close()
@@ -0,0 +1,183 @@
+"""Experience totals with a stub LLM client (no network)."""
+
+import json
+import multiprocessing
+import os
+from types import SimpleNamespace
+
+import pytest
+
+from src.extractors import experience_utils
+from src.extractors.experience_utils import estimate_years_experience, estimate_years_experience_many
+
+MODULE_CACHE = experience_utils._experience_cache
+
+
+class FakeClient:
+    """Stands in for ``OpenAI()``: answers every request with ``years``."""
+
+    def __init__(self, years=2.5, failures=0):
+        self.years = years
+        self.failures = failures
+        self.calls = []
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+
+    def _create(self, **kwargs):
+        self.calls.append(kwargs)
+        if self.failures:
+            self.failures -= 1
+            raise ConnectionError("temporary failure")
+        content = json.dumps({"total_years_experience": self.years})
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+    def date_ranges(self, call=0):
+        """Date range list sent in the ``call``-th request."""
+        prompt = self.calls[call]["messages"][1]["content"]
+        return json.loads(prompt[prompt.index("["):])
+
+
+@pytest.fixture(autouse=True)
+def fresh_cache(monkeypatch):
+    cache = experience_utils._ExperienceCache()
+    monkeypatch.setattr(experience_utils, "_experience_cache", cache)
+    return cache
+
+
+def _resume(*dates):
+    return {"workExperiences": [{"jobTitle": "Engineer", "date": d} for d in dates]}
+
+
+def test_parsed_dates_do_not_call_llm():
+    client = FakeClient()
+    assert estimate_years_experience(_resume("Jan 2020 - Dec 2021"), client=client) == 2.0
+    assert client.calls == []
+
+
+def test_unparsed_range_sends_every_range_to_llm():
+    # the LLM total replaces the local one, so overlaps are not counted twice
+    client = FakeClient(years=2.5)
+    resume = _resume("Jan 2020 - Dec 2021", "Summer 2021")
+    assert estimate_years_experience(resume, client=client) == 2.5
+    assert client.date_ranges() == ["Jan 2020 - Dec 2021", "Summer 2021"]
+
+
+def test_llm_failure_keeps_local_total(monkeypatch):
+    monkeypatch.setattr(experience_utils.time, "sleep", lambda seconds: None)
+    client = FakeClient(failures=3)
+    resume = _resume("Jan 2020 - Dec 2021", "Summer 2021")
+    assert estimate_years_experience(resume, client=client) == 2.0
+    many = estimate_years_experience_many([resume], client=FakeClient(failures=3))
+    assert many == [2.0]
+
+
+def test_answers_are_memoised(tmp_path, monkeypatch):
+    cache = experience_utils._ExperienceCache(tmp_path / "experience.sqlite")
+    monkeypatch.setattr(experience_utils, "_experience_cache", cache)
+    client = FakeClient(years=3.0)
+    resume = _resume("Summer 2021", "Fall 2022")
+    assert estimate_years_experience(resume, client=client) == 3.0
+    assert estimate_years_experience(resume, client=client) == 3.0
+    assert len(client.calls) == 1
+
+    # persisted: a new cache on the same file answers without the LLM
+    monkeypatch.setattr(experience_utils, "_experience_cache", experience_utils._ExperienceCache(cache._path))
+    assert estimate_years_experience(resume, client=client) == 3.0
+    assert len(client.calls) == 1
+
+
+def test_failed_answers_are_not_cached(monkeypatch):
+    monkeypatch.setattr(experience_utils.time, "sleep", lambda seconds: None)
+    resume = _resume("Summer 2021")
+    assert estimate_years_experience(resume, client=FakeClient(failures=3)) == 0.0
+    assert estimate_years_experience(resume, client=FakeClient(years=0.25)) == 0.25
+
+
+def test_cache_key_includes_current_month(monkeypatch):
+    class FrozenDatetime(experience_utils.datetime):
+        month = (2025, 7)
+
+        @classmethod
+        def now(cls, tz=None):
+            return cls(*cls.month, 15)
+
+    monkeypatch.setattr(experience_utils, "datetime", FrozenDatetime)
+    ranges = ["Jun 2024 - Present"]
+    july = experience_utils._ExperienceCache.key(ranges)
+    assert experience_utils._ExperienceCache.key(list(reversed(ranges))) == july
+    FrozenDatetime.month = (2025, 8)
+    assert experience_utils._ExperienceCache.key(ranges) != july
+
+    client = FakeClient(years=1.0)
+    resume = _resume("Summer 2021")
+    estimate_years_experience(resume, client=client)
+    estimate_years_experience(resume, client=client)
+    FrozenDatetime.month = (2025, 9)
+    estimate_years_experience(resume, client=client)
+    assert len(client.calls) == 2
+
+
+def test_many_deduplicates_requests():
+    client = FakeClient(years=4.0)
+    resumes = [_resume("Summer 2021")] * 5 + [_resume("Fall 2022"), _resume("Jan 2020 - Jan 2021"), {}]
+    assert estimate_years_experience_many(resumes, client=client, max_workers=4) == [4.0] * 6 + [1.08, 0.0]
+    assert sorted(tuple(client.date_ranges(i)) for i in range(len(client.calls))) == [
+        ("Fall 2022",),
+        ("Summer 2021",),
+    ]
+
+
+def test_many_skips_llm_when_disabled():
+    client = FakeClient()
+    assert estimate_years_experience_many([_resume("Summer 2021")], allow_llm=False, client=client) == [0.0]
+    assert client.calls == []
+
+
+def test_request_errors_are_retried_with_backoff(monkeypatch):
+    sleeps = []
+    monkeypatch.setattr(experience_utils.time, "sleep", sleeps.append)
+    client = FakeClient(years=1.5, failures=2)
+    assert experience_utils._llm_years_experience(["Summer 2021"], client=client, backoff=0.5) == 1.5
+    assert len(client.calls) == 3
+    assert sleeps == [0.5, 1.0]
+
+    sleeps.clear()
+    client = FakeClient(failures=3)
+    assert experience_utils._llm_years_experience(["Summer 2021"], client=client, retries=3) is None
+    assert sleeps == [1.0, 2.0]
+
+
+def test_unparseable_llm_answer_returns_none():
+    client = FakeClient(years="about five")
+    assert experience_utils._llm_years_experience(["Summer 2021"], client=client) is None
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="needs fork()")
+def test_forked_child_opens_its_own_connection(tmp_path, monkeypatch):
+    # the module-level cache is the one reset by the registered fork handler
+    cache = MODULE_CACHE
+    monkeypatch.setattr(cache, "_path", tmp_path / "experience.sqlite")
+    monkeypatch.setattr(cache, "_conn", None)
+    monkeypatch.setattr(cache, "_memo", {})
+    cache.put("parent", 1.0)
+    parent_conn = cache._conn
+
+    ctx = multiprocessing.get_context("fork")
+    results = ctx.Queue()
+
+    def child():
+        results.put((cache._conn is None, cache.get("parent")))
+        cache.put("child", 2.0)
+        results.put(cache._conn is not None and cache._conn is not parent_conn)
+
+    try:
+        proc = ctx.Process(target=child)
+        proc.start()
+        proc.join(30)
+        assert proc.exitcode == 0
+        assert results.get(timeout=5) == (True, 1.0)
+        assert results.get(timeout=5) is True
+
+        cache._memo.clear()
+        assert cache.get("child") == 2.0
+    finally:
+        parent_conn.close()
@@ -0,0 +1,49 @@
+"""IVF sizing and vector ordering of the in-process FAISS index."""
+
+import numpy as np
+import pytest
+
+pytest.importorskip("faiss")
+
+from src.utils.local_index import LocalVectorIndex
+
+DIM = 8
+
+
+def _index(n: int, **kwargs) -> LocalVectorIndex:
+    rng = np.random.default_rng(0)
+    index = LocalVectorIndex(DIM, **kwargs)
+    for i in range(n):
+        texts = ["sql", "python", "docker"][: 1 + i % 3]
+        index.store_resume(
+            f"r{i}.json", {}, rng.standard_normal(DIM), rng.standard_normal(DIM),
+            texts, rng.standard_normal((len(texts), DIM)),
+        )
+    return index
+
+
+@pytest.mark.parametrize("n", [11, 200, 500])
+def test_ivf_returns_as_many_results_as_flat(n):
+    jd = np.random.default_rng(1).standard_normal(DIM)
+    flat = _index(n, index_type="flat").find_candidates(jd, limit=5, min_similarity=-1.0)
+    ivf = _index(n, index_type="ivf").find_candidates(jd, limit=5, min_similarity=-1.0)
+    assert len(ivf) == len(flat) == 5
+    assert len(_index(n, index_type="ivf").find_candidates(jd, limit=5, min_similarity=-1.0, probes=2)) == 5
+
+
+def test_ivf_adds_without_retraining_once_lists_are_sized():
+    index = _index(400, index_type="ivf", ivf_nlist=4)
+    trained = index._sync_index()
+    assert trained.nlist == 4 and trained.nprobe == 4
+    index.store_resume("extra.json", {}, np.ones(DIM), np.ones(DIM), [], np.empty((0, DIM)))
+    assert index._sync_index() is trained
+    assert trained.ntotal == 401
+
+
+def test_skill_vectors_bulk_match_single_lookups():
+    index = _index(6)
+    texts, matrix, offsets = index.get_skill_vectors_bulk([2, 3, 6])
+    for i, resume_id in enumerate([2, 3, 6]):
+        one_texts, one_matrix = index.get_skill_vectors(resume_id)
+        assert texts[offsets[i]:offsets[i + 1]] == one_texts == sorted(one_texts)
+        np.testing.assert_array_equal(matrix[offsets[i]:offsets[i + 1]], one_matrix)
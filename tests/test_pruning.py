@@ -0,0 +1,114 @@
+"""Upper-bound pruned top-N must equal exhaustive ranking."""
+
+import numpy as np
+import pytest
+
+pytest.importorskip("sentence_transformers")
+
+from src.matchers.batch_ops import top_n_indices
+from src.matchers.matcher import ResumeJDMatcher
+from config.weight_loader import get_config
+
+DIM = 16
+LEVELS = ["none", "bachelors", "masters", "phd", None]
+EMPTY = np.empty((0, DIM), dtype=np.float32)
+
+
+def _unit(rng, n):
+    vecs = rng.normal(size=(n, DIM)).astype(np.float32)
+    return vecs / np.linalg.norm(vecs, axis=1, keepdims=True)
+
+
+def _pool(rng, n):
+    pool = []
+    for _ in range(n):
+        if pool and rng.random() < 0.2:
+            pool.append(dict(pool[-1]))                # duplicates give exact ties
+            continue
+        pool.append(dict(
+            skill_vecs=_unit(rng, int(rng.integers(0, 6))),
+            sentence_vecs=_unit(rng, int(rng.integers(0, 8))),
+            skill_vec=_unit(rng, 1)[0],
+            exp_vec=_unit(rng, 1)[0] if rng.random() < 0.9 else np.zeros(DIM, dtype=np.float32),
+            years_experience=float(rng.integers(0, 20)),
+            degree_level=LEVELS[rng.integers(0, len(LEVELS))],
+        ))
+    return pool
+
+
+def _jd(rng):
+    return dict(
+        skill_vecs=_unit(rng, int(rng.integers(0, 5))),
+        sentence_vecs=_unit(rng, int(rng.integers(0, 6))),
+        skill_vec=_unit(rng, 1)[0],
+        exp_vec=_unit(rng, 1)[0],
+        years_required=float(rng.integers(0, 16)),
+        degree_required=["bachelors", "masters", None][rng.integers(0, 3)],
+    )
+
+
+@pytest.mark.parametrize("exact_bounds", [False, True])
+def test_pruned_top_n_equals_exhaustive(exact_bounds):
+    rng = np.random.default_rng(0)
+    matcher = ResumeJDMatcher()
+    pruned_trials = 0
+    for _ in range(150):
+        pool, jd_f = _pool(rng, int(rng.integers(1, 400))), _jd(rng)
+        if exact_bounds:
+            # no skill / sentence terms: bounds equal the unrounded scores, so
+            # 4-decimal rounding ties sit right at the pruning threshold
+            jd_f["skill_vecs"], jd_f["sentence_vecs"] = EMPTY, EMPTY
+        top_n = int(rng.integers(1, 30))
+        scores = matcher._score_features_batch(pool, jd_f)
+        expected = [(int(i), float(scores[i])) for i in top_n_indices(scores, top_n)]
+
+        *stacked, skill_vocab = matcher._stack_features(pool, jd_f)
+        stats = {}
+        top, top_scores = matcher._top_n_stacked(
+            jd_f, *stacked, top_n, skill_vocab=skill_vocab,
+            block_size=int(rng.integers(1, 50)), stats=stats,
+        )
+        assert [(int(i), float(s)) for i, s in zip(top, top_scores)] == expected
+        pruned_trials += stats["pruned"] > 0
+    assert pruned_trials > 0
+
+
+def test_rounding_ties_at_the_threshold_are_kept():
+    # two résumés whose unrounded scores straddle 0.3000 both round to it;
+    # the earlier one has the lower bound but must still win the tie
+    matcher = ResumeJDMatcher()
+    weights = get_config(matcher.config_path)["weights"]
+    base = weights.get("education_match", 0)
+
+    def resume(score):
+        cos = (score - base) / weights["exp_similarity"]
+        exp_vec = np.zeros(DIM, dtype=np.float32)
+        exp_vec[:2] = cos, np.sqrt(1 - cos * cos)
+        return dict(
+            skill_vecs=EMPTY, sentence_vecs=EMPTY, skill_vec=exp_vec,
+            exp_vec=exp_vec, years_experience=10.0, degree_level="phd",
+        )
+
+    jd_f = dict(
+        skill_vecs=EMPTY, sentence_vecs=EMPTY, skill_vec=np.eye(DIM, dtype=np.float32)[0],
+        exp_vec=np.eye(DIM, dtype=np.float32)[0], years_required=0.0, degree_required="bachelors",
+    )
+    pool = [resume(0.2), resume(0.29996), resume(0.30004)] + [resume(0.1)] * 20
+    *stacked, skill_vocab = matcher._stack_features(pool, jd_f)
+    top, scores = matcher._top_n_stacked(jd_f, *stacked, 1, skill_vocab=skill_vocab, block_size=1)
+    assert top.tolist() == [1] and scores.tolist() == [0.3]
+
+
+@pytest.mark.parametrize("top_n", [0, -3])
+def test_non_positive_top_n_scores_nothing(top_n):
+    rng = np.random.default_rng(1)
+    matcher = ResumeJDMatcher()
+    pool, jd_f = _pool(rng, 50), _jd(rng)
+
+    *stacked, skill_vocab = matcher._stack_features(pool, jd_f)
+    stats = {}
+    top, scores = matcher._top_n_stacked(jd_f, *stacked, top_n, skill_vocab=skill_vocab, stats=stats)
+    assert top.size == 0 and scores.size == 0
+    assert stats == {"candidates": 50, "scored": 0, "pruned": 50}
+    assert matcher._rank_features(pool, jd_f, top_n) == []
+    assert matcher._rank_features(pool, jd_f, top_n, prune=False) == []
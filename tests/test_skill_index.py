@@ -0,0 +1,26 @@
+"""Synonym expansion of the inverted skill index."""
+
+import numpy as np
+
+from src.utils.skill_index import SkillIndex
+
+
+def _index() -> SkillIndex:
+    index = SkillIndex()
+    index.add(1, ["MySQL", "Python"])
+    index.add(2, ["PL/SQL", "Oracle"])
+    index.add(3, ["SQL"])
+    index.add(4, ["Postgres", "Node.js"])
+    return index
+
+
+def test_synonym_matches_alias():
+    index = _index()
+    np.testing.assert_array_equal(index.match_all(["PostgreSQL"]), [4])
+    np.testing.assert_array_equal(index.match_all(["nodejs"]), [4])
+
+
+def test_synonym_does_not_match_broader_term():
+    index = _index()
+    np.testing.assert_array_equal(index.match_all(["MySQL"]), [1])
+    np.testing.assert_array_equal(index.match_all(["SQL"]), [2, 3])
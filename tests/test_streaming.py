@@ -0,0 +1,40 @@
+"""``stream_top_k`` must return the exhaustive ranking's top K."""
+
+import numpy as np
+import pytest
+
+pytest.importorskip("sentence_transformers")
+
+from src.matchers.matcher import PreparedJD, ResumeJDMatcher
+from src.matchers.streaming import stream_top_k
+from tests.test_batch_scoring import _jd, _pool
+
+
+def _exhaustive(matcher, pool, jd_f):
+    scores = matcher._score_features_batch(pool, jd_f)
+    return [(int(i), float(scores[i])) for i in np.argsort(-scores, kind="stable")]
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_stream_top_k_equals_exhaustive_ranking(seed):
+    rng = np.random.default_rng(seed)
+    matcher = ResumeJDMatcher()
+    pool, jd_f = _pool(rng, 300), PreparedJD(_jd(rng))
+    pool += pool[:30]                            # exact ties resolved by stream order
+    ranking = _exhaustive(matcher, pool, jd_f)
+    for k in (1, 5, 40, 400):
+        for chunk_size in (1, 64, 1024):
+            stats = {}
+            got = stream_top_k(matcher, iter(pool), jd_f, k, chunk_size=chunk_size, features=True, stats=stats)
+            assert got == ranking[:k]
+            assert stats["scored"] + stats["skipped"] == len(pool)
+
+
+def test_default_bound_skips_hopeless_items():
+    rng = np.random.default_rng(7)
+    matcher = ResumeJDMatcher()
+    pool, jd_f = _pool(rng, 2000), PreparedJD(_jd(rng))
+    stats = {}
+    got = stream_top_k(matcher, iter(pool), jd_f, 5, chunk_size=256, features=True, stats=stats)
+    assert got == _exhaustive(matcher, pool, jd_f)[:5]
+    assert stats["skipped"] > 0